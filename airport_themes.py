@@ -1,847 +1,525 @@
-# Dictionnaire des aéroports avec tags thématiques pour voyageurs jeunes/lowcost
-
-airports_by_country = {
-    'belgium': {
-        'name': 'Belgique',
-        'airports': {
-            'CRL': {
-                'name': 'Brussels South Charleroi Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip']
-            },
-            'BRU': {
-                'name': 'Brussels Airport',
-                'coastal': False, 
-                'sea': None,
-                'themes': ['city_trip']
-            },
-            'LGG': {
-                'name': 'Liège Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip']
-            },
-            'OST': {
-                'name': 'Ostend-Bruges International Airport',
-                'coastal': True,
-                'sea': 'North Sea',
-                'themes': ['beach', 'couple', 'city_trip']
-            },
-            'ANR': {
-                'name': 'Antwerp International Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip']
-            }
-        }
-    },
-    'france': {
-        'name': 'France',
-        'airports': {
-            'CDG': {
-                'name': 'Charles de Gaulle Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'party']
-            },
-            'ORY': {
-                'name': 'Paris Orly Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'party']
-            },
-            'NCE': {
-                'name': 'Nice Côte d\'Azur Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'party', 'couple', 'city_trip']
-            },
-            'MRS': {
-                'name': 'Marseille Provence Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'party', 'city_trip']
-            },
-            'BOD': {
-                'name': 'Bordeaux Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['city_trip', 'couple', 'nature']
-            },
-            'NTE': {
-                'name': 'Nantes Atlantique Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['city_trip', 'nature', 'beach']
-            },
-            'LYS': {
-                'name': 'Lyon-Saint Exupéry Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'nature']
-            },
-            'TLS': {
-                'name': 'Toulouse-Blagnac Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party']
-            },
-            'BIQ': {
-                'name': 'Biarritz Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['beach', 'couple', 'nature']
-            },
-            'MPL': {
-                'name': 'Montpellier Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'party', 'city_trip']
-            },
-            'PGF': {
-                'name': 'Perpignan Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'nature']
-            },
-            'BES': {
-                'name': 'Brest Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['nature', 'beach']
-            }
-        }
-    },
-    'spain': {
-        'name': 'Espagne',
-        'airports': {
-            'BCN': {
-                'name': 'Barcelona-El Prat Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['city_trip', 'party', 'beach', 'couple']
-            },
-            'MAD': {
-                'name': 'Madrid-Barajas Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party', 'couple']
-            },
-            'PMI': {
-                'name': 'Palma Mallorca Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'party', 'couple']
-            },
-            'IBZ': {
-                'name': 'Ibiza Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['party', 'beach', 'couple']
-            },
-            'AGP': {
-                'name': 'Málaga Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'party', 'couple']
-            },
-            'VLC': {
-                'name': 'Valencia Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'party', 'city_trip']
-            },
-            'ALC': {
-                'name': 'Alicante Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'couple']
-            },
-            'BIO': {
-                'name': 'Bilbao Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['city_trip', 'nature', 'couple']
-            },
-            'SVQ': {
-                'name': 'Seville Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'party']
-            },
-            'LPA': {
-                'name': 'Las Palmas Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['beach', 'nature']
-            },
-            'TFS': {
-                'name': 'Tenerife South Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['beach', 'nature', 'mountain']
-            },
-            'ACE': {
-                'name': 'Lanzarote Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['beach', 'nature']
-            },
-            'FUE': {
-                'name': 'Fuerteventura Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['beach', 'nature']
-            },
-            'SDR': {
-                'name': 'Santander Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['nature', 'beach']
-            }
-        }
-    },
-    'italy': {
-        'name': 'Italie',
-        'airports': {
-            'FCO': {
-                'name': 'Rome Fiumicino Airport',
-                'coastal': True,
-                'sea': 'Tyrrhenian',
-                'themes': ['city_trip', 'couple', 'beach']
-            },
-            'CIA': {
-                'name': 'Rome Ciampino Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple']
-            },
-            'MXP': {
-                'name': 'Milan Malpensa Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'mountain']
-            },
-            'BGY': {
-                'name': 'Milan Bergamo Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'mountain']
-            },
-            'VCE': {
-                'name': 'Venice Marco Polo Airport',
-                'coastal': True,
-                'sea': 'Adriatic',
-                'themes': ['couple', 'city_trip', 'beach']
-            },
-            'NAP': {
-                'name': 'Naples International Airport',
-                'coastal': True,
-                'sea': 'Tyrrhenian',
-                'themes': ['beach', 'city_trip', 'couple']
-            },
-            'BLQ': {
-                'name': 'Bologna Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple']
-            },
-            'FLR': {
-                'name': 'Florence Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple']
-            },
-            'CTA': {
-                'name': 'Catania Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'nature', 'mountain']
-            },
-            'PMO': {
-                'name': 'Palermo Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'city_trip', 'couple']
-            },
-            'BRI': {
-                'name': 'Bari Airport',
-                'coastal': True,
-                'sea': 'Adriatic',
-                'themes': ['beach', 'couple']
-            },
-            'CAG': {
-                'name': 'Cagliari Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'nature']
-            },
-            'PSA': {
-                'name': 'Pisa Airport',
-                'coastal': True,
-                'sea': 'Tyrrhenian',
-                'themes': ['beach', 'city_trip', 'couple']
-            }
-        }
-    },
-    'portugal': {
-        'name': 'Portugal',
-        'airports': {
-            'LIS': {
-                'name': 'Lisbon Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['city_trip', 'couple', 'beach', 'party']
-            },
-            'OPO': {
-                'name': 'Porto Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['city_trip', 'couple', 'party']
-            },
-            'FAO': {
-                'name': 'Faro Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['beach', 'couple', 'party']
-            },
-            'FNC': {
-                'name': 'Funchal Airport (Madeira)',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['nature', 'beach', 'couple', 'mountain']
-            }
-        }
-    },
-    'greece': {
-        'name': 'Grèce',
-        'airports': {
-            'ATH': {
-                'name': 'Athens International Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'beach']
-            },
-            'SKG': {
-                'name': 'Thessaloniki Airport',
-                'coastal': True,
-                'sea': 'Aegean',
-                'themes': ['city_trip', 'party', 'beach']
-            },
-            'HER': {
-                'name': 'Heraklion Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'party', 'nature']
-            },
-            'RHO': {
-                'name': 'Rhodes Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'couple', 'party']
-            },
-            'CFU': {
-                'name': 'Corfu Airport',
-                'coastal': True,
-                'sea': 'Ionian',
-                'themes': ['beach', 'party', 'couple']
-            },
-            'CHQ': {
-                'name': 'Chania Airport',
-                'coastal': True,
-                'sea': 'Mediterranean',
-                'themes': ['beach', 'nature']
-            },
-            'KGS': {
-                'name': 'Kos Airport',
-                'coastal': True,
-                'sea': 'Aegean',
-                'themes': ['beach', 'party']
-            },
-            'ZTH': {
-                'name': 'Zakynthos Airport',
-                'coastal': True,
-                'sea': 'Ionian',
-                'themes': ['beach', 'party', 'couple']
-            },
-            'JTR': {
-                'name': 'Santorini Airport',
-                'coastal': True,
-                'sea': 'Aegean',
-                'themes': ['couple', 'beach', 'city_trip']
-            },
-            'MYK': {
-                'name': 'Mykonos Airport',
-                'coastal': True,
-                'sea': 'Aegean',
-                'themes': ['party', 'beach', 'couple']
-            }
-        }
-    },
-    'uk': {
-        'name': 'Royaume-Uni',
-        'airports': {
-            'STN': {
-                'name': 'London Stansted Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'party']
-            },
-            'LTN': {
-                'name': 'London Luton Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'party']
-            },
-            'LGW': {
-                'name': 'London Gatwick Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'party']
-            },
-            'MAN': {
-                'name': 'Manchester Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party']
-            },
-            'EDI': {
-                'name': 'Edinburgh Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'nature']
-            },
-            'LPL': {
-                'name': 'Liverpool John Lennon Airport',
-                'coastal': True,
-                'sea': 'Irish Sea',
-                'themes': ['city_trip', 'party']
-            },
-            'GLA': {
-                'name': 'Glasgow Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'nature', 'mountain']
-            }
-        }
-    },
-    'ireland': {
-        'name': 'Irlande',
-        'airports': {
-            'DUB': {
-                'name': 'Dublin Airport',
-                'coastal': True,
-                'sea': 'Irish Sea',
-                'themes': ['city_trip', 'party', 'couple']
-            },
-            'ORK': {
-                'name': 'Cork Airport',
-                'coastal': True,
-                'sea': 'Celtic Sea',
-                'themes': ['nature', 'city_trip']
-            },
-            'SNN': {
-                'name': 'Shannon Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['nature']
-            }
-        }
-    },
-    'germany': {
-        'name': 'Allemagne',
-        'airports': {
-            'BER': {
-                'name': 'Berlin Brandenburg Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party', 'couple']
-            },
-            'MUC': {
-                'name': 'Munich Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'mountain', 'party']
-            },
-            'FRA': {
-                'name': 'Frankfurt Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip']
-            },
-            'HAM': {
-                'name': 'Hamburg Airport',
-                'coastal': True,
-                'sea': 'North Sea',
-                'themes': ['city_trip', 'party']
-            },
-            'CGN': {
-                'name': 'Cologne Bonn Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party']
-            },
-            'DUS': {
-                'name': 'Düsseldorf Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party']
-            },
-            'STR': {
-                'name': 'Stuttgart Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'mountain']
-            }
-        }
-    },
-    'netherlands': {
-        'name': 'Pays-Bas',
-        'airports': {
-            'AMS': {
-                'name': 'Amsterdam Schiphol Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party', 'couple']
-            },
-            'EIN': {
-                'name': 'Eindhoven Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party']
-            },
-            'MST': {
-                'name': 'Maastricht Aachen Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip']
-            },
-            'RTM': {
-                'name': 'Rotterdam The Hague Airport',
-                'coastal': True,
-                'sea': 'North Sea',
-                'themes': ['city_trip']
-            }
-        }
-    },
-    'czech_republic': {
-        'name': 'République Tchèque',
-        'airports': {
-            'PRG': {
-                'name': 'Prague Václav Havel Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party', 'couple']
-            }
-        }
-    },
-    'hungary': {
-        'name': 'Hongrie',
-        'airports': {
-            'BUD': {
-                'name': 'Budapest Ferenc Liszt International Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party', 'couple']
-            }
-        }
-    },
-    'poland': {
-        'name': 'Pologne',
-        'airports': {
-            'WAW': {
-                'name': 'Warsaw Chopin Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party']
-            },
-            'KRK': {
-                'name': 'Kraków Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'party']
-            },
-            'GDN': {
-                'name': 'Gdańsk Airport',
-                'coastal': True,
-                'sea': 'Baltic Sea',
-                'themes': ['city_trip', 'beach', 'party']
-            }
-        }
-    },
-    'croatia': {
-        'name': 'Croatie',
-        'airports': {
-            'ZAG': {
-                'name': 'Zagreb Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'nature']
-            },
-            'SPU': {
-                'name': 'Split Airport',
-                'coastal': True,
-                'sea': 'Adriatic',
-                'themes': ['beach', 'party', 'couple']
-            },
-            'DBV': {
-                'name': 'Dubrovnik Airport',
-                'coastal': True,
-                'sea': 'Adriatic',
-                'themes': ['couple', 'beach', 'city_trip']
-            },
-            'ZAD': {
-                'name': 'Zadar Airport',
-                'coastal': True,
-                'sea': 'Adriatic',
-                'themes': ['beach', 'couple', 'nature']
-            },
-            'PUY': {
-                'name': 'Pula Airport',
-                'coastal': True,
-                'sea': 'Adriatic',
-                'themes': ['beach', 'couple', 'nature']
-            }
-        }
-    },
-    'austria': {
-        'name': 'Autriche',
-        'airports': {
-            'VIE': {
-                'name': 'Vienna International Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple']
-            },
-            'SZG': {
-                'name': 'Salzburg Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'mountain', 'nature']
-            },
-            'INN': {
-                'name': 'Innsbruck Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['mountain', 'nature']
-            }
-        }
-    },
-    'switzerland': {
-        'name': 'Suisse',
-        'airports': {
-            'ZUR': {
-                'name': 'Zurich Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'mountain', 'nature']
-            },
-            'GVA': {
-                'name': 'Geneva Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'mountain', 'nature']
-            }
-        }
-    },
-    'norway': {
-        'name': 'Norvège',
-        'airports': {
-            'OSL': {
-                'name': 'Oslo Gardermoen Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'nature', 'mountain']
-            },
-            'BGO': {
-                'name': 'Bergen Airport',
-                'coastal': True,
-                'sea': 'North Sea',
-                'themes': ['nature', 'mountain']
-            },
-            'TRD': {
-                'name': 'Trondheim Airport',
-                'coastal': True,
-                'sea': 'Norwegian Sea',
-                'themes': ['nature', 'mountain']
-            }
-        }
-    },
-    'sweden': {
-        'name': 'Suède',
-        'airports': {
-            'ARN': {
-                'name': 'Stockholm Arlanda Airport',
-                'coastal': True,
-                'sea': 'Baltic Sea',
-                'themes': ['city_trip', 'nature', 'couple']
-            },
-            'GOT': {
-                'name': 'Gothenburg Landvetter Airport',
-                'coastal': True,
-                'sea': 'North Sea',
-                'themes': ['city_trip', 'nature']
-            }
-        }
-    },
-    'denmark': {
-        'name': 'Danemark',
-        'airports': {
-            'CPH': {
-                'name': 'Copenhagen Airport',
-                'coastal': True,
-                'sea': 'Øresund',
-                'themes': ['city_trip', 'couple', 'party']
-            }
-        }
-    },
-    'romania': {
-        'name': 'Roumanie',
-        'airports': {
-            'OTP': {
-                'name': 'Henri Coandă International Airport (Bucharest)',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'party']
-            }
-        }
-    },
-    'bulgaria': {
-        'name': 'Bulgarie',
-        'airports': {
-            'SOF': {
-                'name': 'Sofia Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'mountain']
-            },
-            'VAR': {
-                'name': 'Varna Airport',
-                'coastal': True,
-                'sea': 'Black Sea',
-                'themes': ['beach', 'party']
-            },
-            'BOJ': {
-                'name': 'Burgas Airport',
-                'coastal': True,
-                'sea': 'Black Sea',
-                'themes': ['beach', 'party']
-            }
-        }
-    },
-    'morocco': {
-        'name': 'Maroc',
-        'airports': {
-            'CMN': {
-                'name': 'Mohammed V International Airport (Casablanca)',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['city_trip', 'beach']
-            },
-            'RAK': {
-                'name': 'Marrakech Menara Airport',
-                'coastal': False,
-                'sea': None,
-                'themes': ['city_trip', 'couple', 'nature']
-            },
-            'AGA': {
-                'name': 'Agadir–Al Massira Airport',
-                'coastal': True,
-                'sea': 'Atlantic',
-                'themes': ['beach', 'couple']
-            }
-        }
-    }
+import json
+import math
+import os
+import sys
+import threading
+from types import MappingProxyType
+
+# Instantané versionné du catalogue, chargé au premier accès et non plus à l'import
+CATALOG_VERSION = 1
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'airports.json')
+EARTH_RADIUS_KM = 6371.0088
+
+
+class Airport:
+    """Enregistrement immuable d'un aéroport (codes internés, thèmes en tuple)"""
+    __slots__ = ('code', 'name', 'country', 'coastal', 'sea', 'themes', 'latitude', 'longitude')
+
+    def __init__(self, code, name, country, coastal=None, sea=None, themes=(), latitude=None, longitude=None):
+        object.__setattr__(self, 'code', sys.intern(code))
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'country', sys.intern(country))
+        object.__setattr__(self, 'coastal', coastal)
+        object.__setattr__(self, 'sea', sys.intern(sea) if sea else sea)
+        object.__setattr__(self, 'themes', tuple(sys.intern(theme) for theme in themes))
+        object.__setattr__(self, 'latitude', latitude)
+        object.__setattr__(self, 'longitude', longitude)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Airport records are read-only')
+
+    def __delattr__(self, name):
+        raise AttributeError('Airport records are read-only')
+
+    def __repr__(self):
+        return f'Airport({self.code!r}, {self.name!r}, {self.country!r})'
+
+    def as_dict(self):
+        """Forme historique d'un aéroport dans airports_by_country"""
+        return {'name': self.name, 'coastal': self.coastal, 'sea': self.sea, 'themes': list(self.themes)}
+
+
+class AirportCatalog:
+    def __init__(self, country_names, airports, version=CATALOG_VERSION, themes=None, revision=None):
+        """
+        Catalogue chargé et ses index, construits une fois et jamais modifiés ensuite
+
+        Args:
+            country_names: {clé pays: nom affiché} dans l'ordre du catalogue
+            airports: Enregistrements Airport dans l'ordre du catalogue
+            version: Version du format de l'instantané
+            themes: {thème: nom, description, couleur, icône} dans l'ordre d'affichage
+            revision: Empreinte du contenu de l'instantané, clé des caches dérivés
+        """
+        self.version = version
+        self.revision = revision
+        self.country_names = MappingProxyType(dict(country_names))
+        self.themes = MappingProxyType(dict(themes or {}))
+        self.airports = tuple(airports)
+
+        airports_by_code = {}
+        airports_by_theme = {}
+        codes_by_country = {country: [] for country in self.country_names}
+        coastal_by_country = {country: [] for country in self.country_names}
+        inland_by_country = {country: [] for country in self.country_names}
+        for airport in self.airports:
+            codes_by_country[airport.country].append(airport.code)
+            if airport.coastal:
+                coastal_by_country[airport.country].append(airport.code)
+            elif airport.coastal is not None:
+                inland_by_country[airport.country].append(airport.code)
+
+            # Le premier pays qui déclare un code l'emporte
+            if airport.code in airports_by_code:
+                continue
+            airports_by_code[airport.code] = airport
+            for theme in airport.themes:
+                airports_by_theme.setdefault(theme, []).append(airport.code)
+
+        self.airports_by_code = MappingProxyType(airports_by_code)
+        self.airports_by_theme = MappingProxyType({theme: tuple(codes) for theme, codes in airports_by_theme.items()})
+        self.codes_by_country = MappingProxyType({country: tuple(codes) for country, codes in codes_by_country.items()})
+        self.coastal_by_country = MappingProxyType({country: tuple(codes) for country, codes in coastal_by_country.items()})
+        self.inland_by_country = MappingProxyType({country: tuple(codes) for country, codes in inland_by_country.items()})
+        self.query_index = AirportQueryIndex(self.airports)
+        self.geo_index = AirportGeoIndex(self.airports)
+        self._info_by_code = {}
+        self._nested = None
+
+    @classmethod
+    def load(cls, path=CATALOG_PATH):
+        """Charge un instantané data/airports.json"""
+        with open(path, 'rb') as catalog_file:
+            content = catalog_file.read()
+        data = json.loads(content)
+        if data.get('version') != CATALOG_VERSION:
+            raise ValueError(f"Airport catalog {path} has unsupported version {data.get('version')}")
+
+        fields = data['fields']
+        country_names = {}
+        airports = []
+        for country, country_data in data['countries'].items():
+            country_names[country] = country_data['name']
+            for row in country_data['airports']:
+                values = dict(zip(fields, row))
+                airports.append(Airport(
+                    values['code'], values['name'], country,
+                    values.get('coastal'), values.get('sea'), values.get('themes') or (),
+                    values.get('latitude'), values.get('longitude')
+                ))
+        # hashlib charge OpenSSL (environ 4 ms) : importé ici pour ne pas peser sur l'import du module
+        import hashlib
+        return cls(country_names, airports, data['version'], data.get('themes'), hashlib.sha1(content).hexdigest()[:12])
+
+    def airport_info(self, code):
+        """Dictionnaire historique d'un aéroport, créé au premier accès puis partagé ; None si inconnu"""
+        info = self._info_by_code.get(code)
+        if info is None:
+            airport = self.airports_by_code.get(code)
+            if airport is None:
+                return None
+            info = self._info_by_code.setdefault(code, airport.as_dict())
+        return info
+
+    def as_nested_dict(self):
+        """Catalogue au format historique airports_by_country, matérialisé une seule fois"""
+        if self._nested is None:
+            nested = {country: {'name': name, 'airports': {}} for country, name in self.country_names.items()}
+            for airport in self.airports:
+                # Un code déclaré par plusieurs pays garde ses propres attributs dans chacun
+                info = self.airport_info(airport.code) if self.airports_by_code[airport.code] is airport else airport.as_dict()
+                nested[airport.country]['airports'].setdefault(airport.code, info)
+            self._nested = nested
+        return self._nested
+
+
+# Le catalogue publié est remplacé d'un bloc par reload_catalog : les lecteurs ne verrouillent
+# jamais et gardent l'instance qu'ils ont lue jusqu'à la fin de leur traitement
+_catalog = None
+_catalog_stat = None
+_catalog_lock = threading.Lock()
+_swap_listeners = []
+
+def get_catalog():
+    """Retourne le catalogue, chargé depuis CATALOG_PATH au premier appel"""
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _publish(CATALOG_PATH)
+    return _catalog
+
+def _snapshot_stat(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _publish(path):
+    """Charge un instantané et le publie ; appelé sous _catalog_lock"""
+    global _catalog, _catalog_stat
+    stat = _snapshot_stat(path)
+    catalog = AirportCatalog.load(path)
+    previous, _catalog, _catalog_stat = _catalog, catalog, stat
+    if previous is not None and previous.revision != catalog.revision:
+        for listener in _swap_listeners:
+            try:
+                listener(previous, catalog)
+            except Exception as e:
+                print(f"Catalog swap listener error: {e}")
+    return catalog
+
+def reload_catalog(path=CATALOG_PATH):
+    """
+    Recharge l'instantané et remplace le catalogue publié
+
+    En cas d'erreur (fichier absent ou invalide), l'ancien catalogue reste en place et l'erreur est levée.
+    """
+    with _catalog_lock:
+        return _publish(path)
+
+def reload_catalog_if_changed(path=CATALOG_PATH):
+    """Recharge le catalogue si le fichier a changé depuis le dernier chargement ; True si remplacé"""
+    try:
+        if _catalog is not None and _snapshot_stat(path) == _catalog_stat:
+            return False
+        previous = _catalog
+        with _catalog_lock:
+            if _catalog is not previous:
+                return False
+            return _publish(path).revision != getattr(previous, 'revision', None)
+    except Exception as e:
+        print(f"Airport catalog reload error: {e}")
+        return False
+
+def on_catalog_swap(listener):
+    """Enregistre listener(ancien, nouveau), appelé quand une révision différente est publiée"""
+    _swap_listeners.append(listener)
+    return listener
+
+# Anciens noms du module, servis par le catalogue chargé à la demande
+_LAZY_ATTRIBUTES = {
+    'airports_by_country': lambda catalog: catalog.as_nested_dict(),
+    'AIRPORTS_BY_CODE': lambda catalog: catalog.airports_by_code,
+    'AIRPORTS_BY_THEME': lambda catalog: catalog.airports_by_theme,
+    'AIRPORT_CODES_BY_COUNTRY': lambda catalog: catalog.codes_by_country,
+    'COASTAL_AIRPORTS_BY_COUNTRY': lambda catalog: catalog.coastal_by_country,
+    'INLAND_AIRPORTS_BY_COUNTRY': lambda catalog: catalog.inland_by_country,
+    'AIRPORT_QUERY_INDEX': lambda catalog: catalog.query_index,
+    'THEMES': lambda catalog: catalog.themes
 }
 
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name](get_catalog())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Fonctions pour filtrer par thème
 def get_airports_by_theme(theme):
     """Retourne tous les aéroports correspondant à un thème donné"""
-    airports = []
-    for country_data in airports_by_country.values():
-        for code, airport_info in country_data['airports'].items():
-            if theme in airport_info.get('themes', []):
-                airports.append(code)
-    return airports
+    return list(get_catalog().airports_by_theme.get(theme, ()))
 
 def get_airports_by_themes(themes):
     """Retourne tous les aéroports correspondant à au moins un des thèmes donnés"""
-    airports = []
-    for country_data in airports_by_country.values():
-        for code, airport_info in country_data['airports'].items():
-            airport_themes = airport_info.get('themes', [])
-            if any(theme in airport_themes for theme in themes):
-                airports.append(code)
-    return list(set(airports))  # Remove duplicates
-
-# Mapping des thèmes
-THEMES = {
-    'couple': {
-        'name': '💕 Couple',
-        'description': 'Romantique mais abordable',
-        'color': '#ff6b9d',
-        'icon': 'bi-heart-fill'
-    },
-    'party': {
-        'name': '🎉 Fête',
-        'description': 'Nightlife, festivals, vie nocturne',
-        'color': '#ff9f1c',
-        'icon': 'bi-music-note-beamed'
-    },
-    'beach': {
-        'name': '🏖️ Plage & Détente',
-        'description': 'Soleil, mer, relaxation',
-        'color': '#2ec4b6',
-        'icon': 'bi-water'
-    },
-    'nature': {
-        'name': '🌲 Nature',
-        'description': 'Randos, parcs, outdoor',
-        'color': '#8ac926',
-        'icon': 'bi-tree-fill'
-    },
-    'mountain': {
-        'name': '⛰️ Montagne',
-        'description': 'Ski low-cost, chalets, air pur',
-        'color': '#6f4a8e',
-        'icon': 'bi-mountain'
-    },
-    'city_trip': {
-        'name': '🏙️ City Trip',
-        'description': 'Découverte urbaine, culture accessible',
-        'color': '#1982c4',
-        'icon': 'bi-building'
-    }
-}
+    airports_by_theme = get_catalog().airports_by_theme
+    airports = set()
+    for theme in themes:
+        airports.update(airports_by_theme.get(theme, ()))
+    return list(airports)
 
 # Backward compatibility functions
+def get_themes():
+    """Retourne les thèmes du catalogue publié (nom, description, couleur, icône)"""
+    return get_catalog().themes
+
+def get_countries():
+    """Retourne le catalogue au format airports_by_country (pays -> nom et aéroports)"""
+    return get_catalog().as_nested_dict()
+
 def get_airports_by_countries(countries):
+    codes_by_country = get_catalog().codes_by_country
     airports = []
     for country in countries:
-        if country in airports_by_country:
-            airports.extend(list(airports_by_country[country]['airports'].keys()))
+        airports.extend(codes_by_country.get(country, ()))
     return airports
 
 def get_airport_name(code):
-    for country_data in airports_by_country.values():
-        if code in country_data['airports']:
-            return country_data['airports'][code]['name']
-    return code
+    airport = get_catalog().airports_by_code.get(code)
+    return airport.name if airport is not None else code
 
 def get_airport_info(code):
-    for country_data in airports_by_country.values():
-        if code in country_data['airports']:
-            return country_data['airports'][code]
+    airport_info = get_catalog().airport_info(code)
+    if airport_info is not None:
+        return airport_info
     return {'name': code, 'coastal': None, 'sea': None, 'themes': []}
 
+def get_airport_country(code):
+    """Retourne la clé du pays d'un aéroport, None si le code est inconnu"""
+    airport = get_catalog().airports_by_code.get(code)
+    return airport.country if airport is not None else None
+
 def get_coastal_airports_by_countries(countries, coastal_only=True):
+    catalog = get_catalog()
+    partitions = catalog.coastal_by_country if coastal_only else catalog.inland_by_country
     airports = []
     for country in countries:
-        if country in airports_by_country:
-            for code, info in airports_by_country[country]['airports'].items():
-                if coastal_only and info.get('coastal', False):
-                    airports.append(code)
-                elif not coastal_only and not info.get('coastal', True):
-                    airports.append(code)
-    return airports
\ No newline at end of file
+        airports.extend(partitions.get(country, ()))
+    return airports
+
+# Requêtes composées : un bitset par thème, pays, façade côtière et mer
+class AirportQueryIndex:
+    FIELDS = ('theme', 'country', 'sea', 'coastal')
+
+    def __init__(self, airports):
+        """
+        Précalcule les bitsets d'une suite d'enregistrements Airport
+
+        Le bit i d'un bitset correspond à self.codes[i] ; les combinaisons
+        se font avec des opérations binaires sur des entiers Python.
+        """
+        codes = []
+        seen = set()
+        positions = {field: {} for field in self.FIELDS}
+        for airport in airports:
+            # Le premier pays qui déclare un code l'emporte, comme airports_by_code
+            if airport.code in seen:
+                continue
+            seen.add(airport.code)
+            position = len(codes)
+            codes.append(airport.code)
+
+            keys = {
+                'country': [airport.country],
+                'theme': airport.themes,
+                'sea': [airport.sea.lower()] if airport.sea else [],
+                'coastal': [bool(airport.coastal)] if airport.coastal is not None else []
+            }
+            for field, values in keys.items():
+                for value in values:
+                    positions[field].setdefault(value, []).append(position)
+
+        self.codes = tuple(codes)
+        self.all_bits = (1 << len(codes)) - 1
+        self.bits = {
+            field: MappingProxyType({value: self._bits_from_positions(value_positions) for value, value_positions in values.items()})
+            for field, values in positions.items()
+        }
+
+    def query(self, expression):
+        """Retourne les codes (ordre du catalogue) qui satisfont une expression, voir query_airports"""
+        return self.codes_from_bits(self.evaluate(expression))
+
+    def evaluate(self, expression):
+        """Retourne le bitset d'une expression"""
+        if not isinstance(expression, dict) or not expression:
+            raise ValueError(f"Invalid airport filter: {expression!r}")
+
+        result = self.all_bits
+        for key, value in expression.items():
+            if key == 'and':
+                for operand in self._operands(key, value):
+                    result &= self.evaluate(operand)
+            elif key == 'or':
+                any_bits = 0
+                for operand in self._operands(key, value):
+                    any_bits |= self.evaluate(operand)
+                result &= any_bits
+            elif key == 'not':
+                result &= self.all_bits & ~self.evaluate(value)
+            elif key in self.FIELDS:
+                result &= self._field_bits(key, value)
+            else:
+                raise ValueError(f"Unknown airport filter key: {key}")
+        return result
+
+    def codes_from_bits(self, bits):
+        # Parcours de la représentation binaire : linéaire, même pour un grand catalogue
+        binary = bin(bits)[:1:-1]
+        codes = []
+        position = binary.find('1')
+        while position != -1:
+            codes.append(self.codes[position])
+            position = binary.find('1', position + 1)
+        return codes
+
+    def _bits_from_positions(self, positions):
+        mask = bytearray((len(self.codes) + 7) // 8)
+        for position in positions:
+            mask[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(mask, 'little')
+
+    def _operands(self, key, value):
+        if not isinstance(value, list) or not value:
+            raise ValueError(f"Airport filter '{key}' expects a non-empty list")
+        return value
+
+    def _field_bits(self, field, value):
+        """Bitset d'un champ, une liste de valeurs vaut OU"""
+        values = value if isinstance(value, list) else [value]
+        field_bits = 0
+        for item in values:
+            if field == 'coastal':
+                if not isinstance(item, bool):
+                    raise ValueError("Airport filter 'coastal' expects true or false")
+            elif isinstance(item, str):
+                item = item.lower()
+            field_bits |= self.bits[field].get(item, 0)
+        return field_bits
+
+
+def query_airports(expression):
+    """
+    Retourne les aéroports qui satisfont un filtre composé
+
+    Feuilles : {'theme': ...}, {'country': ...}, {'sea': ...} (une valeur ou une
+    liste, liste = OU) et {'coastal': true/false}. Plusieurs clés dans un même
+    objet se combinent en ET. Opérateurs : {'and': [...]}, {'or': [...]}, {'not': {...}}.
+
+    Exemple : {'theme': ['beach', 'party'], 'country': ['spain', 'italy'], 'sea': 'Mediterranean'}
+    """
+    return get_catalog().query_index.query(expression)
+
+
+# Index spatial : grille de cellules de quelques degrés, distances exactes (haversine)
+def haversine_km(latitude_a, longitude_a, latitude_b, longitude_b):
+    """Distance orthodromique en km entre deux points"""
+    phi_a, phi_b = math.radians(latitude_a), math.radians(latitude_b)
+    half_chord = (
+        math.sin((phi_b - phi_a) / 2) ** 2
+        + math.cos(phi_a) * math.cos(phi_b) * math.sin(math.radians(longitude_b - longitude_a) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(half_chord)))
+
+
+class AirportGeoIndex:
+    def __init__(self, airports, cell_degrees=2.0):
+        """
+        Range les aéroports qui ont des coordonnées dans une grille latitude/longitude
+
+        Une requête ne visite que les cellules qui recoupent la zone cherchée,
+        puis calcule les distances exactes des aéroports qu'elles contiennent.
+        """
+        self.cell_degrees = cell_degrees
+        self.columns = int(math.ceil(360 / cell_degrees))
+        self.coordinates = {}
+        cells = {}
+        for airport in airports:
+            if airport.latitude is None or airport.longitude is None or airport.code in self.coordinates:
+                continue
+            position = len(self.coordinates)
+            self.coordinates[airport.code] = (airport.latitude, airport.longitude)
+            # Radians et cosinus précalculés pour la formule de haversine
+            cells.setdefault(self._cell(airport.latitude, airport.longitude), []).append((
+                position, airport.code, airport.latitude, airport.longitude,
+                math.radians(airport.latitude), math.radians(airport.longitude), math.cos(math.radians(airport.latitude))
+            ))
+        self.cells = {cell: tuple(points) for cell, points in cells.items()}
+
+    def within(self, latitude, longitude, radius_km):
+        """Retourne [(code, distance_km)] à moins de radius_km du point, du plus proche au plus lointain"""
+        if radius_km < 0:
+            return []
+        angular_radius = radius_km / EARTH_RADIUS_KM
+        latitude_delta = math.degrees(angular_radius)
+        min_latitude, max_latitude = latitude - latitude_delta, latitude + latitude_delta
+
+        longitude_ranges = None
+        if min_latitude > -90 and max_latitude < 90:
+            # Demi-largeur en longitude du cercle (bornes exactes sur la sphère)
+            ratio = math.sin(angular_radius) / math.cos(math.radians(latitude))
+            if ratio < 1:
+                longitude_delta = math.degrees(math.asin(ratio))
+                longitude_ranges = [(longitude - longitude_delta, longitude + longitude_delta)]
+
+        # Comparaison sur le demi-sinus verse, la distance n'est calculée que pour les résultats
+        phi, lambda_ = math.radians(latitude), math.radians(longitude)
+        cos_phi = math.cos(phi)
+        max_half_chord = math.sin(min(angular_radius, math.pi) / 2) ** 2
+        results = []
+        for _, code, _, _, point_phi, point_lambda, point_cos_phi in self._points(min_latitude, max_latitude, longitude_ranges):
+            half_chord = (
+                math.sin((point_phi - phi) / 2) ** 2
+                + cos_phi * point_cos_phi * math.sin((point_lambda - lambda_) / 2) ** 2
+            )
+            if half_chord <= max_half_chord:
+                results.append((code, 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(half_chord)))))
+        results.sort(key=lambda result: result[1])
+        return results
+
+    def nearest(self, latitude, longitude, k=5):
+        """Retourne les k aéroports les plus proches [(code, distance_km)] en élargissant le rayon"""
+        if k < 1 or not self.coordinates:
+            return []
+        radius_km = 250.0
+        while True:
+            results = self.within(latitude, longitude, radius_km)
+            if len(results) >= k or radius_km >= math.pi * EARTH_RADIUS_KM:
+                return results[:k]
+            radius_km *= 2
+
+    def bbox(self, min_latitude, min_longitude, max_latitude, max_longitude):
+        """Retourne les codes dans le rectangle (ordre du catalogue), min_longitude > max_longitude traverse l'antiméridien"""
+        if min_longitude <= max_longitude:
+            longitude_ranges = [(min_longitude, max_longitude)]
+        else:
+            longitude_ranges = [(min_longitude, 180.0), (-180.0, max_longitude)]
+
+        matches = []
+        for point in self._points(min_latitude, max_latitude, longitude_ranges):
+            position, code, point_latitude, point_longitude = point[:4]
+            if min_latitude <= point_latitude <= max_latitude and any(
+                    low <= point_longitude <= high for low, high in longitude_ranges):
+                matches.append((position, code))
+        matches.sort()
+        return [code for _, code in matches]
+
+    def distance_km(self, code_a, code_b):
+        """Distance entre deux aéroports, None si l'un d'eux n'a pas de coordonnées"""
+        point_a = self.coordinates.get(code_a)
+        point_b = self.coordinates.get(code_b)
+        if point_a is None or point_b is None:
+            return None
+        return haversine_km(*point_a, *point_b)
+
+    def _cell(self, latitude, longitude):
+        row = int(math.floor((min(latitude, 89.999999) + 90) / self.cell_degrees))
+        column = int(math.floor((longitude + 180) / self.cell_degrees)) % self.columns
+        return row, column
+
+    def _points(self, min_latitude, max_latitude, longitude_ranges):
+        """Points des cellules recoupant la bande de latitude et les plages de longitude (None = toutes)"""
+        first_row = self._cell(max(min_latitude, -90.0), 0)[0]
+        last_row = self._cell(min(max_latitude, 90.0), 0)[0]
+
+        columns = set()
+        if longitude_ranges is None:
+            columns = range(self.columns)
+        else:
+            for low, high in longitude_ranges:
+                first_column = int(math.floor((low + 180) / self.cell_degrees))
+                last_column = int(math.floor((high + 180) / self.cell_degrees))
+                if last_column - first_column + 1 >= self.columns:
+                    columns = range(self.columns)
+                    break
+                columns.update(column % self.columns for column in range(first_column, last_column + 1))
+
+        for row in range(first_row, last_row + 1):
+            for column in columns:
+                yield from self.cells.get((row, column), ())
+
+def get_airport_coordinates(code):
+    """Retourne (latitude, longitude) d'un aéroport, None si inconnu"""
+    return get_catalog().geo_index.coordinates.get(code)
+
+def get_airport_distance_km(code_a, code_b):
+    """Distance orthodromique entre deux aéroports, None si l'un d'eux est inconnu"""
+    return get_catalog().geo_index.distance_km(code_a, code_b)
+
+def get_airports_within(latitude, longitude, radius_km):
+    """Retourne [(code, distance_km)] des aéroports à moins de radius_km d'un point, du plus proche au plus lointain"""
+    return get_catalog().geo_index.within(latitude, longitude, radius_km)
+
+def get_nearest_airports(latitude, longitude, k=5):
+    """Retourne les k aéroports les plus proches d'un point [(code, distance_km)]"""
+    return get_catalog().geo_index.nearest(latitude, longitude, k)
+
+def get_airports_in_bbox(min_latitude, min_longitude, max_latitude, max_longitude):
+    """Retourne les aéroports compris dans un rectangle latitude/longitude"""
+    return get_catalog().geo_index.bbox(min_latitude, min_longitude, max_latitude, max_longitude)
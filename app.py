@@ -1,18 +1,31 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
 from datetime import datetime, timedelta
 import requests
 import threading
 import json
+import time
+import gzip
+import hashlib
+import hmac
+import signal
+import atexit
+from functools import lru_cache
+
+from jinja2.utils import htmlsafe_json_dumps
 
 from config import Config
 from services import (
     FlightSearchService, WeatherService, RyanairLinkService,
-    AccommodationService, AmadeusActivitiesService, GoogleHotelsService
+    AccommodationService, AmadeusActivitiesService, GoogleHotelsService,
+    SearchResultStore
 )
+from services.airport_suggest import DEFAULT_SUGGESTIONS, get_suggest_index, suggest_airports
+from services.weather_refresher import WeatherRefresher
 
 # Import data from airport_themes.py
 from airport_themes import (
-    airports_by_country, THEMES,
+    get_catalog, get_countries, get_themes,
+    on_catalog_swap, reload_catalog, reload_catalog_if_changed,
     get_airports_by_countries, get_coastal_airports_by_countries, 
     get_airport_name, get_airport_info,
     get_airports_by_theme, get_airports_by_themes
@@ -22,26 +35,155 @@ app = Flask(__name__)
 app.config.from_object(Config)
 
 # Initialize services
-flight_service = FlightSearchService()
-weather_service = WeatherService(app.config['OPENWEATHER_API_KEY'])
+flight_service = FlightSearchService(app.config)
+if flight_service.async_client is not None:
+    # Closes the shared aiohttp session and its event loop, instead of leaking them at exit
+    atexit.register(flight_service.async_client.close)
+weather_service = WeatherService(app.config['OPENWEATHER_API_KEY'], app.config)
+weather_refresher = WeatherRefresher(
+    weather_service,
+    airport_codes=lambda: list(get_catalog().airports_by_code),
+    interval=app.config['WEATHER_REFRESH_INTERVAL'],
+    batch_size=app.config['WEATHER_REFRESH_BATCH_SIZE'],
+    batch_pause=app.config['WEATHER_REFRESH_BATCH_PAUSE']
+)
 hotel_service = GoogleHotelsService(app.config)
 accommodation_service = AccommodationService()
 activities_service = AmadeusActivitiesService(app.config)
+result_store = SearchResultStore(
+    ttl=app.config['SEARCH_RESULTS_TTL'],
+    maxsize=app.config['SEARCH_RESULTS_MAX_SETS']
+)
+
+RESULTS_PAGE_SIZE = 50
+WEATHER_MAX_CODES = 100
+
+
+@lru_cache(maxsize=1)
+def catalog_json(catalog):
+    """Serialize the airport catalog for the search page once per loaded catalog"""
+    return htmlsafe_json_dumps(catalog.as_nested_dict(), dumps=app.json.dumps)
+
+
+def build_json_payload(data, revision):
+    """Serialize and gzip a response body once, with a strong ETag keyed by catalog revision and content"""
+    body = app.json.dumps(data).encode('utf-8')
+    etag = f"{revision}-{hashlib.sha1(body).hexdigest()[:16]}"
+    return body, gzip.compress(body, compresslevel=9, mtime=0), etag
+
+
+@lru_cache(maxsize=256)
+def airports_payload(catalog, countries):
+    """Airports of several countries ({country: {name, airports}}), the whole catalog when countries is None"""
+    nested = catalog.as_nested_dict()
+    if countries is not None:
+        nested = {country: nested[country] for country in countries}
+    return build_json_payload(nested, catalog.revision)
+
+
+@lru_cache(maxsize=64)
+def country_airports_payload(catalog, country):
+    """Airports of one country ({code: info}), empty for an unknown country"""
+    nested = catalog.as_nested_dict()
+    return build_json_payload(nested[country]['airports'] if country in nested else {}, catalog.revision)
+
+
+def send_json_payload(payload, revision):
+    """
+    Serve precomputed JSON bytes, gzipped when accepted, answering revalidations with 304
+
+    Only URLs versioned with the current catalog revision (?v=<revision>) may be cached for
+    AIRPORTS_CACHE_MAX_AGE; unversioned or stale ones are revalidated on every use, so a
+    catalog reload reaches clients at once.
+    """
+    body, gzipped, etag = payload
+    use_gzip = 'gzip' in request.accept_encodings
+    if use_gzip:
+        # Each encoding is a distinct representation and needs its own strong ETag
+        body, etag = gzipped, f"{etag}-gz"
+
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    if request.args.get('v') == revision:
+        response.headers['Cache-Control'] = f"public, max-age={app.config['AIRPORTS_CACHE_MAX_AGE']}, immutable"
+    else:
+        response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    if request.if_none_match.contains(etag):
+        response.status_code = 304
+        response.set_data(b'')
+        del response.headers['Content-Encoding']
+    return response
+
+
+@on_catalog_swap
+def clear_catalog_caches(previous, catalog):
+    """Drop what was derived from the previous catalog revision; cached fares carry no catalog data and are kept"""
+    print(f"Airport catalog {previous.revision} replaced by {catalog.revision}")
+    for cache in (catalog_json, airports_payload, country_airports_payload, get_suggest_index):
+        cache.cache_clear()
+    # Stored result sets hold the previous names and themes: clients page an expired set by searching again
+    result_store.result_sets.clear()
+
+
+@app.context_processor
+def inject_catalog_revision():
+    """Catalog revision for the versioned /api/airports URLs of the pages"""
+    return {'catalog_revision': get_catalog().revision}
+
+
+catalog_next_check = 0.0
+
+
+@app.before_request
+def check_catalog_snapshot():
+    """Pick up a new data/airports.json at most every CATALOG_CHECK_INTERVAL seconds, in every worker"""
+    global catalog_next_check
+    interval = app.config['CATALOG_CHECK_INTERVAL']
+    now = time.monotonic()
+    if interval > 0 and now >= catalog_next_check:
+        catalog_next_check = now + interval
+        reload_catalog_if_changed()
+
+
+@app.before_request
+def start_weather_refresher():
+    """
+    Start the weather refresher in the worker serving the request, once per process
+
+    Not at import: under gunicorn --preload the thread would only run in the master,
+    the debug reloader would run it twice, and scripts importing app would start it.
+    """
+    if app.config['WEATHER_REFRESH_INTERVAL'] > 0:
+        weather_refresher.start()
+
+
+def reload_catalog_in_background(signum=None, frame=None):
+    """SIGHUP handler: reload outside the signal frame, which may hold the catalog lock"""
+    def reload():
+        try:
+            reload_catalog()
+        except Exception as e:
+            print(f"Airport catalog reload error: {e}")
+    threading.Thread(target=reload, daemon=True).start()
+
 
 
 @app.route('/')
 def index():
-    return render_template('landing_minimal.html', countries=airports_by_country, themes=THEMES)
+    return render_template('landing_minimal.html', countries=get_countries(), themes=get_themes())
 
 
 @app.route('/search')
 def search():
-    return render_template('search_modern.html', countries=airports_by_country, themes=THEMES)
+    return render_template('search_modern.html', countries_json=catalog_json(get_catalog()), themes=get_themes())
 
 
 @app.route('/search-advanced')
 def search_advanced():
-    return render_template('index.html', countries=airports_by_country, themes=THEMES)
+    return render_template('index.html', countries=get_countries(), themes=get_themes())
 
 
 @app.route('/results')
@@ -56,14 +198,73 @@ def destination_page(airport_code):
                          airport_code=airport_code,
                          airport_info=airport_info,
                          destination_info=airport_info,  # Alias pour compatibilité template
-                         themes=THEMES)
+                         themes=get_themes())
+
+
+@app.route('/api/airports')
+def get_airports_batch():
+    """Airports of ?countries=a,b,c in one response, the whole catalog without the parameter"""
+    catalog = get_catalog()
+    countries = request.args.get('countries')
+    if countries is not None:
+        # Canonical key: known countries only, in catalog order, so equivalent requests share bytes and ETag
+        requested = {country.strip() for country in countries.split(',')}
+        countries = tuple(country for country in catalog.country_names if country in requested)
+    return send_json_payload(airports_payload(catalog, countries), catalog.revision)
+
+
+@app.route('/api/airports/suggest')
+def suggest_airports_endpoint():
+    """Typeahead over airport codes, names and cities (?q=charl&limit=10)"""
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', DEFAULT_SUGGESTIONS, type=int)
+    return jsonify(suggest_airports(query, limit))
 
 
 @app.route('/api/airports/<country_code>')
 def get_airports(country_code):
-    if country_code in airports_by_country:
-        return jsonify(airports_by_country[country_code]['airports'])
-    return jsonify({})
+    catalog = get_catalog()
+    return send_json_payload(country_airports_payload(catalog, country_code), catalog.revision)
+
+
+def parse_search_params(data):
+    """Build FlightSearchService parameters from a search request body"""
+    search_params = {
+        'departure_airports': data.get('departure_airports', []),
+        'origin_near': data.get('origin_near'),  # {'lat', 'lon' or 'airport', 'radius_km'}
+        'max_distance_km': data.get('max_distance_km'),  # Destinations within this flight radius
+        'departure_date_from': data.get('departure_date_from'),
+        'departure_date_to': data.get('departure_date_to'),
+        'min_stay_duration': int(data.get('min_stay_duration', 4)),
+        'theme': data.get('theme'),
+        'destination_filter': data.get('destination_filter'),  # Compound filter, see airport_themes.query_airports
+        'strategy': data.get('strategy'),  # 'per_pair', 'per_origin' or 'calendar', defaults to config
+        # Stay constraints applied when pairing one-way legs ('calendar' strategy)
+        'max_stay_duration': data.get('max_stay_duration'),
+        'departure_weekdays': data.get('departure_weekdays'),
+        'return_weekdays': data.get('return_weekdays'),
+        'max_price': data.get('max_price'),
+        'trips_per_route': data.get('trips_per_route')
+    }
+    
+    # Add country-based search if no theme
+    if not search_params['theme']:
+        search_params.update({
+            'target_countries': data.get('target_countries', []),
+            'coastal_only': data.get('coastal_only')
+        })
+    
+    return search_params
+
+
+def attach_weather(trips):
+    """Set 'weather' on trips: climate normals for far departures, one bulk lookup for the other destinations"""
+    code_dates = [(trip['destination'], trip.get('departure_time')) for trip in trips]
+    weather_by_date = weather_service.get_weather_for_dates(code_dates)
+    for trip, code_date in zip(trips, code_dates):
+        weather_data = weather_by_date.get(code_date)
+        if weather_data:
+            trip['weather'] = weather_data
 
 
 @app.route('/api/search', methods=['POST'])
@@ -72,45 +273,184 @@ def search_flights():
         data = request.json
         
         # Parse search parameters
-        search_params = {
-            'departure_airports': data.get('departure_airports', []),
-            'departure_date_from': data.get('departure_date_from'),
-            'departure_date_to': data.get('departure_date_to'),
-            'min_stay_duration': int(data.get('min_stay_duration', 4)),
-            'theme': data.get('theme')
-        }
-        
-        # Add country-based search if no theme
-        if not search_params['theme']:
-            search_params.update({
-                'target_countries': data.get('target_countries', []),
-                'coastal_only': data.get('coastal_only')
-            })
+        search_params = parse_search_params(data)
         
         # Search flights
+        calendar_coverage = flight_service.calendar_coverage(search_params)
         results = flight_service.search_flights(search_params)
         
-        # Add weather data if requested
-        include_weather = data.get('include_weather', False)
-        if include_weather and results:
-            for flight in results:
-                weather_data = weather_service.get_weather(flight['destination'])
-                if weather_data:
-                    flight['weather'] = weather_data
+        # Keep the full result set server-side, the client pages through it
+        result_set_id = result_store.save(results, search_params)
+        page = result_store.get_page(result_set_id, limit=RESULTS_PAGE_SIZE)
+        
+        # Fares are returned without waiting on weather: clients fetch it afterwards from /api/weather
         
         return jsonify({
             'success': True,
-            'results': results[:50],  # Limit to top 50 results
-            'total_found': len(results)
+            'results': page['results'],
+            'total_found': len(results),
+            'result_set_id': result_set_id,
+            'next_cursor': page['next_cursor'],
+            'calendar_coverage': calendar_coverage
         })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
 
+@app.route('/api/search/stream', methods=['POST'])
+def search_flights_stream():
+    """Stream search results as NDJSON: one 'route' event per completed route, then a 'summary' event"""
+    data = request.json or {}
+    
+    def generate():
+        started = time.monotonic()
+        first_result_ms = None
+        all_results = []
+        routes = 0
+        
+        try:
+            search_params = parse_search_params(data)
+            calendar_coverage = flight_service.calendar_coverage(search_params)
+            for (origin, destination), trips in flight_service.iter_route_results(search_params):
+                routes += 1
+                if not trips:
+                    continue
+                
+                trips.sort(key=lambda x: x['total_price'])
+                all_results.extend(trips)
+                if first_result_ms is None:
+                    first_result_ms = int((time.monotonic() - started) * 1000)
+                
+                yield app.json.dumps({
+                    'type': 'route',
+                    'origin': origin,
+                    'destination': destination,
+                    'results': trips
+                }) + '\n'
+            
+            result_set_id = result_store.save(all_results, search_params)
+            page = result_store.get_page(result_set_id, limit=RESULTS_PAGE_SIZE)
+            
+            yield app.json.dumps({
+                'type': 'summary',
+                'success': True,
+                'total_found': len(all_results),
+                'result_set_id': result_set_id,
+                'next_cursor': page['next_cursor'],
+                'routes': routes,
+                'first_result_ms': first_result_ms,
+                'calendar_coverage': calendar_coverage,
+                'elapsed_ms': int((time.monotonic() - started) * 1000)
+            }) + '\n'
+            
+        except Exception as e:
+            yield app.json.dumps({'type': 'summary', 'success': False, 'error': str(e)}) + '\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Let reverse proxies flush each event
+    })
+
+
+@app.route('/api/search/results/<result_set_id>')
+def get_search_results(result_set_id):
+    """Page through a stored search, re-sorted and filtered without calling Ryanair"""
+    try:
+        args = request.args
+        filters = {}
+        if args.get('min_price'):
+            filters['min_price'] = float(args['min_price'])
+        if args.get('max_price'):
+            filters['max_price'] = float(args['max_price'])
+        if args.get('date_from'):
+            filters['date_from'] = args['date_from']
+        if args.get('date_to'):
+            filters['date_to'] = args['date_to']
+        if args.get('destination'):
+            filters['destinations'] = args['destination'].upper().split(',')
+        if args.get('theme'):
+            filters['themes'] = args['theme'].split(',')
+        
+        page = result_store.get_page(
+            result_set_id,
+            cursor=args.get('cursor'),
+            limit=min(int(args.get('limit', RESULTS_PAGE_SIZE)), 200),
+            sort=args.get('sort', 'price'),
+            filters=filters
+        )
+        if page is None:
+            return jsonify({'success': False, 'error': 'Result set expired or unknown'}), 404
+        
+        if args.get('include_weather', '').lower() in ('1', 'true'):
+            attach_weather(page['results'])
+        
+        return jsonify({'success': True, **page})
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
+@app.route('/api/stats')
+def get_stats():
+    return jsonify({
+        'fare_cache': flight_service.fare_cache.stats(),
+        'search_coalescing': flight_service.single_flight.stats(),
+        'route_index': flight_service.route_index.stats(),
+        'fare_calendar': {**flight_service.fare_calendar.days.stats(), 'months_fetched': flight_service.fare_calendar.months_fetched},
+        'result_sets': result_store.result_sets.stats(),
+        'hotel_searches': {**hotel_service.result_sets.stats(), **hotel_service.single_flight.stats()},
+        'weather': weather_service.store.stats(),
+        'weather_refresher': weather_refresher.status(),
+        'airport_catalog': {'revision': get_catalog().revision, 'airports': len(get_catalog().airports_by_code)}
+    })
+
+
+@app.route('/api/catalog/reload', methods=['POST'])
+def reload_catalog_endpoint():
+    """Reload data/airports.json in this worker now (X-Admin-Token must match CATALOG_RELOAD_TOKEN)"""
+    token = app.config['CATALOG_RELOAD_TOKEN']
+    if not token or not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token):
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    try:
+        catalog = reload_catalog()
+        return jsonify({'success': True, 'revision': catalog.revision, 'airports': len(catalog.airports_by_code)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e), 'revision': get_catalog().revision}), 500
+
+
+@app.route('/api/weather')
+def get_weather_bulk():
+    """
+    Weather of several airports (?codes=CRL,BGY), fetched concurrently in one call
+
+    ?dates=2026-11-03,2027-01-10 gives each code's travel date, in the same order: beyond
+    the forecast horizon the airport's climate normals for that month are returned. A code
+    may be listed once per travel month; 'weather_by_month' has one report per code and
+    month ('' for a code without date), 'weather' the first one of each code.
+    """
+    codes = [code.strip().upper() for code in request.args.get('codes', '').split(',')]
+    dates = [travel_date.strip() for travel_date in request.args.get('dates', '').split(',')]
+    dates += [''] * (len(codes) - len(dates))
+    code_dates = list(dict.fromkeys((code, travel_date or None) for code, travel_date in zip(codes, dates) if code))
+    weather_by_date = weather_service.get_weather_for_dates(code_dates[:WEATHER_MAX_CODES])
+
+    weather_by_code = {}
+    weather_by_month = {}
+    for (code, travel_date), weather_data in weather_by_date.items():
+        if weather_data:
+            weather_by_code.setdefault(code, weather_data)
+            weather_by_month.setdefault(code, {}).setdefault((travel_date or '')[:7], weather_data)
+    return jsonify({
+        'success': True,
+        'weather': weather_by_code,
+        'weather_by_month': weather_by_month
+    })
+
+
 @app.route('/api/weather/<airport_code>')
 def get_weather_for_airport(airport_code):
-    weather_data = weather_service.get_weather(airport_code)
+    weather_data = weather_service.get_weather(airport_code, request.args.get('date'))
     if weather_data:
         return jsonify({'success': True, 'weather': weather_data})
     return jsonify({'success': False, 'error': 'Weather data unavailable'})
@@ -155,7 +495,7 @@ def get_activities(destination):
 
 @app.route('/api/activity-categories')
 def get_activity_categories():
-    return jsonify(THEMES)
+    return jsonify(dict(get_themes()))
 
 
 @app.route('/api/hotels/search')
@@ -186,7 +526,8 @@ def search_hotels():
         if request.args.get('sort'):
             filters['sort'] = request.args.get('sort')
         
-        # Search hotels
+        # Search hotels: only hotel_class and free_cancellation reach SERP API, the
+        # other filters and the sort are applied to the cached unfiltered search
         result = hotel_service.search_hotels(
             destination, checkin_date, checkout_date, adults, **filters
         )
@@ -207,4 +548,7 @@ def trip_recap():
 
 
 if __name__ == '__main__':
+    # Dev server only: under gunicorn SIGHUP belongs to the server, workers rely on the file check and the reload endpoint
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, reload_catalog_in_background)
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
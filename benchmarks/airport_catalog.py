@@ -0,0 +1,83 @@
+"""
+Per-lookup cost of the airport_themes helpers: linear scans vs the import-time indexes
+
+The linear implementations below are the helpers as they were before the
+indexes; both sides are checked to return the same answers.
+
+Usage: python benchmarks/airport_catalog.py [repeat]
+"""
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import airport_themes
+from airport_themes import airports_by_country, THEMES
+
+
+def scan_airport_name(code):
+    for country_data in airports_by_country.values():
+        if code in country_data['airports']:
+            return country_data['airports'][code]['name']
+    return code
+
+
+def scan_airport_info(code):
+    for country_data in airports_by_country.values():
+        if code in country_data['airports']:
+            return country_data['airports'][code]
+    return {'name': code, 'coastal': None, 'sea': None, 'themes': []}
+
+
+def scan_airports_by_theme(theme):
+    airports = []
+    for country_data in airports_by_country.values():
+        for code, airport_info in country_data['airports'].items():
+            if theme in airport_info.get('themes', []):
+                airports.append(code)
+    return airports
+
+
+def scan_coastal_airports_by_countries(countries, coastal_only=True):
+    airports = []
+    for country in countries:
+        if country in airports_by_country:
+            for code, info in airports_by_country[country]['airports'].items():
+                if coastal_only and info.get('coastal', False):
+                    airports.append(code)
+                elif not coastal_only and not info.get('coastal', True):
+                    airports.append(code)
+    return airports
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    codes = [code for country_data in airports_by_country.values() for code in country_data['airports']] + ['XXX']
+    countries = list(airports_by_country)
+
+    cases = [
+        ('get_airport_name', scan_airport_name, airport_themes.get_airport_name, [(code,) for code in codes]),
+        ('get_airport_info', scan_airport_info, airport_themes.get_airport_info, [(code,) for code in codes]),
+        ('get_airports_by_theme', scan_airports_by_theme, airport_themes.get_airports_by_theme,
+         [(theme,) for theme in THEMES]),
+        ('get_coastal_airports_by_countries', scan_coastal_airports_by_countries,
+         airport_themes.get_coastal_airports_by_countries,
+         [(countries[:3], True), (countries[:3], False), (countries, True)])
+    ]
+
+    print(f"{len(codes) - 1} airports in {len(countries)} countries, {repeat} lookups per case")
+    print(f"{'helper':>34} {'scan (ns)':>10} {'index (ns)':>11}")
+    for name, scan, indexed, arguments in cases:
+        for args in arguments:
+            assert scan(*args) == indexed(*args), (name, args)
+
+        timings = []
+        for implementation in (scan, indexed):
+            calls = [arguments[index % len(arguments)] for index in range(repeat)]
+            elapsed = timeit.timeit(lambda: [implementation(*args) for args in calls], number=1)
+            timings.append(elapsed / repeat * 1e9)
+        print(f"{name:>34} {timings[0]:>10.0f} {timings[1]:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
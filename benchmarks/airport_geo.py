@@ -0,0 +1,80 @@
+"""
+Radius, k-nearest and bounding-box queries: grid index vs brute-force haversine
+
+Runs on the real catalog and on synthetic catalogs spread over Europe, and
+checks that both sides return the same airports.
+
+Usage: python benchmarks/airport_geo.py [queries]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from airport_themes import Airport, AirportGeoIndex, get_catalog, haversine_km
+
+
+def synthetic_airports(size, seed=7):
+    generator = random.Random(seed)
+    return [
+        Airport(f'A{index:05d}', f'Airport {index}', 'synthetic',
+                latitude=generator.uniform(27, 71), longitude=generator.uniform(-25, 45))
+        for index in range(size)
+    ]
+
+
+def brute_within(points, latitude, longitude, radius_km):
+    results = [(code, haversine_km(latitude, longitude, *point)) for code, point in points.items()]
+    return sorted((result for result in results if result[1] <= radius_km), key=lambda result: result[1])
+
+
+def brute_nearest(points, latitude, longitude, k):
+    results = [(code, haversine_km(latitude, longitude, *point)) for code, point in points.items()]
+    return sorted(results, key=lambda result: result[1])[:k]
+
+
+def brute_bbox(points, min_latitude, min_longitude, max_latitude, max_longitude):
+    return [
+        code for code, (latitude, longitude) in points.items()
+        if min_latitude <= latitude <= max_latitude and min_longitude <= longitude <= max_longitude
+    ]
+
+
+def timed(run, queries):
+    start = time.perf_counter()
+    answers = [run(*query) for query in queries]
+    return answers, (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    generator = random.Random(1)
+    points_queries = [(generator.uniform(35, 60), generator.uniform(-10, 30)) for _ in range(count)]
+
+    catalogs = [('catalog', get_catalog().airports)] + [
+        (f'{size} synthetic', synthetic_airports(size)) for size in (1000, 10000)
+    ]
+
+    print(f"{'airports':>16} {'query':>12} {'brute (us)':>11} {'grid (us)':>10}")
+    for label, airports in catalogs:
+        index = AirportGeoIndex(airports)
+        points = index.coordinates
+        cases = [
+            ('within 100', brute_within, index.within, [(lat, lon, 100) for lat, lon in points_queries]),
+            ('within 800', brute_within, index.within, [(lat, lon, 800) for lat, lon in points_queries]),
+            ('nearest 5', brute_nearest, index.nearest, [(lat, lon, 5) for lat, lon in points_queries]),
+            ('bbox 4x6', brute_bbox, index.bbox, [(lat, lon, lat + 4, lon + 6) for lat, lon in points_queries])
+        ]
+        for name, brute, indexed, queries in cases:
+            expected, brute_us = timed(lambda *query: brute(points, *query), queries)
+            answers, grid_us = timed(indexed, queries)
+            if name.startswith('bbox'):
+                assert answers == expected
+            else:
+                assert [[code for code, _ in answer] for answer in answers] == [[code for code, _ in answer] for answer in expected]
+            print(f"{label:>16} {name:>12} {brute_us:>11.1f} {grid_us:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Compound destination filters: bitset evaluation vs a per-airport predicate scan
+
+Synthetic catalogs of growing size are generated with the real catalog's
+themes, countries and seas, then queried with the same compound filter.
+
+Usage: python benchmarks/airport_query.py [repeat]
+"""
+import os
+import sys
+import time
+import zlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from airport_themes import Airport, AirportQueryIndex, THEMES, get_catalog
+
+FILTER = {
+    'theme': ['beach', 'party'],
+    'country': ['spain', 'italy', 'greece'],
+    'not': {'sea': 'Atlantic'}
+}
+
+
+def synthetic_catalog(size):
+    """`size` Airport records over the real countries with pseudo-random attributes"""
+    catalog = get_catalog()
+    countries = list(catalog.country_names)
+    seas = sorted({airport.sea for airport in catalog.airports if airport.sea})
+    themes = list(THEMES)
+    airports = []
+    for index in range(size):
+        seed = zlib.crc32(str(index).encode())
+        coastal = seed % 3 != 0
+        airports.append(Airport(
+            f'A{index:05d}', f'Airport {index}', countries[seed % len(countries)],
+            coastal, seas[seed % len(seas)] if coastal else None,
+            [theme for bit, theme in enumerate(themes) if seed >> (8 + bit) & 1]
+        ))
+    return airports
+
+
+def scan(airports):
+    """Reference answer: the filter evaluated airport by airport"""
+    return [
+        airport.code for airport in airports
+        if airport.country in FILTER['country']
+        and any(theme in airport.themes for theme in FILTER['theme'])
+        and airport.sea != 'Atlantic'
+    ]
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"{'airports':>9} {'matches':>8} {'build (ms)':>11} {'scan (us)':>10} {'bitset (us)':>12}")
+    for size in (250, 2500, 25000):
+        catalog = synthetic_catalog(size)
+
+        start = time.perf_counter()
+        index = AirportQueryIndex(catalog)
+        build_elapsed = time.perf_counter() - start
+
+        expected = scan(catalog)
+        assert index.query(FILTER) == expected
+
+        timings = []
+        for run in (lambda: scan(catalog), lambda: index.query(FILTER)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                run()
+            timings.append((time.perf_counter() - start) / repeat * 1e6)
+
+        print(f"{size:>9} {len(expected):>8} {build_elapsed * 1000:>11.1f} {timings[0]:>10.0f} {timings[1]:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Airport typeahead: trie + trigram index vs a linear scan of normalized names
+
+A synthetic catalog of accented pseudo-city names (random syllables) is indexed, then queried with
+prefixes of its own cities, codes and airport names, and with misspellings
+(two letters swapped). Reports build time, retained memory, and per-query
+latency percentiles of both sides.
+
+Usage: python benchmarks/airport_suggest.py [size (<= 17576)] [queries]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.airport_suggest import AirportSuggestIndex, get_suggest_index, index_words, normalize
+from airport_themes import get_catalog
+
+# Onset + vowel + coda syllables, accented vowels included: a few thousand distinct syllables
+ONSETS = ['', 'b', 'br', 'c', 'ch', 'ç', 'd', 'f', 'g', 'gr', 'h', 'k', 'kr', 'l', 'm', 'n', 'p', 'pr', 'r', 's', 'st', 't', 'tr', 'v', 'z']
+VOWELS = ['a', 'e', 'i', 'o', 'u', 'á', 'é', 'ó', 'ü', 'ia', 'ou']
+CODAS = ['', '', 'l', 'n', 'r', 's', 'x', 'ck', 'w']
+SUFFIXES = ['International Airport', 'Airport', 'Regional Airport', 'South Airport', 'North Airport']
+
+
+def synthetic_entries(size, seed=3):
+    generator = random.Random(seed)
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    codes = generator.sample([a + b + c for a in letters for b in letters for c in letters], size)
+    entries = []
+    for code in codes:
+        city = ''.join(
+            generator.choice(ONSETS) + generator.choice(VOWELS) + generator.choice(CODAS)
+            for _ in range(generator.randint(2, 3))
+        ).capitalize()
+        entries.append({
+            'code': code,
+            'name': f'{city} {generator.choice(SUFFIXES)}',
+            'city': city,
+            'country': 'synthetic',
+            'country_name': 'Synthetic'
+        })
+    return entries
+
+
+def linear_suggest(rows, query, limit):
+    """Reference scan: word-start prefix over each normalized field"""
+    text = ' '.join(index_words(query))
+    matches = []
+    for entry, words in rows:
+        if any(field[start:].startswith(text) for field in words for start in range(len(field))
+               if start == 0 or field[start - 1] == ' '):
+            matches.append(entry)
+            if len(matches) == limit:
+                break
+    return matches
+
+
+def queries_for(entries, count, seed=5):
+    generator = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        entry = generator.choice(entries)
+        kind = generator.randrange(4)
+        if kind == 0:
+            queries.append(entry['code'].lower()[:generator.randint(1, 3)])
+        elif kind == 1:
+            queries.append(entry['city'][:generator.randint(2, len(entry['city']))])
+        elif kind == 2:
+            queries.append(entry['name'][:generator.randint(4, len(entry['name']))])
+        else:
+            city = normalize(entry['city'])
+            swap = generator.randrange(len(city) - 1)
+            queries.append(city[:swap] + city[swap + 1] + city[swap] + city[swap + 2:])
+    return queries
+
+
+def percentiles(run, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        run(query)
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)], timings[-1]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    limit = 10
+
+    catalogs = [('catalog', get_suggest_index(get_catalog()).entries), (f'{size} synthetic', synthetic_entries(size))]
+
+    print(f"{'airports':>16} {'build (ms)':>11} {'index (MiB)':>12} {'side':>7} {'p50 (us)':>9} {'p99 (us)':>9} {'max (us)':>9}")
+    for label, entries in catalogs:
+        start = time.perf_counter()
+        index = AirportSuggestIndex(entries)
+        build_elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        traced_index = AirportSuggestIndex(entries)
+        retained = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        tracemalloc.stop()
+        del traced_index
+
+        rows = [(entry, [' '.join(index_words(entry[field])) for field in ('code', 'city', 'name')]) for entry in entries]
+        queries = queries_for(entries, count)
+
+        # Prefix answers agree with the scan (same entries, trie order aside)
+        for query in queries[:200]:
+            expected = {entry['code'] for entry in linear_suggest(rows, query, len(entries))}
+            found = index.suggest(query, limit)
+            prefix_found = [entry for entry in found if entry['code'] in expected]
+            assert len(prefix_found) == min(limit, len(expected)) or len(expected) > limit, query
+
+        for side, run in (('scan', lambda query: linear_suggest(rows, query, limit)),
+                          ('index', lambda query: index.suggest(query, limit))):
+            p50, p99, worst = percentiles(run, queries)
+            print(f"{label:>16} {build_elapsed * 1000:>11.0f} {retained:>12.1f} {side:>7} {p50:>9.0f} {p99:>9.0f} {worst:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
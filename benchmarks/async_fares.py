@@ -0,0 +1,49 @@
+"""
+Concurrent fare lookups through AsyncRyanairFareClient against the local stand-in
+
+Shows wall time and thread count as the number of in-flight lookups grows.
+
+Usage: python benchmarks/async_fares.py [latency_seconds]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.async_fare_client import AsyncRyanairFareClient
+from fare_stand_in import start_stand_in
+
+
+async def main(latency):
+    runner, base_url = await start_stand_in(latency=latency)
+    client = AsyncRyanairFareClient(base_url=base_url, max_connections=500)
+
+    print(f"Stand-in latency: {latency * 1000:.0f} ms per request")
+    print(f"{'lookups':>8} {'wall (s)':>9} {'trips':>6} {'threads':>8}")
+    try:
+        for lookups in (100, 1000, 5000):
+            queries = {
+                index: {
+                    'source_airport': 'CRL',
+                    'date_from': '2026-11-06',
+                    'date_to': '2026-11-08',
+                    'return_date_from': '2026-11-09',
+                    'return_date_to': '2026-11-11',
+                    'destination_airport': f'D{index:04d}'
+                }
+                for index in range(lookups)
+            }
+            start = time.perf_counter()
+            results = await client.get_many_return_flights(queries, call_timeout=30)
+            elapsed = time.perf_counter() - start
+            trips = sum(len(trips) for trips in results.values())
+            print(f"{lookups:>8} {elapsed:>9.2f} {trips:>6} {threading.active_count():>8}")
+    finally:
+        await client.aclose()
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.05))
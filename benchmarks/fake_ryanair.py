@@ -0,0 +1,61 @@
+"""
+Local stand-in for the ryanair library client used by the benchmarks
+"""
+import time
+import zlib
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+Flight = namedtuple('Flight', ('departureTime', 'flightNumber', 'price', 'currency',
+                               'origin', 'originFull', 'destination', 'destinationFull'))
+Trip = namedtuple('Trip', ('totalPrice', 'outbound', 'inbound'))
+
+
+class FakeRyanair:
+    def __init__(self, latency=0.05, trips_per_route=1, served_ratio=1.0, destinations=()):
+        """
+        Args:
+            latency: Seconds each upstream call sleeps, like a real round-trip
+            trips_per_route: Number of trips returned for every route
+            served_ratio: Share of origin/destination pairs the fake network operates
+            destinations: Airports returned by any-destination queries
+        """
+        self.latency = latency
+        self.trips_per_route = trips_per_route
+        self.served_ratio = served_ratio
+        self.destinations = list(destinations)
+        self.calls = 0
+
+    def serves(self, origin, destination):
+        """Deterministic pseudo-random route network"""
+        if origin == destination:
+            return False
+        return zlib.crc32(f'{origin}{destination}'.encode()) % 1000 < self.served_ratio * 1000
+
+    def get_cheapest_return_flights(self, source_airport, date_from, date_to,
+                                    return_date_from, return_date_to,
+                                    destination_country=None, custom_params=None,
+                                    destination_airport=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+
+        departure = datetime.strptime(date_from, '%Y-%m-%d') + timedelta(hours=7)
+        arrival = datetime.strptime(return_date_from, '%Y-%m-%d') + timedelta(hours=19)
+        destinations = [destination_airport] if destination_airport else self.destinations
+
+        trips = []
+        for destination in destinations:
+            if self.serves(source_airport, destination):
+                trips.extend(self._route_trips(source_airport, destination, departure, arrival))
+        return trips
+
+    def _route_trips(self, source_airport, destination, departure, arrival):
+        trips = []
+        for index in range(self.trips_per_route):
+            price = 20 + zlib.crc32(f'{source_airport}{destination}{index}'.encode()) % 8000 / 100
+            outbound = Flight(departure, f'FR{index}', price, 'EUR',
+                              source_airport, source_airport, destination, destination)
+            inbound = Flight(arrival, f'FR{index + 1}', price, 'EUR',
+                             destination, destination, source_airport, source_airport)
+            trips.append(Trip(outbound.price + inbound.price, outbound, inbound))
+        return trips
@@ -0,0 +1,98 @@
+"""
+Local HTTP stand-in for the Ryanair fare API serving recorded payloads
+
+Every roundTripFares request is answered with payloads/roundTripFares.json,
+relabelled with the requested origin and destination. cheapestPerDay
+requests get one fare per day of the requested month, cloned from the
+recorded fares of payloads/cheapestPerDay.json. Both wait an optional
+artificial latency first.
+
+Usage: python benchmarks/fare_stand_in.py [port] [latency_seconds]
+"""
+import asyncio
+import copy
+import json
+import os
+import sys
+import zlib
+from datetime import date, timedelta
+
+from aiohttp import web
+
+PAYLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'payloads')
+
+
+def load_payload(name):
+    with open(os.path.join(PAYLOAD_DIR, f'{name}.json'), encoding='utf-8') as payload_file:
+        return json.load(payload_file)
+
+
+def create_app(latency=0.0):
+    """Build the stand-in aiohttp application"""
+    round_trip_payload = load_payload('roundTripFares')
+    per_day_payload = load_payload('cheapestPerDay')
+    stats = {'requests': 0}
+
+    async def round_trip_fares(request):
+        stats['requests'] += 1
+        if latency:
+            await asyncio.sleep(latency)
+
+        origin = request.query.get('departureAirportIataCode')
+        destination = request.query.get('arrivalAirportIataCode')
+        payload = copy.deepcopy(round_trip_payload)
+        for fare in payload['fares']:
+            if origin:
+                fare['outbound']['departureAirport']['iataCode'] = origin
+                fare['inbound']['arrivalAirport']['iataCode'] = origin
+            if destination:
+                fare['outbound']['arrivalAirport']['iataCode'] = destination
+                fare['inbound']['departureAirport']['iataCode'] = destination
+        return web.json_response(payload)
+
+    async def cheapest_per_day(request):
+        stats['requests'] += 1
+        if latency:
+            await asyncio.sleep(latency)
+
+        origin = request.match_info['origin']
+        destination = request.match_info['destination']
+        day = date.fromisoformat(request.query['outboundMonthOfDate']).replace(day=1)
+        templates = per_day_payload['outbound']['fares']
+
+        fares = []
+        while day.month == date.fromisoformat(request.query['outboundMonthOfDate']).month:
+            fare = copy.deepcopy(templates[day.toordinal() % len(templates)])
+            fare['day'] = day.isoformat()
+            if fare['price']:
+                fare['departureDate'] = f"{day.isoformat()}T{fare['departureDate'][11:]}"
+                fare['arrivalDate'] = f"{day.isoformat()}T{fare['arrivalDate'][11:]}"
+                fare['price']['value'] = 15 + zlib.crc32(f'{origin}{destination}{day}'.encode()) % 6000 / 100
+            fares.append(fare)
+            day += timedelta(days=1)
+
+        payload = copy.deepcopy(per_day_payload)
+        payload['outbound']['fares'] = fares
+        return web.json_response(payload)
+
+    app = web.Application()
+    app['stats'] = stats
+    app.router.add_get('/farfnd/v4/roundTripFares', round_trip_fares)
+    app.router.add_get('/farfnd/v4/oneWayFares/{origin}/{destination}/cheapestPerDay', cheapest_per_day)
+    return app
+
+
+async def start_stand_in(port=0, latency=0.0):
+    """Start the stand-in in the running loop, returns (runner, base_url)"""
+    runner = web.AppRunner(create_app(latency))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}/farfnd/v4/'
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8081
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    web.run_app(create_app(latency), host='127.0.0.1', port=port)
@@ -0,0 +1,57 @@
+"""
+Wall time of FlightSearchService.search_flights, serial vs concurrent, by pair count
+
+Usage: python benchmarks/flight_fanout.py [latency_seconds]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from airport_themes import airports_by_country
+from services.flight_service import FlightSearchService
+from fake_ryanair import FakeRyanair
+
+
+def run(mode, origins, destinations, latency):
+    client = FakeRyanair(latency=latency)
+    service = FlightSearchService({
+        'FLIGHT_SEARCH_EXECUTION': mode,
+        'FLIGHT_SEARCH_MAX_CONCURRENCY': 16,
+        'FLIGHT_SEARCH_CALL_TIMEOUT': 10,
+        'FLIGHT_SEARCH_DEADLINE': 120
+    }, client=client)
+
+    # Country-based search restricted to the chosen destinations
+    search_params = {
+        'departure_airports': origins,
+        'departure_date_from': '2026-11-06',
+        'departure_date_to': '2026-11-08',
+        'min_stay_duration': 2,
+        'execution': mode
+    }
+    service._get_target_destinations = lambda params: destinations
+
+    start = time.perf_counter()
+    results = service.search_flights(search_params)
+    return time.perf_counter() - start, len(results), client.calls
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    all_destinations = [code for country in airports_by_country.values() for code in country['airports']]
+    origins = ['BRU', 'CRL', 'LGG']
+
+    print(f"Fake upstream latency: {latency * 1000:.0f} ms per call")
+    print(f"{'pairs':>6} {'serial (s)':>11} {'concurrent (s)':>15} {'speedup':>8}")
+    for destination_count in (5, 10, 20, 40):
+        destinations = all_destinations[:destination_count]
+        serial_time, serial_found, _ = run('serial', origins, destinations, latency)
+        concurrent_time, concurrent_found, _ = run('concurrent', origins, destinations, latency)
+        assert serial_found == concurrent_found
+        pairs = len(origins) * len(destinations)
+        print(f"{pairs:>6} {serial_time:>11.2f} {concurrent_time:>15.2f} {serial_time / concurrent_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Upstream calls and wall time of the per-pair vs per-origin search strategies
+
+Usage: python benchmarks/search_strategy.py [latency_seconds] [served_ratio]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from airport_themes import airports_by_country, THEMES
+from services.flight_service import FlightSearchService
+from fake_ryanair import FakeRyanair
+
+
+def run(strategy, theme, latency, served_ratio):
+    all_airports = [code for country in airports_by_country.values() for code in country['airports']]
+    client = FakeRyanair(latency=latency, served_ratio=served_ratio, destinations=all_airports)
+    service = FlightSearchService({'FLIGHT_SEARCH_STRATEGY': strategy}, client=client)
+
+    start = time.perf_counter()
+    results = service.search_flights({
+        'departure_airports': ['BRU', 'CRL', 'LGG'],
+        'departure_date_from': '2026-11-06',
+        'departure_date_to': '2026-11-08',
+        'min_stay_duration': 2,
+        'theme': theme
+    })
+    return time.perf_counter() - start, len(results), client.calls
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    served_ratio = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+
+    print(f"Fake upstream latency: {latency * 1000:.0f} ms, served routes: {served_ratio:.0%}")
+    print(f"{'theme':>10} {'strategy':>11} {'calls':>6} {'trips':>6} {'wall (s)':>9}")
+    for theme in THEMES:
+        found = set()
+        for strategy in ('per_pair', 'per_origin'):
+            elapsed, trips, calls = run(strategy, theme, latency, served_ratio)
+            found.add(trips)
+            print(f"{theme:>10} {strategy:>11} {calls:>6} {trips:>6} {elapsed:>9.2f}")
+        assert len(found) == 1
+
+
+if __name__ == '__main__':
+    main()
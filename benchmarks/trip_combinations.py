@@ -0,0 +1,91 @@
+"""
+Pairing one-way day fares into return trips: nested loops vs the NumPy join
+
+Routes get synthetic outbound and inbound calendars, then both implementations
+answer the same sequence of stay-constraint changes.
+
+Usage: python benchmarks/trip_combinations.py [routes] [departure_days]
+"""
+import os
+import sys
+import time
+import zlib
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.trip_combiner import StayConstraints, cheapest_combinations
+
+
+def synthetic_days(route, date_from, days):
+    """One fare per day, every seventh day without flights"""
+    fares = {}
+    for offset in range(days):
+        day = (date.fromisoformat(date_from) + timedelta(days=offset)).isoformat()
+        seed = zlib.crc32(f'{route}{day}'.encode())
+        fares[day] = None if seed % 7 == 0 else {
+            'departure_time': f'{day}T{6 + seed % 14:02d}:30:00',
+            'price': 15 + seed % 6000 / 100,
+            'currency': 'EUR'
+        }
+    return fares
+
+
+def nested_loops(outbound_days, inbound_days, constraints):
+    """Reference implementation: every (outbound, inbound) pair in Python"""
+    trips = []
+    for outbound in filter(None, outbound_days.values()):
+        outbound_day = date.fromisoformat(outbound['departure_time'][:10])
+        if constraints.departure_weekdays is not None and outbound_day.weekday() not in constraints.departure_weekdays:
+            continue
+        for inbound in filter(None, inbound_days.values()):
+            inbound_day = date.fromisoformat(inbound['departure_time'][:10])
+            if constraints.return_weekdays is not None and inbound_day.weekday() not in constraints.return_weekdays:
+                continue
+            stay = (inbound_day - outbound_day).days
+            total = outbound['price'] + inbound['price']
+            if max(constraints.min_stay, 1) <= stay <= constraints.max_stay and (
+                    constraints.max_price is None or total <= constraints.max_price):
+                trips.append((total, outbound, inbound))
+    trips.sort(key=lambda trip: trip[0])
+    return trips[:constraints.limit]
+
+
+def main():
+    routes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    departure_days = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    changes = [
+        StayConstraints(min_stay=2, max_stay=4),
+        StayConstraints(min_stay=3, max_stay=7, limit=5),
+        StayConstraints(min_stay=2, max_stay=3, departure_weekdays=(4,), return_weekdays=(6, 0)),
+        StayConstraints(min_stay=7, max_stay=14, max_price=80.0, limit=3)
+    ]
+    max_stay = max(constraints.max_stay for constraints in changes)
+    calendars = [
+        (synthetic_days(f'{route}-out', '2026-11-01', departure_days),
+         synthetic_days(f'{route}-in', '2026-11-01', departure_days + max_stay))
+        for route in range(routes)
+    ]
+
+    print(f"{routes} routes, {departure_days} departure days")
+    print(f"{'constraints':>34} {'loops (ms)':>11} {'numpy (ms)':>11}")
+    for constraints in changes:
+        start = time.perf_counter()
+        expected = [nested_loops(outbound, inbound, constraints) for outbound, inbound in calendars]
+        loops_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        combined = [cheapest_combinations(outbound, inbound, constraints) for outbound, inbound in calendars]
+        numpy_elapsed = time.perf_counter() - start
+
+        assert [[trip[0] for trip in trips] for trips in combined] == [[trip[0] for trip in trips] for trips in expected]
+        label = f"stay {constraints.min_stay}-{constraints.max_stay} top {constraints.limit}"
+        if constraints.departure_weekdays:
+            label += ' weekdays'
+        if constraints.max_price:
+            label += f' <= {constraints.max_price:.0f}'
+        print(f"{label:>34} {loops_elapsed * 1000:>11.1f} {numpy_elapsed * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
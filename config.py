@@ -17,9 +17,49 @@ class Config:
     
     # SERP API for Google Hotels
     SERPAPI_KEY = os.environ.get('SERPAPI_KEY') or 'your_serpapi_key'
+    HOTEL_SEARCH_MAX_CONCURRENCY = int(os.environ.get('HOTEL_SEARCH_MAX_CONCURRENCY', 4))  # In-flight SERP API calls per process
+    HOTEL_SEARCH_DEADLINE = float(os.environ.get('HOTEL_SEARCH_DEADLINE', 25))  # Seconds per hotel search, follow-up requests included
+    HOTEL_CACHE_TTL = int(os.environ.get('HOTEL_CACHE_TTL', 1800))  # Seconds an unfiltered hotel search is reused for other filters and sorts
+    HOTEL_CACHE_SIZE = int(os.environ.get('HOTEL_CACHE_SIZE', 500))  # Cached hotel searches (LRU)
     
     # Cache settings
     CACHE_TIMEOUT = int(os.environ.get('CACHE_TIMEOUT', 3600))  # 1 hour default
+    FARE_CACHE_SIZE = int(os.environ.get('FARE_CACHE_SIZE', 5000))  # Cached routes (LRU)
+    FARE_CALENDAR_SIZE = int(os.environ.get('FARE_CALENDAR_SIZE', 200000))  # Cached route days (LRU)
+    SEARCH_RESULTS_TTL = int(os.environ.get('SEARCH_RESULTS_TTL', 1800))  # Pageable result sets
+    SEARCH_RESULTS_MAX_SETS = int(os.environ.get('SEARCH_RESULTS_MAX_SETS', 500))
+    WEATHER_CACHE_TTL = int(os.environ.get('WEATHER_CACHE_TTL', 900))  # Seconds a city's weather stays fresh
+    WEATHER_STALE_TTL = int(os.environ.get('WEATHER_STALE_TTL', 3600))  # Then served stale while refreshed in the background
+    WEATHER_NEGATIVE_TTL = int(os.environ.get('WEATHER_NEGATIVE_TTL', 60))  # Failed lookups remembered this long
+    WEATHER_CACHE_SIZE = int(os.environ.get('WEATHER_CACHE_SIZE', 1000))  # Cached cities (LRU)
+    WEATHER_MAX_CONCURRENCY = int(os.environ.get('WEATHER_MAX_CONCURRENCY', 4))  # Parallel OpenWeather calls (group queries of 20 cities)
+    WEATHER_FORECAST_DAYS = int(os.environ.get('WEATHER_FORECAST_DAYS', 5))  # Further travel dates get climate normals (data/climate_normals.json)
+    WEATHER_REFRESH_INTERVAL = float(os.environ.get('WEATHER_REFRESH_INTERVAL', 600))  # Background refresh of every catalog city, 0 = off
+    WEATHER_REFRESH_BATCH_SIZE = int(os.environ.get('WEATHER_REFRESH_BATCH_SIZE', 20))  # Cities per refresh batch
+    WEATHER_REFRESH_BATCH_PAUSE = float(os.environ.get('WEATHER_REFRESH_BATCH_PAUSE', 1.0))  # Seconds between batches
+    AIRPORTS_CACHE_MAX_AGE = int(os.environ.get('AIRPORTS_CACHE_MAX_AGE', 86400))  # Browser cache of /api/airports URLs versioned with ?v=<catalog revision>; others are no-cache
+    
+    # Airport catalog hot reload (data/airports.json)
+    CATALOG_CHECK_INTERVAL = float(os.environ.get('CATALOG_CHECK_INTERVAL', 30))  # Seconds between file checks per worker, 0 = off
+    CATALOG_RELOAD_TOKEN = os.environ.get('CATALOG_RELOAD_TOKEN')  # Enables POST /api/catalog/reload
+    
+    # Flight search backend ('ryanair' library or 'async' fare client)
+    FLIGHT_SEARCH_BACKEND = os.environ.get('FLIGHT_SEARCH_BACKEND', 'ryanair')
+    RYANAIR_API_BASE_URL = os.environ.get('RYANAIR_API_BASE_URL')  # None = official fare API
+    RYANAIR_MAX_CONNECTIONS = int(os.environ.get('RYANAIR_MAX_CONNECTIONS', 100))  # Shared async connection pool
+    
+    # Served-route index written by `python -m services.route_index`
+    ROUTE_INDEX_PATH = os.environ.get('ROUTE_INDEX_PATH') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'route_index.json')
+    
+    # Flight search strategy ('per_pair', 'per_origin' any-destination queries or 'calendar' per-day fares)
+    FLIGHT_SEARCH_STRATEGY = os.environ.get('FLIGHT_SEARCH_STRATEGY', 'per_pair')
+    
+    # Flight search fan-out ('concurrent' or 'serial', ryanair backend only)
+    FLIGHT_SEARCH_EXECUTION = os.environ.get('FLIGHT_SEARCH_EXECUTION', 'concurrent')
+    FLIGHT_SEARCH_MAX_CONCURRENCY = int(os.environ.get('FLIGHT_SEARCH_MAX_CONCURRENCY', 8))  # In-flight Ryanair calls per process
+    FLIGHT_SEARCH_CALL_TIMEOUT = float(os.environ.get('FLIGHT_SEARCH_CALL_TIMEOUT', 15))  # Seconds per route
+    FLIGHT_SEARCH_DEADLINE = float(os.environ.get('FLIGHT_SEARCH_DEADLINE', 60))  # Seconds per search
+    FLIGHT_SEARCH_COALESCING = os.environ.get('FLIGHT_SEARCH_COALESCING', 'True').lower() == 'true'  # Share identical in-flight searches
     
     # Rate limiting
     RATE_LIMIT = os.environ.get('RATE_LIMIT', '100 per hour')
@@ -4,5 +4,6 @@ from .ryanair_service import RyanairLinkService
 from .accommodation_service import AccommodationService
 from .activities_service import AmadeusActivitiesService
 from .hotel_service import GoogleHotelsService
+from .result_store import SearchResultStore
 
-__all__ = ['FlightSearchService', 'WeatherService', 'RyanairLinkService', 'AccommodationService', 'AmadeusActivitiesService', 'GoogleHotelsService']
\ No newline at end of file
+__all__ = ['FlightSearchService', 'WeatherService', 'RyanairLinkService', 'AccommodationService', 'AmadeusActivitiesService', 'GoogleHotelsService', 'SearchResultStore']
\ No newline at end of file
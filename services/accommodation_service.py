@@ -1,4 +1,4 @@
-from airport_themes import get_airport_info
+from .airport_locations import resolve_airport
 
 
 class AccommodationService:
@@ -17,8 +17,7 @@ class AccommodationService:
         try:
             # Alternative: Use Booking.com API or web scraping
             # For now, return suggested booking links
-            airport_info = get_airport_info(destination)
-            city_name = self.extract_city_from_airport(airport_info['name'])
+            city_name = resolve_airport(destination).city
             
             accommodations['booking_links'] = [
                 {
@@ -43,14 +42,3 @@ class AccommodationService:
         except Exception as e:
             print(f"Error searching accommodations: {e}")
             return accommodations
-    
-    def extract_city_from_airport(self, airport_name):
-        """Extract city name from airport name"""
-        if not airport_name:
-            return ""
-        # Simple extraction - take first word before "Airport"
-        parts = airport_name.split()
-        for i, part in enumerate(parts):
-            if 'Airport' in part or 'International' in part:
-                return ' '.join(parts[:i]) if i > 0 else parts[0]
-        return parts[0] if parts else ""
\ No newline at end of file
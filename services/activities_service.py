@@ -2,6 +2,7 @@ import requests
 import re
 from amadeus import Client, ResponseError
 from airport_themes import get_airport_info
+from .airport_locations import resolve_airport
 
 
 class AmadeusActivitiesService:
@@ -12,42 +13,13 @@ class AmadeusActivitiesService:
             client_id=app_config['AMADEUS_API_KEY'],
             client_secret=app_config['AMADEUS_API_SECRET']
         )
-        
-        # Mapping aéroports vers coordonnées principales des villes
-        self.airport_coordinates = {
-            'BCN': (41.3851, 2.1734),    # Barcelona
-            'MAD': (40.4168, -3.7038),  # Madrid
-            'PMI': (39.5696, 2.6502),   # Palma
-            'FCO': (41.9028, 12.4964),  # Rome
-            'VCE': (45.4408, 12.3155),  # Venice
-            'MXP': (45.4642, 8.7064),   # Milan
-            'NAP': (40.8518, 14.2681),  # Naples
-            'CDG': (48.8566, 2.3522),   # Paris
-            'NCE': (43.7102, 7.2620),   # Nice
-            'LIS': (38.7223, -9.1393),  # Lisbon
-            'OPO': (41.1579, -8.6291),  # Porto
-            'ATH': (37.9755, 23.7348),  # Athens
-            'SKG': (40.6401, 22.9444),  # Thessaloniki
-            'DUB': (53.3498, -6.2603),  # Dublin
-            'STN': (51.5074, -0.1278),  # London
-            'LTN': (51.5074, -0.1278),  # London
-            'LGW': (51.5074, -0.1278),  # London
-            'AMS': (52.3676, 4.9041),   # Amsterdam
-            'BER': (52.5200, 13.4050),  # Berlin
-            'MUC': (48.1351, 11.5820),  # Munich
-            'PRG': (50.0755, 14.4378),  # Prague
-            'BUD': (47.4979, 19.0402),  # Budapest
-            'WAW': (52.2297, 21.0122),  # Warsaw
-            'VIE': (48.2082, 16.3738),  # Vienna
-            'ZUR': (47.3769, 8.5417),   # Zurich
-            'CPH': (55.6761, 12.5683),  # Copenhagen
-            'OSL': (59.9139, 10.7522),  # Oslo
-            'ARN': (59.3293, 18.0686),  # Stockholm
-        }
     
     def get_airport_coordinates(self, airport_code):
         """Get coordinates for airport or city"""
-        return self.airport_coordinates.get(airport_code, None)
+        location = resolve_airport(airport_code)
+        if location.latitude is None:
+            return None
+        return location.latitude, location.longitude
     
     def get_activities_for_destination(self, airport_code, theme=None, full_fetch=False):
         """Get activities suggestions for a destination based on theme - 100% dynamic"""
@@ -70,7 +42,7 @@ class AmadeusActivitiesService:
     def _get_quick_activities_preview(self, airport_code):
         """Get a quick preview of activities for search results without API calls"""
         airport_info = get_airport_info(airport_code)
-        city_name = self._extract_city_name_from_airport(airport_info.get('name', ''))
+        city_name = resolve_airport(airport_code).city
         
         # Return a few generic but realistic activities quickly
         preview_activities = {
@@ -293,7 +265,7 @@ class AmadeusActivitiesService:
     def _generate_generic_activities(self, airport_code, theme=None):
         """Generate minimal fallback activities only when Amadeus completely fails"""
         airport_info = get_airport_info(airport_code)
-        city_name = self._extract_city_name_from_airport(airport_info.get('name', ''))
+        city_name = resolve_airport(airport_code).city
         
         # Only return very basic activities as last resort
         generic_activities = {
@@ -311,8 +283,7 @@ class AmadeusActivitiesService:
     
     def _get_dynamic_activities(self, airport_code, theme=None):
         """Get activities using free dynamic APIs (Wikipedia + OpenStreetMap)"""
-        airport_info = get_airport_info(airport_code)
-        city_name = self._extract_city_name_from_airport(airport_info.get('name', ''))
+        city_name = resolve_airport(airport_code).city
         coordinates = self.get_airport_coordinates(airport_code)
         
         activities = {}
@@ -571,8 +542,7 @@ class AmadeusActivitiesService:
     
     def _generate_minimal_fallback_activities(self, airport_code):
         """Generate minimal fallback activities using city name"""
-        airport_info = get_airport_info(airport_code)
-        city_name = self._extract_city_name_from_airport(airport_info.get('name', ''))
+        city_name = resolve_airport(airport_code).city
         
         return {
             'culture': [
@@ -586,21 +556,6 @@ class AmadeusActivitiesService:
             ]
         }
     
-    def _extract_city_name_from_airport(self, airport_name):
-        """Extract city name from airport name"""
-        if not airport_name:
-            return "la ville"
-        
-        # Remove common airport-related words
-        city_name = airport_name.lower()
-        remove_words = ['airport', 'international', 'airfield', 'aéroport', 'aeroporto']
-        for word in remove_words:
-            city_name = city_name.replace(word, '')
-        
-        # Take first significant word
-        parts = [part.strip() for part in city_name.split() if len(part.strip()) > 2]
-        return parts[0].capitalize() if parts else "la ville"
-    
     def _determine_activity_type(self, name, category):
         """Determine activity type from name and category"""
         name_lower = name.lower()
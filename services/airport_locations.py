@@ -0,0 +1,193 @@
+"""
+Airport -> city resolution table shared by every service
+
+data/airport_locations.json maps each catalog airport to its canonical city,
+country code, city-centre coordinates and upstream ids. Services resolve
+airports through it instead of parsing airport names at request time, so the
+same airport always yields the same city and the same cache keys.
+
+Build job (checks catalog coverage, fills missing OpenWeather city ids):
+    python -m services.airport_locations [--openweather-key KEY | --city-list city.list.json.gz] [--output data/airport_locations.json]
+
+OpenWeather city ids are GeoNames ids; --city-list resolves them offline from
+OpenWeather's bulk list (https://bulk.openweathermap.org/sample/city.list.json.gz).
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import unicodedata
+from collections import namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from airport_themes import get_airport_coordinates, haversine_km
+
+LOCATIONS_VERSION = 1
+CITY_LIST_MAX_DISTANCE_KM = 30  # A listed city further than this from the table's coordinates is not the same place
+LOCATIONS_FIELDS = ['code', 'city', 'country_code', 'latitude', 'longitude', 'openweather_id']
+DEFAULT_LOCATIONS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'airport_locations.json')
+
+AirportLocation = namedtuple('AirportLocation', LOCATIONS_FIELDS)
+
+
+class AirportLocations:
+    def __init__(self, locations=None):
+        """
+        Args:
+            locations: Mapping code -> AirportLocation
+        """
+        self.locations = dict(locations or {})
+
+    @classmethod
+    def load(cls, path=DEFAULT_LOCATIONS_PATH):
+        """Load the resolution table, an empty table (catalog fallbacks only) if the file is missing or invalid"""
+        try:
+            with open(path, encoding='utf-8') as locations_file:
+                data = json.load(locations_file)
+            if data.get('version') != LOCATIONS_VERSION:
+                print(f"Airport locations {path} have unsupported version {data.get('version')}, ignoring them")
+                return cls()
+            fields = data['fields']
+            locations = {}
+            for row in data['locations']:
+                values = dict(zip(fields, row))
+                location = AirportLocation(**{field: values.get(field) for field in LOCATIONS_FIELDS})
+                locations[location.code] = location
+            return cls(locations)
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            print(f"Airport locations load error: {e}")
+            return cls()
+
+    def save(self, path=DEFAULT_LOCATIONS_PATH):
+        """Persist the table atomically, one location per line"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        rows = [json.dumps([getattr(location, field) for field in LOCATIONS_FIELDS], ensure_ascii=False)
+                for location in self.locations.values()]
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as locations_file:
+            locations_file.write('{\n')
+            locations_file.write(f'  "version": {LOCATIONS_VERSION},\n')
+            locations_file.write(f'  "fields": {json.dumps(LOCATIONS_FIELDS)},\n')
+            locations_file.write('  "locations": [\n    ' + ',\n    '.join(rows) + '\n  ]\n}\n')
+        os.replace(temporary_path, path)
+
+    def resolve(self, code):
+        """Return the AirportLocation of an airport, falling back to the code and the airport's own coordinates"""
+        location = self.locations.get(code)
+        if location is not None:
+            return location
+        latitude, longitude = get_airport_coordinates(code) or (None, None)
+        return AirportLocation(code, code, None, latitude, longitude, None)
+
+
+_locations = None
+_locations_lock = threading.Lock()
+
+
+def get_airport_locations():
+    """Return the shared resolution table, loaded from DEFAULT_LOCATIONS_PATH on first use"""
+    global _locations
+    if _locations is None:
+        with _locations_lock:
+            if _locations is None:
+                _locations = AirportLocations.load()
+    return _locations
+
+
+def resolve_airport(code):
+    """Canonical city, country code, city-centre coordinates and upstream ids of an airport"""
+    return get_airport_locations().resolve(code)
+
+
+def fill_openweather_ids(locations, api_key, timeout=10):
+    """Look up the OpenWeather city id of every location that has none, by coordinates"""
+    import requests
+
+    filled = 0
+    for code, location in list(locations.locations.items()):
+        if location.openweather_id is not None or location.latitude is None:
+            continue
+        try:
+            response = requests.get('https://api.openweathermap.org/data/2.5/weather', params={
+                'lat': location.latitude, 'lon': location.longitude, 'appid': api_key
+            }, timeout=timeout)
+            response.raise_for_status()
+            city_id = response.json().get('id')
+        except Exception as e:
+            print(f"OpenWeather id lookup failed for {code}: {e}")
+            continue
+        if city_id:
+            locations.locations[code] = location._replace(openweather_id=city_id)
+            filled += 1
+    return filled
+
+
+def fill_openweather_ids_from_city_list(locations, city_list_path, max_distance_km=CITY_LIST_MAX_DISTANCE_KM):
+    """
+    Fill missing OpenWeather city ids from OpenWeather's bulk city list, without any API call
+
+    A listed city of the same country and name near the table's coordinates is
+    preferred; islands and regions without such a city (Lanzarote, Kos) get the
+    nearest listed city instead, as a lookup by coordinates would.
+    """
+    opener = gzip.open if city_list_path.endswith('.gz') else open
+    with opener(city_list_path, 'rt', encoding='utf-8') as city_list_file:
+        cities_by_country = {}
+        for city in json.load(city_list_file):
+            cities_by_country.setdefault(city['country'], []).append(city)
+
+    filled = 0
+    for code, location in list(locations.locations.items()):
+        if location.openweather_id is not None or location.latitude is None:
+            continue
+        nearby = []
+        for city in cities_by_country.get(location.country_code, ()):
+            distance = haversine_km(location.latitude, location.longitude, city['coord']['lat'], city['coord']['lon'])
+            if distance <= max_distance_km:
+                nearby.append((_fold(city['name']) != _fold(location.city), distance, city['id']))
+        if not nearby:
+            print(f"No listed city within {max_distance_km} km of {code} ({location.city})")
+            continue
+        locations.locations[code] = location._replace(openweather_id=min(nearby)[2])
+        filled += 1
+    return filled
+
+
+def _fold(name):
+    """Case and accent insensitive form of a city name: 'Zürich' and 'Zurich' compare equal"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(character for character in decomposed if not unicodedata.combining(character)).casefold()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and complete the airport resolution table')
+    parser.add_argument('--output', default=DEFAULT_LOCATIONS_PATH, help='Table file to read and write')
+    parser.add_argument('--openweather-key', default=os.environ.get('OPENWEATHER_API_KEY'), help='Key used to fill OpenWeather city ids')
+    parser.add_argument('--city-list', help="OpenWeather's bulk city list (city.list.json[.gz]), to fill the ids without a key")
+    args = parser.parse_args()
+
+    from airport_themes import get_catalog
+
+    locations = AirportLocations.load(args.output)
+    missing = [code for code in get_catalog().airports_by_code if code not in locations.locations]
+    if missing:
+        print(f"Airports without a location entry: {', '.join(missing)}")
+
+    if args.city_list:
+        filled = fill_openweather_ids_from_city_list(locations, args.city_list)
+        locations.save(args.output)
+        print(f"Filled {filled} OpenWeather city ids in {args.output}")
+    elif args.openweather_key:
+        filled = fill_openweather_ids(locations, args.openweather_key)
+        locations.save(args.output)
+        print(f"Filled {filled} OpenWeather city ids in {args.output}")
+
+    print(f"{len(locations.locations)} locations, {len(missing)} catalog airports missing")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Airport typeahead: prefix trie plus trigram index over codes, names and cities
+
+Every airport is indexed under its IATA code, its airport name and its
+resolved city name, normalized without accents or case ("Bruxelles-Zaventem"
+-> "bruxelles zaventem"). Each trie node keeps its best candidates already
+ranked, so a prefix lookup is a walk of at most MAX_TRIE_DEPTH nodes; the
+trigram index answers the queries no prefix matches, typically typos
+("charlerio" -> CRL).
+"""
+import heapq
+import math
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from airport_themes import get_catalog
+from .airport_locations import resolve_airport
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+MAX_NODE_CANDIDATES = 64  # Ranked candidates kept per trie node above MAX_TRIE_DEPTH, enough for any page of suggestions
+MAX_TRIE_DEPTH = 8  # Longer queries filter the candidates of the depth-8 node, which keeps them all
+MIN_TRIGRAM_SIMILARITY = 0.5
+
+# Words shared by most airport names, left out of both indexes
+STOPWORDS = frozenset({'airport', 'international', 'regional', 'aeroport', 'aeropuerto', 'aeroporto', 'flughafen'})
+
+# Field ranks: a code match beats a city match, which beats an airport name match
+CODE, CITY, NAME = 0, 1, 2
+
+_NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(text):
+    """Lowercase ASCII words without accents or punctuation: 'Málaga-Costa' -> 'malaga costa'"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(character for character in decomposed if not unicodedata.combining(character))
+    return _NON_ALPHANUMERIC.sub(' ', stripped.casefold()).strip()
+
+
+def index_words(text):
+    """Normalized words of a field, without the generic airport words"""
+    return [word for word in normalize(text).split() if word not in STOPWORDS]
+
+
+def trigrams(text):
+    """Word trigrams with boundary padding, so short words and word starts still match"""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[index:index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+class AirportSuggestIndex:
+    def __init__(self, entries):
+        """
+        Args:
+            entries: Dicts with at least 'code', 'name' and 'city', in catalog order
+        """
+        self.entries = tuple(entries)
+
+        # Every word start of every field is a key: "south charleroi" and "charleroi" both lead to CRL
+        ranked_keys = []
+        self.keys = []
+        for position, entry in enumerate(self.entries):
+            entry_keys = set()
+            for field, text in ((CODE, entry['code']), (CITY, entry['city']), (NAME, entry['name'])):
+                words = index_words(text)
+                for start in range(len(words)):
+                    key = ' '.join(words[start:])
+                    entry_keys.add(key)
+                    ranked_keys.append((field, start, len(words), position, key))
+            self.keys.append(tuple(entry_keys))
+        ranked_keys.sort()
+
+        # Keys are inserted best first, so each node's candidate list is already ranked
+        self.root = {}
+        for _, _, _, position, key in ranked_keys:
+            node = self.root
+            for depth, character in enumerate(key[:MAX_TRIE_DEPTH], 1):
+                node = node.setdefault(character, {})
+                candidates = node.setdefault('', [])
+                # Longer queries filter the deepest nodes' candidates: capping those could drop matches
+                if (len(candidates) < MAX_NODE_CANDIDATES or depth == MAX_TRIE_DEPTH) and position not in candidates:
+                    candidates.append(position)
+
+        postings = {}
+        self.gram_counts = []
+        for position, entry in enumerate(self.entries):
+            grams = trigrams(' '.join(index_words(f"{entry['code']} {entry['city']} {entry['name']}")))
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self.postings = {gram: tuple(positions) for gram, positions in postings.items()}
+
+    def suggest(self, query, limit=DEFAULT_SUGGESTIONS):
+        """Up to `limit` entries whose words start with `query`, fuzzy matches when none does"""
+        words = normalize(query).split()
+        # "pisa airp" is still being typed: a trailing start of a generic word is ignored like the word itself
+        if len(words) > 1 and any(stopword.startswith(words[-1]) for stopword in STOPWORDS):
+            words.pop()
+        text = ' '.join(word for word in words if word not in STOPWORDS)
+        if not text or limit <= 0:
+            return []
+
+        node = self.root
+        for character in text[:MAX_TRIE_DEPTH]:
+            node = node.get(character)
+            if node is None:
+                break
+        candidates = node.get('', ()) if node is not None else ()
+        if len(text) > MAX_TRIE_DEPTH:
+            candidates = [position for position in candidates
+                          if any(key.startswith(text) for key in self.keys[position])]
+        positions = list(candidates[:limit])
+
+        # No prefix match at all: most likely a typo
+        if not positions and len(text) >= 3:
+            positions = self._fuzzy(text, limit)
+
+        return [self.entries[position] for position in positions]
+
+    def _fuzzy(self, text, limit):
+        """Entries sharing enough trigrams with the query, most similar first"""
+        grams = trigrams(text)
+        required = math.ceil(len(grams) * MIN_TRIGRAM_SIMILARITY)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        # Shared trigrams first, slightly penalizing long entries
+        scored = [
+            (count - 0.001 * self.gram_counts[position], -position, position)
+            for position, count in shared.items() if count >= required
+        ]
+        return [position for _, _, position in heapq.nlargest(limit, scored)]
+
+
+def build_suggest_index(catalog):
+    """Index of a catalog's airports, cities resolved through the shared location table"""
+    entries = []
+    seen = set()
+    for airport in catalog.airports:
+        if airport.code in seen:
+            continue
+        seen.add(airport.code)
+        entries.append({
+            'code': airport.code,
+            'name': airport.name,
+            'city': resolve_airport(airport.code).city,
+            'country': airport.country,
+            'country_name': catalog.country_names[airport.country]
+        })
+    return AirportSuggestIndex(entries)
+
+
+@lru_cache(maxsize=1)
+def get_suggest_index(catalog):
+    """Suggestion index of the loaded catalog, built on first use"""
+    return build_suggest_index(catalog)
+
+
+def suggest_airports(query, limit=DEFAULT_SUGGESTIONS):
+    """Airports matching a typeahead query: code, airport name or city, accents and case ignored"""
+    return get_suggest_index(get_catalog()).suggest(query, min(limit, MAX_SUGGESTIONS))
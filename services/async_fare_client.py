@@ -0,0 +1,201 @@
+"""
+Asyncio Ryanair fare client sharing one connection pool across all lookups
+"""
+import asyncio
+import queue
+import threading
+from datetime import datetime
+
+import aiohttp
+
+from .fare_types import Flight, Trip
+
+
+class AsyncRyanairFareClient:
+    BASE_URL = "https://services-api.ryanair.com/farfnd/v4/"
+
+    def __init__(self, base_url=None, currency='EUR', max_connections=100, timeout=15):
+        """
+        Initialize the async fare client
+
+        Args:
+            base_url: Fare API root, override to point at a local stand-in
+            currency: Currency requested from the fare API
+            max_connections: Size of the shared connection pool (and in-flight lookup limit)
+            timeout: Default timeout in seconds for a single fare request
+        """
+        self.base_url = base_url or self.BASE_URL
+        if not self.base_url.endswith('/'):
+            self.base_url += '/'
+        self.currency = currency
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self._session = None
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+
+    def submit(self, coroutine):
+        """Schedule a coroutine on the client's background event loop, returns a concurrent Future"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name='ryanair-fares', daemon=True)
+                self._loop_thread.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def run(self, coroutine, timeout=None):
+        """Run a coroutine on the client's background event loop from synchronous code"""
+        return self.submit(coroutine).result(timeout)
+
+    def iter_many_return_flights(self, queries, call_timeout=None, deadline=None):
+        """Synchronous generator yielding (key, trips) as each query of a batch completes"""
+        completed = queue.Queue()
+        finished = object()
+
+        async def collect():
+            try:
+                await self.get_many_return_flights(
+                    queries, call_timeout=call_timeout, deadline=deadline,
+                    on_result=lambda key, trips: completed.put((key, trips))
+                )
+            finally:
+                completed.put(finished)
+
+        future = self.submit(collect())
+        try:
+            while True:
+                item = completed.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            # Consumer went away (e.g. client disconnected): stop the remaining lookups
+            future.cancel()
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the shared connection pool, from a coroutine running on the client's loop"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def close(self, timeout=5):
+        """Close the shared connection pool on the background loop, then stop the loop; safe to call twice"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result(timeout)
+        except Exception as e:
+            print(f"Fare client close error: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+    async def get_cheapest_return_flights(self, source_airport, date_from, date_to,
+                                          return_date_from, return_date_to,
+                                          destination_country=None, destination_airport=None):
+        """Same query as Ryanair.get_cheapest_return_flights, returns a list of Trip"""
+        params = {
+            'departureAirportIataCode': source_airport,
+            'outboundDepartureDateFrom': date_from,
+            'outboundDepartureDateTo': date_to,
+            'inboundDepartureDateFrom': return_date_from,
+            'inboundDepartureDateTo': return_date_to,
+            'outboundDepartureTimeFrom': '00:00',
+            'outboundDepartureTimeTo': '23:59',
+            'inboundDepartureTimeFrom': '00:00',
+            'inboundDepartureTimeTo': '23:59'
+        }
+        if self.currency:
+            params['currency'] = self.currency
+        if destination_country:
+            params['arrivalCountryCode'] = destination_country
+        if destination_airport:
+            params['arrivalAirportIataCode'] = destination_airport
+
+        session = await self._get_session()
+        async with session.get(self.base_url + 'roundTripFares', params=params) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+
+        return [self._parse_trip(fare['outbound'], fare['inbound']) for fare in data.get('fares') or []]
+
+    async def get_many_return_flights(self, queries, call_timeout=None, deadline=None, on_result=None):
+        """
+        Run many get_cheapest_return_flights queries concurrently
+
+        Args:
+            queries: Mapping of key -> keyword arguments for get_cheapest_return_flights
+            call_timeout: Seconds allowed for each query once it holds a connection slot
+            deadline: Seconds allowed for the whole batch, unfinished queries are dropped
+            on_result: Optional callback(key, trips) called as soon as each query succeeds
+
+        Returns:
+            Mapping of key -> list of Trip for the queries that succeeded
+        """
+        semaphore = asyncio.Semaphore(self.max_connections)
+        results = {}
+
+        async def fetch(key, query):
+            async with semaphore:
+                try:
+                    results[key] = await asyncio.wait_for(
+                        self.get_cheapest_return_flights(**query), call_timeout
+                    )
+                    if on_result is not None:
+                        on_result(key, results[key])
+                except asyncio.TimeoutError:
+                    print(f"Async fare lookup timed out for {key}")
+                except Exception as e:
+                    print(f"Async fare lookup failed for {key}: {e}")
+
+        tasks = [asyncio.ensure_future(fetch(key, query)) for key, query in queries.items()]
+        if not tasks:
+            return results
+
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+            if pending:
+                print(f"Async fare lookup deadline reached: {len(pending)} queries dropped")
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return results
+
+    def _parse_flight(self, flight):
+        """Convert one leg of a fare payload into a Flight"""
+        departure_airport = flight['departureAirport']
+        arrival_airport = flight['arrivalAirport']
+        flight_number = flight.get('flightNumber', '')
+
+        return Flight(
+            departureTime=datetime.fromisoformat(flight['departureDate']),
+            flightNumber=f"{flight_number[:2]} {flight_number[2:]}",
+            price=flight['price']['value'],
+            currency=flight['price']['currencyCode'],
+            origin=departure_airport['iataCode'],
+            originFull=', '.join(filter(None, (departure_airport.get('name'), departure_airport.get('countryName')))),
+            destination=arrival_airport['iataCode'],
+            destinationFull=', '.join(filter(None, (arrival_airport.get('name'), arrival_airport.get('countryName'))))
+        )
+
+    def _parse_trip(self, outbound, inbound):
+        outbound = self._parse_flight(outbound)
+        inbound = self._parse_flight(inbound)
+        return Trip(totalPrice=outbound.price + inbound.price, outbound=outbound, inbound=inbound)
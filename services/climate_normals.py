@@ -0,0 +1,238 @@
+"""
+Monthly climate normals per catalog airport, served offline
+
+data/climate_normals.json holds twelve monthly values per airport: average
+daily high and low (°C), days with at least 1 mm of rain, and the sea surface
+temperature for coastal airports. The table is loaded once into flat arrays of
+tenths (row * 12 + month) and looked up without any network I/O, for travel
+dates beyond the forecast horizon where current conditions mean nothing.
+
+Rows with a reference city hold the rounded normals of that city, shared by the
+airports of its region (Charleroi, Brussels and Antwerp all read Brussels'):
+reports carry it so the client can say so. Rows rebuilt by the job are measured
+at the airport's own coordinates and have no reference.
+
+Build job (Open-Meteo historical and marine archives, no key needed):
+    python -m services.climate_normals [--start-year 1991] [--end-year 2020] [--output data/climate_normals.json]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from array import array
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from .airport_locations import resolve_airport
+
+NORMALS_VERSION = 1
+NORMALS_FIELDS = ['code', 'reference', 'temp_max', 'temp_min', 'rain_days', 'sea_temp']
+MONTHLY_FIELDS = NORMALS_FIELDS[2:]
+DEFAULT_NORMALS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'climate_normals.json')
+MISSING = -32768  # Stored for months without a value (sea temperature of inland airports)
+RAIN_DAY_MM = 1.0
+
+ARCHIVE_URL = 'https://archive-api.open-meteo.com/v1/archive'
+MARINE_URL = 'https://marine-api.open-meteo.com/v1/marine'
+
+
+class ClimateNormals:
+    def __init__(self, rows=None):
+        """
+        Args:
+            rows: Mapping code -> {field: 12 monthly values or None} for the MONTHLY_FIELDS,
+                plus 'reference': the city the values were taken from (None if measured at the airport)
+        """
+        rows = rows or {}
+        self.rows = {code: position for position, code in enumerate(rows)}
+        self.references = [monthly.get('reference') for monthly in rows.values()]
+        # One flat array of tenths per field, 12 slots per airport: about 1 KiB per 10 airports
+        self.values = {field: array('h') for field in MONTHLY_FIELDS}
+        for monthly in rows.values():
+            for field, values in self.values.items():
+                months = monthly.get(field) or [None] * 12
+                values.extend(MISSING if value is None else round(value * 10) for value in months)
+
+    @classmethod
+    def load(cls, path=DEFAULT_NORMALS_PATH):
+        """Load the table, an empty one (no normals served) if the file is missing or invalid"""
+        try:
+            with open(path, encoding='utf-8') as normals_file:
+                data = json.load(normals_file)
+            if data.get('version') != NORMALS_VERSION:
+                print(f"Climate normals {path} have unsupported version {data.get('version')}, ignoring them")
+                return cls()
+            fields = data['fields']
+            rows = {}
+            for row in data['normals']:
+                values = dict(zip(fields, row))
+                rows[values['code']] = {field: values.get(field) for field in NORMALS_FIELDS[1:]}
+            return cls(rows)
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            print(f"Climate normals load error: {e}")
+            return cls()
+
+    def save(self, path=DEFAULT_NORMALS_PATH):
+        """Persist the table atomically, one airport per line"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        rows = [json.dumps([code, self.reference(code)] + [self.monthly(code, field) for field in MONTHLY_FIELDS])
+                for code in self.rows]
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as normals_file:
+            normals_file.write('{\n')
+            normals_file.write(f'  "version": {NORMALS_VERSION},\n')
+            normals_file.write(f'  "fields": {json.dumps(NORMALS_FIELDS)},\n')
+            normals_file.write('  "normals": [\n    ' + ',\n    '.join(rows) + '\n  ]\n}\n')
+        os.replace(temporary_path, path)
+
+    def monthly(self, code, field):
+        """The 12 monthly values of one field, None if the airport or the field has none"""
+        position = self.rows.get(code)
+        if position is None:
+            return None
+        months = self.values[field][position * 12:position * 12 + 12]
+        if all(value == MISSING for value in months):
+            return None
+        return [None if value == MISSING else _from_tenths(value) for value in months]
+
+    def reference(self, code):
+        """City whose normals an airport uses, None if they were measured at the airport or it is unknown"""
+        position = self.rows.get(code)
+        return None if position is None else self.references[position]
+
+    def lookup(self, code, month):
+        """{field: value} of an airport for a month (1-12), None if the airport has no normals"""
+        position = self.rows.get(code)
+        if position is None:
+            return None
+        index = position * 12 + month - 1
+        return {field: None if values[index] == MISSING else _from_tenths(values[index])
+                for field, values in self.values.items()}
+
+    def report(self, code, travel_date):
+        """Weather report for a travel date from the normals of its month, None for unknown airports"""
+        normals = self.lookup(code, travel_date.month)
+        if normals is None:
+            return None
+        return {
+            'source': 'climate_normals',
+            'airport': code,
+            'city': resolve_airport(code).city,
+            'month': travel_date.month,
+            'reference': self.reference(code),
+            **normals
+        }
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def _from_tenths(value):
+    return value // 10 if value % 10 == 0 else value / 10
+
+
+_normals = None
+_normals_lock = threading.Lock()
+
+
+def get_climate_normals():
+    """Return the shared normals table, loaded from DEFAULT_NORMALS_PATH on first use"""
+    global _normals
+    if _normals is None:
+        with _normals_lock:
+            if _normals is None:
+                _normals = ClimateNormals.load()
+    return _normals
+
+
+def _monthly_means(days, values, reduce=None):
+    """Average per calendar month of daily values; reduce(values of one month of one year) first if given"""
+    by_month = {}
+    for day, value in zip(days, values):
+        if value is None:
+            continue
+        by_month.setdefault(int(day[5:7]), {}).setdefault(day[:4], []).append(value)
+    means = []
+    for month in range(1, 13):
+        years = by_month.get(month)
+        if not years:
+            means.append(None)
+            continue
+        samples = [reduce(year_values) for year_values in years.values()] if reduce \
+            else [value for year_values in years.values() for value in year_values]
+        means.append(round(sum(samples) / len(samples), 1))
+    return means
+
+
+def fetch_normals(latitude, longitude, start_year, end_year, coastal, timeout=60):
+    """Monthly normals of one location from the Open-Meteo archives, {field: 12 values}"""
+    import requests
+
+    response = requests.get(ARCHIVE_URL, params={
+        'latitude': latitude, 'longitude': longitude,
+        'start_date': f'{start_year}-01-01', 'end_date': f'{end_year}-12-31',
+        'daily': 'temperature_2m_max,temperature_2m_min,precipitation_sum',
+        'timezone': 'auto'
+    }, timeout=timeout)
+    response.raise_for_status()
+    daily = response.json()['daily']
+    normals = {
+        'temp_max': _monthly_means(daily['time'], daily['temperature_2m_max']),
+        'temp_min': _monthly_means(daily['time'], daily['temperature_2m_min']),
+        'rain_days': _monthly_means(daily['time'], daily['precipitation_sum'],
+                                    reduce=lambda values: sum(1 for value in values if value >= RAIN_DAY_MM)),
+        'sea_temp': None
+    }
+
+    if coastal:
+        # The marine archive only covers recent years: its last three full years are averaged
+        sea_end = date.today().year - 1
+        response = requests.get(MARINE_URL, params={
+            'latitude': latitude, 'longitude': longitude,
+            'start_date': f'{sea_end - 2}-01-01', 'end_date': f'{sea_end}-12-31',
+            'hourly': 'sea_surface_temperature'
+        }, timeout=timeout)
+        response.raise_for_status()
+        hourly = response.json()['hourly']
+        sea_temp = _monthly_means([time[:10] for time in hourly['time']], hourly['sea_surface_temperature'])
+        normals['sea_temp'] = sea_temp if any(value is not None for value in sea_temp) else None
+    return normals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the monthly climate normals of every catalog airport')
+    parser.add_argument('--output', default=DEFAULT_NORMALS_PATH, help='Table file to read and write')
+    parser.add_argument('--start-year', type=int, default=1991)
+    parser.add_argument('--end-year', type=int, default=2020)
+    parser.add_argument('--missing-only', action='store_true', help='Only fetch airports absent from the table')
+    args = parser.parse_args()
+
+    from airport_themes import get_catalog
+
+    existing = ClimateNormals.load(args.output)
+    rows = {code: {'reference': existing.reference(code), **{field: existing.monthly(code, field) for field in MONTHLY_FIELDS}}
+            for code in existing.rows}
+    failed = []
+    for code, airport in get_catalog().airports_by_code.items():
+        if args.missing_only and code in rows:
+            continue
+        location = resolve_airport(code)
+        if location.latitude is None:
+            failed.append(code)
+            continue
+        try:
+            rows[code] = fetch_normals(location.latitude, location.longitude, args.start_year, args.end_year, airport.coastal)
+        except Exception as e:
+            # The previous row, if any, is kept
+            print(f"Climate normals fetch failed for {code}: {e}")
+            failed.append(code)
+
+    ClimateNormals(rows).save(args.output)
+    print(f"{len(rows)} airports written to {args.output}, {len(failed)} failed{': ' + ', '.join(failed) if failed else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Bounded worker-pool fan-out for upstream API calls
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from requests.adapters import HTTPAdapter
+
+
+# Process-wide limiters so that concurrent searches share the same budget per upstream
+_upstream_limiters = {}
+_upstream_limiters_lock = threading.Lock()
+
+
+def get_upstream_limiter(upstream, max_concurrency):
+    """Return the semaphore bounding in-flight calls to an upstream (created on first use)"""
+    with _upstream_limiters_lock:
+        limiter = _upstream_limiters.get(upstream)
+        if limiter is None:
+            limiter = threading.BoundedSemaphore(max_concurrency)
+            _upstream_limiters[upstream] = limiter
+        return limiter
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """Adapter giving a default timeout to the requests of a session that pass none"""
+
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+def bound_session_timeout(session, timeout):
+    """Make every request of a requests session time out after `timeout` seconds unless it sets its own"""
+    adapter = TimeoutHTTPAdapter(timeout)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def fan_out(func, items, upstream, max_concurrency=8, call_timeout=None, deadline=None):
+    """
+    Call func(item) for every item on a bounded worker pool
+
+    Yields (item, result) pairs as soon as each call completes. Calls that raise,
+    run longer than call_timeout seconds, or are still pending once the overall
+    deadline (seconds) has passed are dropped.
+
+    A dropped call gives its upstream slot back at once, so hung calls never
+    starve later fan-outs, but its thread runs until func returns: func must
+    bound its own I/O (HTTP timeout at most call_timeout) for the upstream to
+    really see no more than max_concurrency calls.
+    """
+    items = list(items)
+    if not items:
+        return
+
+    limiter = get_upstream_limiter(upstream, max_concurrency)
+    started = {}
+    holding = set()  # Indexes of calls holding an upstream slot
+    holding_lock = threading.Lock()
+    abandoned = threading.Event()
+
+    def release(index):
+        # Once per call: by the call when it returns, or by the fan-out when it drops it
+        with holding_lock:
+            if index not in holding:
+                return
+            holding.discard(index)
+        limiter.release()
+
+    def run(index, item):
+        limiter.acquire()
+        with holding_lock:
+            holding.add(index)
+        try:
+            if abandoned.is_set():
+                return None
+            # The per-call timeout only starts once the upstream slot is acquired
+            started[index] = time.monotonic()
+            return func(item)
+        finally:
+            release(index)
+
+    # Calls are submitted as earlier ones finish or are dropped, at most max_concurrency live at once:
+    # the pool only grows past that by the threads still stuck in dropped calls
+    executor = ThreadPoolExecutor(max_workers=len(items))
+    queued = iter(enumerate(items))
+    futures = {}
+    pending = set()
+
+    def submit_more():
+        for index, item in queued:
+            future = executor.submit(run, index, item)
+            futures[future] = (index, item)
+            pending.add(future)
+            if len(pending) >= max_concurrency:
+                break
+
+    submit_more()
+    deadline_at = time.monotonic() + deadline if deadline else None
+
+    try:
+        while pending:
+            now = time.monotonic()
+            if deadline_at is not None and now >= deadline_at:
+                print(f"Fan-out deadline reached for {upstream}: {len(items) - len(futures) + len(pending)} calls dropped")
+                break
+
+            # Wake up for whichever comes first: a completion, a call timeout or the deadline
+            timeout = deadline_at - now if deadline_at is not None else None
+            if call_timeout is not None:
+                expiries = [started[futures[f][0]] + call_timeout - now
+                            for f in pending if futures[f][0] in started]
+                next_expiry = max(min(expiries), 0) if expiries else call_timeout
+                timeout = next_expiry if timeout is None else min(timeout, next_expiry)
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, item = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Fan-out call to {upstream} failed for {item}: {e}")
+                    continue
+                yield item, result
+
+            if call_timeout is not None:
+                now = time.monotonic()
+                expired = {f for f in pending
+                           if futures[f][0] in started and now - started[futures[f][0]] >= call_timeout}
+                for future in expired:
+                    print(f"Fan-out call to {upstream} timed out for {futures[future][1]}")
+                    release(futures[future][0])
+                pending -= expired
+
+            submit_more()
+    finally:
+        # Never block the request on abandoned calls; queued ones are cancelled and running ones
+        # give their upstream slot back now
+        abandoned.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        with holding_lock:
+            still_holding = list(holding)
+        for index in still_holding:
+            release(index)
@@ -0,0 +1,183 @@
+"""
+Per-day fare calendar cache
+
+Stores the cheapest one-way fare of every day per route and direction, so that
+searches with sliding date windows only fetch the days they are missing.
+"""
+import threading
+from datetime import date, datetime, timedelta
+
+import requests
+
+from .cache import TTLCache
+from .fare_types import Flight, Trip
+from .trip_combiner import cheapest_combinations, return_window
+
+_MISSING = object()
+
+
+def _iter_days(date_from, date_to):
+    day = date.fromisoformat(date_from)
+    last_day = date.fromisoformat(date_to)
+    while day <= last_day:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+class FareCalendar:
+    BASE_URL = "https://services-api.ryanair.com/farfnd/v4/"
+
+    def __init__(self, ttl=3600, maxsize=200000, base_url=None, currency='EUR', timeout=15):
+        """
+        Initialize the fare calendar
+
+        Args:
+            ttl: Seconds a cached day stays fresh
+            maxsize: Maximum number of (origin, destination, day) entries
+            base_url: Fare API root, override to point at a local stand-in
+            currency: Currency requested from the fare API
+            timeout: Timeout in seconds for one month request
+        """
+        self.days = TTLCache(ttl=ttl, maxsize=maxsize)
+        self.base_url = base_url or self.BASE_URL
+        if not self.base_url.endswith('/'):
+            self.base_url += '/'
+        self.currency = currency
+        self.timeout = timeout
+        self.months_fetched = 0
+        self._lock = threading.Lock()  # months_fetched is updated from the fan-out workers
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        # requests.Session is not thread-safe: one per fan-out worker
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def get_days(self, origin, destination, date_from, date_to):
+        """
+        Return {day: fare or None} for every day of the window, fetching only missing months
+
+        A fare is a dict with departure_time (ISO), price and currency; None means no flight.
+        """
+        fares = {}
+        missing_months = set()
+        for day in _iter_days(date_from, date_to):
+            fare = self.days.get((origin, destination, day), _MISSING)
+            if fare is _MISSING:
+                missing_months.add(day[:7])
+            else:
+                fares[day] = fare
+
+        for month in sorted(missing_months):
+            month_fares = self._fetch_month(origin, destination, month)
+            for day, fare in month_fares.items():
+                self.days.set((origin, destination, day), fare)
+                if date_from <= day <= date_to:
+                    fares[day] = fare
+
+        return fares
+
+    def coverage(self, routes):
+        """
+        Report how much of the calendar months a search reads are already cached
+
+        Months are the fetch unit: one counts as cached when every day of it in the
+        window is. The inbound leg of a route whose outbound days are all cached
+        without any fare is left out, as cheapest_return_trips never reads it.
+
+        Args:
+            routes: Iterable of (origin, destination, departure_from, departure_to, return_from, return_to)
+        """
+        total_days = cached_days = 0
+        months = set()
+        missing_months = set()
+        for origin, destination, departure_from, departure_to, return_from, return_to in routes:
+            legs = [(origin, destination, departure_from, departure_to)]
+            outbound = [self.days.peek((origin, destination, day), _MISSING) for day in _iter_days(departure_from, departure_to)]
+            if not all(fare is None for fare in outbound):
+                legs.append((destination, origin, return_from, return_to))
+
+            for leg_origin, leg_destination, date_from, date_to in legs:
+                for day in _iter_days(date_from, date_to):
+                    month = (leg_origin, leg_destination, day[:7])
+                    months.add(month)
+                    total_days += 1
+                    if self.days.peek((leg_origin, leg_destination, day), _MISSING) is _MISSING:
+                        missing_months.add(month)
+                    else:
+                        cached_days += 1
+
+        cached_months = len(months) - len(missing_months)
+        return {
+            'months': len(months),
+            'cached_months': cached_months,
+            'days': total_days,
+            'cached_days': cached_days,
+            'cached_ratio': round(cached_months / len(months), 3) if months else 0.0
+        }
+
+    def cheapest_return_trips(self, origin, destination, departure_date_from, departure_date_to, constraints):
+        """
+        Assemble the cheapest return trips of a route from the outbound and inbound calendars
+
+        Both directions are read once over the widest window the constraints allow,
+        then paired by cheapest_combinations().
+        """
+        outbound_days = self.get_days(origin, destination, departure_date_from, departure_date_to)
+        if not any(outbound_days.values()):
+            return []
+
+        return_date_from, return_date_to = return_window(departure_date_from, departure_date_to, constraints)
+        inbound_days = self.get_days(destination, origin, return_date_from, return_date_to)
+
+        return [
+            Trip(
+                totalPrice=total,
+                outbound=self._to_flight(origin, destination, outbound_fare),
+                inbound=self._to_flight(destination, origin, inbound_fare)
+            )
+            for total, outbound_fare, inbound_fare in cheapest_combinations(outbound_days, inbound_days, constraints)
+        ]
+
+    def _fetch_month(self, origin, destination, month):
+        """Fetch one month of cheapest-per-day fares, every day of the month gets an entry"""
+        first_day = date.fromisoformat(f'{month}-01')
+        next_month = (first_day + timedelta(days=32)).replace(day=1)
+        fares = {day: None for day in _iter_days(first_day.isoformat(), (next_month - timedelta(days=1)).isoformat())}
+
+        params = {'outboundMonthOfDate': first_day.isoformat()}
+        if self.currency:
+            params['currency'] = self.currency
+
+        response = self.session.get(
+            f'{self.base_url}oneWayFares/{origin}/{destination}/cheapestPerDay',
+            params=params, timeout=self.timeout
+        )
+        response.raise_for_status()
+        with self._lock:
+            self.months_fetched += 1
+
+        for fare in (response.json().get('outbound') or {}).get('fares') or []:
+            price = fare.get('price')
+            if fare.get('day') not in fares or not price or fare.get('unavailable') or fare.get('soldOut'):
+                continue
+            fares[fare['day']] = {
+                'departure_time': fare['departureDate'],
+                'price': price['value'],
+                'currency': price.get('currencyCode', self.currency)
+            }
+        return fares
+
+    def _to_flight(self, origin, destination, fare):
+        return Flight(
+            departureTime=datetime.fromisoformat(fare['departure_time']),
+            flightNumber='',
+            price=fare['price'],
+            currency=fare['currency'],
+            origin=origin,
+            originFull=origin,
+            destination=destination,
+            destinationFull=destination
+        )
@@ -0,0 +1,9 @@
+"""
+Fare records shared by the fare clients, same shape as the ryanair library's
+Flight and Trip so FlightSearchService formats them identically
+"""
+from collections import namedtuple
+
+Flight = namedtuple('Flight', ('departureTime', 'flightNumber', 'price', 'currency',
+                               'origin', 'originFull', 'destination', 'destinationFull'))
+Trip = namedtuple('Trip', ('totalPrice', 'outbound', 'inbound'))
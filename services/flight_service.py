@@ -4,95 +4,410 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from airport_themes import (
-    get_airports_by_countries, get_coastal_airports_by_countries, 
+    get_airports_by_countries, get_coastal_airports_by_countries,
     get_airport_name, get_airport_info,
-    get_airports_by_theme
+    get_airports_by_theme, query_airports,
+    get_airport_coordinates, get_airport_distance_km, get_airports_within
 )
+from .cache import TTLCache
+from .fanout import bound_session_timeout, fan_out
+from .fare_calendar import FareCalendar
+from .route_index import RouteIndex
+from .single_flight import SingleFlight
+from .trip_combiner import StayConstraints, return_window
+from .ryanair_service import RyanairLinkService
+
+
+def round_price(price):
+    """Round prices to nearest 0.5 or integer"""
+    rounded = round(price * 2) / 2
+    return int(rounded) if rounded == int(rounded) else rounded
 
 
 class FlightSearchService:
-    def __init__(self):
-        self.ryanair = Ryanair()
-    
+    def __init__(self, config=None, client=None):
+        """
+        Initialize the flight search service
+
+        Args:
+            config: Configuration mapping (Flask app.config) with the FLIGHT_SEARCH_* settings
+            client: Ryanair client to use, defaults to the ryanair library client
+        """
+        config = config or {}
+        self.ryanair = client or Ryanair()
+        # The library sets no HTTP timeout: without one a hung call would keep its thread (and
+        # connection) until the server gives up, long after fan_out dropped it
+        if getattr(self.ryanair, 'session', None) is not None:
+            bound_session_timeout(self.ryanair.session, config.get('FLIGHT_SEARCH_CALL_TIMEOUT', 15))
+
+        # 'ryanair' uses the synchronous library, 'async' the asyncio fare client
+        self.backend = config.get('FLIGHT_SEARCH_BACKEND', 'ryanair')
+        self.async_client = None
+        if self.backend == 'async':
+            from .async_fare_client import AsyncRyanairFareClient
+            self.async_client = AsyncRyanairFareClient(
+                base_url=config.get('RYANAIR_API_BASE_URL'),
+                max_connections=config.get('RYANAIR_MAX_CONNECTIONS', 100),
+                timeout=config.get('FLIGHT_SEARCH_CALL_TIMEOUT', 15)
+            )
+
+        # 'per_pair' queries every (origin, destination), 'per_origin' one any-destination query per origin,
+        # 'calendar' pairs per-day one-way fares locally under the stay constraints
+        self.strategy = config.get('FLIGHT_SEARCH_STRATEGY', 'per_pair')
+
+        # Fan-out settings: 'concurrent' runs the route pairs on a bounded worker pool
+        self.execution_mode = config.get('FLIGHT_SEARCH_EXECUTION', 'concurrent')
+        self.max_concurrency = config.get('FLIGHT_SEARCH_MAX_CONCURRENCY', 8)
+        self.call_timeout = config.get('FLIGHT_SEARCH_CALL_TIMEOUT', 15)
+        self.search_deadline = config.get('FLIGHT_SEARCH_DEADLINE', 60)
+
+        # Fare fields of the trips per (origin, destination, date window), empty routes included;
+        # catalog data is attached when they are read, so a catalog swap applies at once
+        self.fare_cache = TTLCache(
+            ttl=config.get('CACHE_TIMEOUT', 3600),
+            maxsize=config.get('FARE_CACHE_SIZE', 5000)
+        )
+
+        # Served-route index built offline, used to prune pairs Ryanair does not fly
+        self.route_index = RouteIndex.load(config['ROUTE_INDEX_PATH']) if config.get('ROUTE_INDEX_PATH') else RouteIndex()
+
+        # Day-granular fares per route and direction for the 'calendar' strategy
+        self.fare_calendar = FareCalendar(
+            ttl=config.get('CACHE_TIMEOUT', 3600),
+            maxsize=config.get('FARE_CALENDAR_SIZE', 200000),
+            base_url=config.get('RYANAIR_API_BASE_URL'),
+            timeout=config.get('FLIGHT_SEARCH_CALL_TIMEOUT', 15)
+        )
+
+        # Identical searches already in flight are shared instead of fanned out again
+        self.coalescing = config.get('FLIGHT_SEARCH_COALESCING', True)
+        self.single_flight = SingleFlight('flight-search')
+
     def search_flights(self, search_params):
         """Search for flights based on search parameters"""
+        plan = self._plan_search(search_params)
+        if plan is None:
+            return []
+        pairs, date_window = plan
+
+        route_results = dict(self._iter_planned_routes(pairs, date_window, search_params))
+
+        # Merge in pair order so ties keep the same order as a serial search
         results = []
-        
-        departure_airports = search_params['departure_airports']
+        for pair in pairs:
+            results.extend(route_results.get(pair, []))
+
+        # Sort by price
+        results.sort(key=lambda x: x['total_price'])
+        return results
+
+    def iter_route_results(self, search_params):
+        """Yield ((origin, destination), trips) for every route as soon as its trips are known"""
+        plan = self._plan_search(search_params)
+        if plan is None:
+            return
+        pairs, date_window = plan
+        yield from self._iter_planned_routes(pairs, date_window, search_params)
+
+    def calendar_coverage(self, search_params):
+        """Share of the search's calendar months already in the fare calendar, None outside the 'calendar' strategy"""
+        if (search_params.get('strategy') or self.strategy) != 'calendar':
+            return None
+        plan = self._plan_search(search_params, record=False)
+        if plan is None:
+            return None
+        pairs, date_window = plan
+        departure_date_from, departure_date_to = date_window[:2]
+        return_date_from, return_date_to = return_window(
+            departure_date_from, departure_date_to, self._get_stay_constraints(search_params)
+        )
+
+        return self.fare_calendar.coverage(
+            (origin, destination, departure_date_from, departure_date_to, return_date_from, return_date_to)
+            for origin, destination in pairs
+        )
+
+    def _plan_search(self, search_params, record=True):
+        """Return the (origin, destination) pairs and date window of a search, None if the dates are invalid"""
+        departure_airports = self._get_departure_airports(search_params)
+        target_destinations = self._get_target_destinations(search_params)
+
+        try:
+            date_window = self._get_date_window(search_params)
+        except Exception as e:
+            return None
+
+        pairs = [(origin, destination) for origin in departure_airports for destination in target_destinations]
+
+        # Flight radius: only destinations within max_distance_km of their origin
+        max_distance_km = search_params.get('max_distance_km')
+        if max_distance_km is not None:
+            pairs = [pair for pair in pairs if self._is_within_distance(pair, float(max_distance_km))]
+
+        return self.route_index.filter_pairs(pairs, record=record), date_window
+
+    def _iter_planned_routes(self, pairs, date_window, search_params):
+        """Yield the routes of a planned search, coalesced with identical searches in flight"""
+        if self.coalescing:
+            key = (
+                tuple(sorted(set(pairs))),
+                date_window,
+                search_params.get('strategy') or self.strategy,
+                search_params.get('execution') or self.execution_mode
+            ) + self._combination_key(search_params)
+            routes = self.single_flight.iterate(
+                key, lambda: self._produce_routes(pairs, date_window, search_params)
+            )
+        else:
+            routes = self._produce_routes(pairs, date_window, search_params)
+
+        # New dicts keep callers (e.g. weather enrichment) from mutating cached or shared trips
+        for pair, trips in routes:
+            yield pair, [self._with_catalog_info(trip) for trip in trips]
+
+    def _produce_routes(self, pairs, date_window, search_params):
+        """Yield cached routes first, then fetched routes as they complete"""
+        # Serve cached routes from memory, only the missing pairs go to Ryanair
+        cache_window = date_window + self._combination_key(search_params)
+        missing_pairs = []
+        for pair in pairs:
+            cached = self.fare_cache.get(pair + cache_window)
+            if cached is None:
+                missing_pairs.append(pair)
+            else:
+                yield pair, cached
+
+        if missing_pairs:
+            for pair, trips in self._iter_routes(missing_pairs, date_window, search_params):
+                self.fare_cache.set(pair + cache_window, trips)
+                if trips:
+                    self.route_index.mark_verified(*pair)
+                yield pair, trips
+
+    def _iter_routes(self, pairs, date_window, search_params):
+        """Fetch the given pairs with the selected strategy, backend and execution mode"""
+        strategy = search_params.get('strategy') or self.strategy
+        if strategy == 'calendar':
+            constraints = self._get_stay_constraints(search_params)
+            yield from self._iter_queries(
+                pairs, date_window, search_params,
+                fetch_route=lambda pair, window: self._fetch_route_from_calendar(pair, window, constraints)
+            )
+            return
+        if strategy != 'per_origin':
+            yield from self._iter_queries(pairs, date_window, search_params)
+            return
+
+        # One any-destination query per origin, intersected locally with the target pairs
+        targets_by_origin = {}
+        for origin, destination in pairs:
+            targets_by_origin.setdefault(origin, []).append(destination)
+
+        origin_queries = [(origin, None) for origin in targets_by_origin]
+        for (origin, _), trips in self._iter_queries(origin_queries, date_window, search_params):
+            # The any-destination answer is complete: absent targets are not served
+            trips_by_destination = {destination: [] for destination in targets_by_origin[origin]}
+            for trip in trips:
+                if trip['destination'] in trips_by_destination:
+                    trips_by_destination[trip['destination']].append(trip)
+            for destination, route_trips in trips_by_destination.items():
+                yield (origin, destination), route_trips
+
+    def _iter_queries(self, pairs, date_window, search_params, fetch_route=None):
+        """Run (origin, destination) queries with the configured backend, None meaning any destination"""
+        execution_mode = search_params.get('execution') or self.execution_mode
+        if self.async_client is not None and fetch_route is None:
+            return self._fetch_routes_async(pairs, date_window)
+        elif execution_mode == 'serial':
+            return self._fetch_routes_serially(pairs, date_window, fetch_route or self._fetch_route)
+        return self._fetch_routes_concurrently(pairs, date_window, fetch_route or self._fetch_route)
+
+    def _get_departure_airports(self, search_params):
+        """Selected departure airports plus the airports within origin_near's radius"""
+        departure_airports = list(search_params.get('departure_airports') or [])
+
+        # e.g. {'lat': 50.85, 'lon': 4.35, 'radius_km': 80} or {'airport': 'BRU', 'radius_km': 80}
+        origin_near = search_params.get('origin_near')
+        if origin_near:
+            if origin_near.get('airport'):
+                point = get_airport_coordinates(origin_near['airport'])
+                if point is None:
+                    raise ValueError(f"Unknown airport {origin_near['airport']}")
+            else:
+                point = (float(origin_near['lat']), float(origin_near['lon']))
+            for code, _ in get_airports_within(*point, float(origin_near['radius_km'])):
+                if code not in departure_airports:
+                    departure_airports.append(code)
+
+        return departure_airports
+
+    def _is_within_distance(self, pair, max_distance_km):
+        """True if both airports are located and at most max_distance_km apart"""
+        distance = get_airport_distance_km(*pair)
+        return distance is not None and distance <= max_distance_km
+
+    def _get_target_destinations(self, search_params):
+        """Get target destinations based on a compound filter, theme or countries"""
+        if search_params.get('destination_filter'):
+            # Compound filter, e.g. {'theme': ['beach', 'party'], 'country': ['spain', 'italy']}
+            return query_airports(search_params['destination_filter'])
+
+        if 'theme' in search_params and search_params['theme']:
+            # Theme-based search
+            return get_airports_by_theme(search_params['theme'])
+
+        # Traditional country-based search
+        target_countries = search_params['target_countries']
+        coastal_only = search_params.get('coastal_only', None)
+
+        if coastal_only is True:
+            return get_coastal_airports_by_countries(target_countries, coastal_only=True)
+        elif coastal_only is False:
+            return get_coastal_airports_by_countries(target_countries, coastal_only=False)
+        return get_airports_by_countries(target_countries)
+
+    def _get_date_window(self, search_params):
+        """Return (departure_from, departure_to, return_from, return_to) as YYYY-MM-DD strings"""
         departure_date_from = search_params['departure_date_from']
         departure_date_to = search_params['departure_date_to']
         min_stay_duration = search_params['min_stay_duration']
-        
-        # Get target destinations based on theme or countries
-        if 'theme' in search_params and search_params['theme']:
-            # Theme-based search
-            target_destinations = get_airports_by_theme(search_params['theme'])
-        else:
-            # Traditional country-based search
-            target_countries = search_params['target_countries']
-            coastal_only = search_params.get('coastal_only', None)
-            
-            if coastal_only is True:
-                target_destinations = get_coastal_airports_by_countries(target_countries, coastal_only=True)
-            elif coastal_only is False:
-                target_destinations = get_coastal_airports_by_countries(target_countries, coastal_only=False)
-            else:
-                target_destinations = get_airports_by_countries(target_countries)
-        
-        for origin in departure_airports:
+
+        earliest_departure = datetime.strptime(departure_date_from, '%Y-%m-%d')
+        latest_departure = datetime.strptime(departure_date_to, '%Y-%m-%d')
+
+        return_date_from = (earliest_departure + timedelta(days=min_stay_duration)).strftime('%Y-%m-%d')
+        return_date_to = (latest_departure + timedelta(days=min_stay_duration)).strftime('%Y-%m-%d')
+
+        return departure_date_from, departure_date_to, return_date_from, return_date_to
+
+    def _get_stay_constraints(self, search_params):
+        """Build the StayConstraints used to pair one-way legs in the 'calendar' strategy"""
+        min_stay_duration = int(search_params['min_stay_duration'])
+
+        # Without a maximum, stays reach as far as the return window of the other strategies
+        max_stay_duration = search_params.get('max_stay_duration')
+        if max_stay_duration is None:
+            departure_days = (
+                datetime.strptime(search_params['departure_date_to'], '%Y-%m-%d')
+                - datetime.strptime(search_params['departure_date_from'], '%Y-%m-%d')
+            ).days
+            max_stay_duration = min_stay_duration + departure_days
+
+        def weekdays(key):
+            values = search_params.get(key)
+            return tuple(sorted({int(value) for value in values})) if values else None
+
+        max_price = search_params.get('max_price')
+        return StayConstraints(
+            min_stay=min_stay_duration,
+            max_stay=int(max_stay_duration),
+            departure_weekdays=weekdays('departure_weekdays'),
+            return_weekdays=weekdays('return_weekdays'),
+            max_price=float(max_price) if max_price is not None else None,
+            limit=int(search_params.get('trips_per_route') or 1)
+        )
+
+    def _combination_key(self, search_params):
+        """Extra cache and coalescing key part: calendar results depend on the stay constraints"""
+        if (search_params.get('strategy') or self.strategy) == 'calendar':
+            return (self._get_stay_constraints(search_params),)
+        return ()
+
+    def _fetch_routes_serially(self, pairs, date_window, fetch_route):
+        """Query every (origin, destination) pair one after another"""
+        for pair in pairs:
             try:
-                earliest_departure = datetime.strptime(departure_date_from, '%Y-%m-%d')
-                latest_departure = datetime.strptime(departure_date_to, '%Y-%m-%d')
-                
-                return_date_from = (earliest_departure + timedelta(days=min_stay_duration)).strftime('%Y-%m-%d')
-                return_date_to = (latest_departure + timedelta(days=min_stay_duration)).strftime('%Y-%m-%d')
-                
-                for destination in target_destinations:
-                    try:
-                        trips = self.ryanair.get_cheapest_return_flights(
-                            origin, 
-                            departure_date_from, 
-                            departure_date_to, 
-                            return_date_from, 
-                            return_date_to, 
-                            destination_airport=destination
-                        )
-                        
-                        if trips:
-                            for trip in trips:
-                                from services.ryanair_service import RyanairLinkService
-                                
-                                # Create smart Ryanair booking link
-                                booking_link = RyanairLinkService.create_booking_link(
-                                    trip.outbound.origin,
-                                    trip.outbound.destination,
-                                    trip.outbound.departureTime,
-                                    trip.inbound.departureTime
-                                )
-                                
-                                # Round prices to nearest 0.5 or integer
-                                def round_price(price):
-                                    rounded = round(price * 2) / 2
-                                    return int(rounded) if rounded == int(rounded) else rounded
-                                
-                                results.append({
-                                    'origin': trip.outbound.origin,
-                                    'destination': trip.outbound.destination,
-                                    'outbound_price': round_price(trip.outbound.price),
-                                    'inbound_price': round_price(trip.inbound.price),
-                                    'total_price': round_price(trip.totalPrice),
-                                    'departure_time': trip.outbound.departureTime,
-                                    'return_time': trip.inbound.departureTime,
-                                    'origin_name': get_airport_name(trip.outbound.origin),
-                                    'destination_info': get_airport_info(trip.outbound.destination),
-                                    'ryanair_link': booking_link
-                                })
-                    except Exception as e:
-                        continue
-                        
+                trips = fetch_route(pair, date_window)
             except Exception as e:
                 continue
-        
-        # Sort by price
-        results.sort(key=lambda x: x['total_price'])
-        return results
\ No newline at end of file
+            yield pair, trips
+
+    def _fetch_routes_concurrently(self, pairs, date_window, fetch_route):
+        """Query the (origin, destination) pairs on a bounded worker pool"""
+        return fan_out(
+            lambda pair: fetch_route(pair, date_window),
+            pairs,
+            upstream='ryanair',
+            max_concurrency=self.max_concurrency,
+            call_timeout=self.call_timeout,
+            deadline=self.search_deadline
+        )
+
+    def _fetch_routes_async(self, pairs, date_window):
+        """Query the (origin, destination) pairs on the asyncio fare client's shared pool"""
+        departure_date_from, departure_date_to, return_date_from, return_date_to = date_window
+        queries = {
+            (origin, destination): {
+                'source_airport': origin,
+                'date_from': departure_date_from,
+                'date_to': departure_date_to,
+                'return_date_from': return_date_from,
+                'return_date_to': return_date_to,
+                'destination_airport': destination
+            }
+            for origin, destination in pairs
+        }
+
+        completed = self.async_client.iter_many_return_flights(
+            queries, call_timeout=self.call_timeout, deadline=self.search_deadline
+        )
+        for pair, trips in completed:
+            try:
+                formatted = [self._format_trip(trip) for trip in trips]
+            except Exception as e:
+                continue
+            yield pair, formatted
+
+    def _fetch_route(self, pair, date_window):
+        """Fetch and format the cheapest return trips for one route (destination None = all destinations)"""
+        origin, destination = pair
+        departure_date_from, departure_date_to, return_date_from, return_date_to = date_window
+
+        trips = self.ryanair.get_cheapest_return_flights(
+            origin,
+            departure_date_from,
+            departure_date_to,
+            return_date_from,
+            return_date_to,
+            destination_airport=destination
+        )
+
+        return [self._format_trip(trip) for trip in trips or []]
+
+    def _fetch_route_from_calendar(self, pair, date_window, constraints):
+        """Assemble the cheapest return trips of one route from cached and missing calendar days"""
+        origin, destination = pair
+        departure_date_from, departure_date_to = date_window[:2]
+        trips = self.fare_calendar.cheapest_return_trips(
+            origin, destination, departure_date_from, departure_date_to, constraints
+        )
+        return [self._format_trip(trip) for trip in trips]
+
+    def _format_trip(self, trip):
+        """Convert a ryanair Trip into its fare fields, cached as is; see _with_catalog_info"""
+        # Create smart Ryanair booking link
+        booking_link = RyanairLinkService.create_booking_link(
+            trip.outbound.origin,
+            trip.outbound.destination,
+            trip.outbound.departureTime,
+            trip.inbound.departureTime
+        )
+
+        return {
+            'origin': trip.outbound.origin,
+            'destination': trip.outbound.destination,
+            'outbound_price': round_price(trip.outbound.price),
+            'inbound_price': round_price(trip.inbound.price),
+            'total_price': round_price(trip.totalPrice),
+            'departure_time': trip.outbound.departureTime,
+            'return_time': trip.inbound.departureTime,
+            'ryanair_link': booking_link
+        }
+
+    def _with_catalog_info(self, trip):
+        """Result dict returned by the API: a trip's fare fields plus names and themes from the current catalog"""
+        return {
+            **trip,
+            'origin_name': get_airport_name(trip['origin']),
+            'destination_info': get_airport_info(trip['destination'])
+        }
@@ -4,7 +4,20 @@ Google Hotels Service for searching hotels using SERP API
 import requests
 import re
 import time
-from airport_themes import get_airport_info
+from .airport_locations import resolve_airport
+from .cache import TTLCache
+from .fanout import fan_out, get_upstream_limiter
+from .single_flight import SingleFlight
+
+# Follow-up searches run when the first page is thin
+VARIANTS_BELOW = 35  # Hotels on the first page under which search variants are tried
+PAGES_BELOW = 40  # Hotels on the first page under which further pages are fetched
+MAX_EXTRA_PAGES = 2
+PAGE_SIZE = 20
+
+# Filters the SERP API applies itself: part of the cached result set's key. Hotel type,
+# price range and sort are applied locally to the cached result set
+UPSTREAM_FILTERS = ('hotel_class', 'free_cancellation')
 
 
 class GoogleHotelsService:
@@ -17,14 +30,93 @@ class GoogleHotelsService:
         """
         self.serpapi_key = config.get('SERPAPI_KEY')
         self.base_url = "https://serpapi.com/search.json"
+        self.max_concurrency = config.get('HOTEL_SEARCH_MAX_CONCURRENCY', 4)
+        self.deadline = config.get('HOTEL_SEARCH_DEADLINE', 25)
+        self.result_sets = TTLCache(config.get('HOTEL_CACHE_TTL', 1800), maxsize=config.get('HOTEL_CACHE_SIZE', 500))
+        self.single_flight = SingleFlight('hotel-search')
     
     def search_hotels(self, destination, checkin_date, checkout_date, adults=2, **filters):
-        """Search for hotels using SERP API Google Hotels"""
-        try:
-            # Extract city name from airport code
-            airport_info = get_airport_info(destination)
-            city_name = self._extract_city_from_airport(airport_info.get('name', ''))
+        """
+        Search for hotels using SERP API Google Hotels
+        
+        The unfiltered hotels of a (city, dates, adults) search are cached: changing
+        the hotel type, price range or sort is answered from memory, only the
+        UPSTREAM_FILTERS lead to another SERP API search.
+        """
+        # Canonical city of the airport
+        city_name = resolve_airport(destination).city
+        upstream_filters = {name: filters[name] for name in UPSTREAM_FILTERS if filters.get(name)}
+        key = (city_name, checkin_date, checkout_date, int(adults)) + tuple(sorted(upstream_filters.items()))
+        
+        result_set = self.result_sets.get(key)
+        if result_set is None:
+            # Identical searches in flight share one SERP API search
+            result_set = next(self.single_flight.iterate(key, lambda: [
+                self._fetch_hotels(city_name, checkin_date, checkout_date, adults, upstream_filters)
+            ]), None)
+            if result_set is None:
+                return self._get_fallback_hotels(city_name, checkin_date, checkout_date)
+            # Fallbacks (SERP API errors, no hotels) are not cached
+            if result_set.get('hotels'):
+                self.result_sets.set(key, result_set)
+        
+        if 'booking_links' in result_set:
+            return result_set
+        return self._apply_local_filters(result_set, filters)
+    
+    def _apply_local_filters(self, result_set, filters):
+        """Hotel type, price range and sort applied to a cached result set"""
+        hotels = []
+        for hotel_data in result_set['hotels']:
+            # Apply client-side hotel type filter
+            if filters.get('hotel_type'):
+                filter_type = filters['hotel_type'].lower()
+                hotel_type = hotel_data['type'].lower()
+                
+                # Match filter with hotel type
+                if filter_type == 'hotel' and 'hotel' not in hotel_type and 'boutique' not in hotel_type:
+                    continue
+                elif filter_type == 'hostel' and 'hostel' not in hotel_type:
+                    continue
+                elif filter_type == 'resort' and 'resort' not in hotel_type:
+                    continue
+                elif filter_type == 'apartment' and 'apartment' not in hotel_type:
+                    continue
+                elif filter_type == 'boutique' and 'boutique' not in hotel_type:
+                    continue
+            
+            # Apply price range filter (hotels without a price are kept)
+            if hotel_data['price_numeric']:
+                price_num = hotel_data['price_numeric']
+                if filters.get('price_min') and price_num < int(filters['price_min']):
+                    continue
+                if filters.get('price_max') and price_num > int(filters['price_max']):
+                    continue
             
+            hotels.append(hotel_data)
+        
+        # Apply sorting
+        if filters.get('sort') == '8':  # Price ascending
+            # Separate hotels with and without prices
+            hotels_with_prices = [h for h in hotels if h['price_numeric']]
+            hotels_without_prices = [h for h in hotels if not h['price_numeric']]
+            # Sort hotels with prices by price, put hotels without prices at the end
+            hotels_with_prices.sort(key=lambda x: x['price_numeric'])
+            hotels = hotels_with_prices + hotels_without_prices
+        elif filters.get('sort') == '1':  # Rating descending
+            hotels.sort(key=lambda x: x['rating'] if x['rating'] else 0, reverse=True)
+        
+        return {
+            **result_set,
+            'hotels': hotels,
+            'total_results': len(hotels),
+            'unfiltered_results': len(result_set['hotels'])
+        }
+    
+    def _fetch_hotels(self, city_name, checkin_date, checkout_date, adults, upstream_filters):
+        """Every hotel SERP API returns for a search, first page and follow-ups merged, unfiltered"""
+        started = time.monotonic()
+        try:
             # Build SERP API parameters
             params = {
                 'engine': 'google_hotels',
@@ -41,13 +133,9 @@ class GoogleHotelsService:
             }
             
             # Add filters if provided
-            if filters.get('price_min'):
-                params['price_min'] = filters['price_min']
-            if filters.get('price_max'):
-                params['price_max'] = filters['price_max']
-            if filters.get('hotel_class'):
-                params['hotel_class'] = filters['hotel_class']
-            if filters.get('free_cancellation'):
+            if upstream_filters.get('hotel_class'):
+                params['hotel_class'] = upstream_filters['hotel_class']
+            if upstream_filters.get('free_cancellation'):
                 params['free_cancellation'] = '1'
             # Note: Don't pass sort_by to SERP API as it limits results
             # We'll sort on our side after getting all results
@@ -56,7 +144,9 @@ class GoogleHotelsService:
                 
             print(f"DEBUG: Searching hotels for {city_name} with params: {params}")
             
-            response = requests.get(self.base_url, params=params, timeout=15)
+            # Counted in the SERP API budget shared with the follow-up requests
+            with get_upstream_limiter('serpapi', self.max_concurrency):
+                response = requests.get(self.base_url, params=params, timeout=15)
             
             if response.status_code != 200:
                 print(f"SERP API error: HTTP {response.status_code}")
@@ -92,112 +182,26 @@ class GoogleHotelsService:
                     print(f"DEBUG: API says {total_available} total results available")
             
             for hotel in properties[:50]:  # Increased limit to get more results  
-                # Try multiple price extraction methods
-                rate_info = hotel.get('rate_per_night', {})
-                if not rate_info:
-                    # Try alternative price fields
-                    rate_info = hotel.get('prices', {}) or hotel.get('price', {}) or hotel.get('rates', {})
-                
-                price_display = self._extract_price(rate_info)
-                price_numeric = self._extract_price_numeric(rate_info)
-                
-                # If still no price, try extracting from raw data
-                if not price_display and not price_numeric:
-                    price_display = self._extract_price(hotel)
-                    price_numeric = self._extract_price_numeric(hotel)
-                
-                hotel_data = {
-                    'name': hotel.get('name', 'Hotel'),
-                    'rating': hotel.get('overall_rating', 0),
-                    'price': price_display,
-                    'price_numeric': price_numeric,  # For sorting and filtering
-                    'image': hotel.get('images', [{}])[0].get('thumbnail') if hotel.get('images') else None,
-                    'description': hotel.get('description', ''),
-                    'amenities': hotel.get('amenities', [])[:5],  # Top 5 amenities
-                    'booking_url': hotel.get('booking_link', ''),
-                    'stars': self._extract_stars(hotel.get('hotel_class')),
-                    'stars_display': hotel.get('hotel_class', ''),
-                    'location_rating': hotel.get('location_rating', 0),
-                    'reviews': hotel.get('reviews', 0),
-                    'free_cancellation': hotel.get('free_cancellation', False),
-                    'address': hotel.get('gps_coordinates', {}).get('latitude', ''),
-                    'type': self._categorize_hotel(hotel),
-                    'details_url': hotel.get('link', '')  # Link for more info
-                }
-                
-                # Apply client-side hotel type filter
-                if filters.get('hotel_type'):
-                    filter_type = filters['hotel_type'].lower()
-                    hotel_type = hotel_data['type'].lower()
-                    
-                    # Match filter with hotel type
-                    if filter_type == 'hotel' and 'hotel' not in hotel_type and 'boutique' not in hotel_type:
-                        continue
-                    elif filter_type == 'hostel' and 'hostel' not in hotel_type:
-                        continue
-                    elif filter_type == 'resort' and 'resort' not in hotel_type:
-                        continue
-                    elif filter_type == 'apartment' and 'apartment' not in hotel_type:
-                        continue
-                    elif filter_type == 'boutique' and 'boutique' not in hotel_type:
-                        continue
-                
-                # Apply price range filter (only if price is available)
-                if filters.get('price_min') or filters.get('price_max'):
-                    if hotel_data['price_numeric']:
-                        price_num = hotel_data['price_numeric']
-                        if filters.get('price_min') and price_num < int(filters['price_min']):
-                            print(f"DEBUG: Filtering out {hotel_data['name']} - price {price_num} < {filters['price_min']}")
-                            continue
-                        if filters.get('price_max') and price_num > int(filters['price_max']):
-                            print(f"DEBUG: Filtering out {hotel_data['name']} - price {price_num} > {filters['price_max']}")
-                            continue
-                    # If no price_numeric, keep hotel but note it
-                    elif filters.get('price_min') or filters.get('price_max'):
-                        print(f"DEBUG: Keeping {hotel_data['name']} without price for filtering")
-                
-                hotels.append(hotel_data)
+                hotels.append(self._parse_hotel(hotel))
             
-            # Strategy: Try with different search parameters to get more variety
-            if len(hotels) < 35:
-                print("DEBUG: Attempting to get more hotels with different search strategies...")
-                additional_hotels = self._get_additional_hotels_with_variants(params, city_name)
-                
-                # Add unique additional hotels
+            # Thin first page: search variants and further pages are requested together,
+            # unique hotels are merged as each call returns
+            follow_ups = []
+            if len(hotels) < VARIANTS_BELOW:
+                follow_ups += self._variant_requests(params, city_name)
+            if has_more_pages and len(hotels) < PAGES_BELOW:
+                follow_ups += self._page_requests(params, len(properties))
+            remaining = self.deadline - (time.monotonic() - started)
+            if follow_ups and remaining > 0:
                 existing_names = {h['name'] for h in hotels}
                 added_count = 0
-                for hotel in additional_hotels:
+                for hotel in self._get_follow_up_hotels(follow_ups, remaining):
                     if hotel['name'] not in existing_names:
                         hotels.append(hotel)
                         existing_names.add(hotel['name'])
                         added_count += 1
                 
-                print(f"DEBUG: Added {added_count} additional unique hotels from variants")
-            
-            # Try to get more results if pagination is available and we have fewer than 40 hotels
-            if has_more_pages and len(hotels) < 40:
-                print("DEBUG: Attempting to get more results with pagination...")
-                additional_hotels = self._get_paginated_results(params, city_name, has_more_pages, len(hotels))
-                
-                # Add unique additional hotels
-                existing_names = {h['name'] for h in hotels}
-                for hotel in additional_hotels:
-                    if hotel['name'] not in existing_names:
-                        hotels.append(hotel)
-                        existing_names.add(hotel['name'])
-                
-                print(f"DEBUG: After pagination, total hotels: {len(hotels)}")
-            
-            # Apply sorting
-            if filters.get('sort') == '8':  # Price ascending
-                # Separate hotels with and without prices
-                hotels_with_prices = [h for h in hotels if h['price_numeric']]
-                hotels_without_prices = [h for h in hotels if not h['price_numeric']]
-                # Sort hotels with prices by price, put hotels without prices at the end
-                hotels_with_prices.sort(key=lambda x: x['price_numeric'])
-                hotels = hotels_with_prices + hotels_without_prices
-            elif filters.get('sort') == '1':  # Rating descending
-                hotels.sort(key=lambda x: x['rating'] if x['rating'] else 0, reverse=True)
+                print(f"DEBUG: Added {added_count} unique hotels from {len(follow_ups)} follow-up requests, total {len(hotels)}")
             
             return {
                 'hotels': hotels,
@@ -210,7 +214,7 @@ class GoogleHotelsService:
             print(f"Google Hotels service error: {e}")
             import traceback
             print(f"Full traceback: {traceback.format_exc()}")
-            return self._get_fallback_hotels(city_name if 'city_name' in locals() else destination, checkin_date, checkout_date)
+            return self._get_fallback_hotels(city_name, checkin_date, checkout_date)
     
     def _extract_price(self, rate_info):
         """Extract price from rate information"""
@@ -332,88 +336,52 @@ class GoogleHotelsService:
         
         return None
     
-    def _get_paginated_results(self, base_params, city_name, has_more_pages, current_count):
-        """Get additional hotel results using pagination"""
-        additional_hotels = []
-        page = 1
-        max_pages = 3  # Limit to avoid excessive API calls
+    def _parse_hotel(self, hotel):
+        """Hotel dict of one SERP API property"""
+        # Try multiple price extraction methods
+        rate_info = hotel.get('rate_per_night', {})
+        if not rate_info:
+            # Try alternative price fields
+            rate_info = hotel.get('prices', {}) or hotel.get('price', {}) or hotel.get('rates', {})
         
-        while has_more_pages and page < max_pages and len(additional_hotels) < 30:
-            try:
-                # Create new params for next page
-                paginated_params = base_params.copy()
-                paginated_params['start'] = str(current_count + (page - 1) * 20)  # Offset for pagination
-                
-                print(f"DEBUG: Requesting page {page + 1} with start={paginated_params['start']}")
-                
-                response = requests.get(self.base_url, params=paginated_params, timeout=15)
-                
-                if response.status_code != 200:
-                    print(f"DEBUG: Pagination request failed with status {response.status_code}")
-                    break
-                
-                data = response.json()
-                
-                if 'error' in data:
-                    print(f"DEBUG: Pagination error: {data['error']}")
-                    break
-                
-                properties = data.get('properties', [])
-                print(f"DEBUG: Page {page + 1} returned {len(properties)} hotels")
-                
-                if not properties:
-                    break
-                
-                # Process hotels from this page
-                for hotel in properties[:25]:  # Limit per page
-                    rate_info = hotel.get('rate_per_night', {})
-                    if not rate_info:
-                        rate_info = hotel.get('prices', {}) or hotel.get('price', {}) or hotel.get('rates', {})
-                    
-                    price_display = self._extract_price(rate_info)
-                    price_numeric = self._extract_price_numeric(rate_info)
-                    
-                    if not price_display and not price_numeric:
-                        price_display = self._extract_price(hotel)
-                        price_numeric = self._extract_price_numeric(hotel)
-                    
-                    hotel_data = {
-                        'name': hotel.get('name', 'Hotel'),
-                        'rating': hotel.get('overall_rating', 0),
-                        'price': price_display,
-                        'price_numeric': price_numeric,
-                        'image': hotel.get('images', [{}])[0].get('thumbnail') if hotel.get('images') else None,
-                        'description': hotel.get('description', ''),
-                        'amenities': hotel.get('amenities', [])[:5],
-                        'booking_url': hotel.get('booking_link', ''),
-                        'stars': self._extract_stars(hotel.get('hotel_class')),
-                        'stars_display': hotel.get('hotel_class', ''),
-                        'location_rating': hotel.get('location_rating', 0),
-                        'reviews': hotel.get('reviews', 0),
-                        'free_cancellation': hotel.get('free_cancellation', False),
-                        'address': hotel.get('gps_coordinates', {}).get('latitude', ''),
-                        'type': self._categorize_hotel(hotel),
-                        'details_url': hotel.get('link', '')
-                    }
-                    
-                    additional_hotels.append(hotel_data)
-                
-                # Check if more pages are available
-                has_more_pages = 'serpapi_pagination' in data and 'next' in data['serpapi_pagination']
-                page += 1
-                
-            except Exception as e:
-                print(f"DEBUG: Pagination error on page {page}: {e}")
-                break
+        price_display = self._extract_price(rate_info)
+        price_numeric = self._extract_price_numeric(rate_info)
         
-        print(f"DEBUG: Pagination collected {len(additional_hotels)} additional hotels")
-        return additional_hotels
-    
-    def _get_additional_hotels_with_variants(self, base_params, city_name):
-        """Try different search parameters to get more hotel variety"""
-        additional_hotels = []
+        # If still no price, try extracting from raw data
+        if not price_display and not price_numeric:
+            price_display = self._extract_price(hotel)
+            price_numeric = self._extract_price_numeric(hotel)
         
-        # Different search variants to try
+        return {
+            'name': hotel.get('name', 'Hotel'),
+            'rating': hotel.get('overall_rating', 0),
+            'price': price_display,
+            'price_numeric': price_numeric,  # For sorting and filtering
+            'image': hotel.get('images', [{}])[0].get('thumbnail') if hotel.get('images') else None,
+            'description': hotel.get('description', ''),
+            'amenities': hotel.get('amenities', [])[:5],  # Top 5 amenities
+            'booking_url': hotel.get('booking_link', ''),
+            'stars': self._extract_stars(hotel.get('hotel_class')),
+            'stars_display': hotel.get('hotel_class', ''),
+            'location_rating': hotel.get('location_rating', 0),
+            'reviews': hotel.get('reviews', 0),
+            'free_cancellation': hotel.get('free_cancellation', False),
+            'address': hotel.get('gps_coordinates', {}).get('latitude', ''),
+            'type': self._categorize_hotel(hotel),
+            'details_url': hotel.get('link', '')  # Link for more info
+        }
+    
+    def _page_requests(self, base_params, first_page_count):
+        """Further pages of the search, their offsets follow from the size of the first page"""
+        pages = []
+        for page in range(MAX_EXTRA_PAGES):
+            paginated_params = base_params.copy()
+            paginated_params['start'] = str(first_page_count + page * PAGE_SIZE)
+            pages.append((f"page start={paginated_params['start']}", paginated_params, 25, 15))
+        return pages
+    
+    def _variant_requests(self, base_params, city_name):
+        """Same search with other parameters, to get more hotel variety"""
         variants = [
             # Try with different geolocation
             {'gl': 'us', 'hl': 'en'},  # US perspective
@@ -426,72 +394,33 @@ class GoogleHotelsService:
             # Try with different currency/region settings
             {'gl': 'de', 'hl': 'de'},  # German perspective (EUR currency)
         ]
+        return [(f"variant {variant}", {**base_params, **variant}, 15, 10) for variant in variants]
+    
+    def _get_follow_up_hotels(self, follow_ups, deadline):
+        """
+        Run follow-up requests concurrently and yield their hotels as each one returns
         
-        for variant_index, variant in enumerate(variants):
-            try:
-                variant_params = base_params.copy()
-                variant_params.update(variant)
-                
-                print(f"DEBUG: Trying variant {variant_index + 1}: {variant}")
-                
-                response = requests.get(self.base_url, params=variant_params, timeout=10)
-                
-                if response.status_code != 200:
-                    print(f"DEBUG: Variant {variant_index + 1} failed with status {response.status_code}")
-                    continue
-                
-                data = response.json()
-                
-                if 'error' in data:
-                    print(f"DEBUG: Variant {variant_index + 1} error: {data['error']}")
-                    continue
-                
-                properties = data.get('properties', [])
-                print(f"DEBUG: Variant {variant_index + 1} returned {len(properties)} hotels")
-                
-                # Process hotels from this variant (limit to avoid too many)
-                for hotel in properties[:15]:  # Limit per variant
-                    rate_info = hotel.get('rate_per_night', {})
-                    if not rate_info:
-                        rate_info = hotel.get('prices', {}) or hotel.get('price', {}) or hotel.get('rates', {})
-                    
-                    price_display = self._extract_price(rate_info)
-                    price_numeric = self._extract_price_numeric(rate_info)
-                    
-                    if not price_display and not price_numeric:
-                        price_display = self._extract_price(hotel)
-                        price_numeric = self._extract_price_numeric(hotel)
-                    
-                    hotel_data = {
-                        'name': hotel.get('name', 'Hotel'),
-                        'rating': hotel.get('overall_rating', 0),
-                        'price': price_display,
-                        'price_numeric': price_numeric,
-                        'image': hotel.get('images', [{}])[0].get('thumbnail') if hotel.get('images') else None,
-                        'description': hotel.get('description', ''),
-                        'amenities': hotel.get('amenities', [])[:5],
-                        'booking_url': hotel.get('booking_link', ''),
-                        'stars': self._extract_stars(hotel.get('hotel_class')),
-                        'stars_display': hotel.get('hotel_class', ''),
-                        'location_rating': hotel.get('location_rating', 0),
-                        'reviews': hotel.get('reviews', 0),
-                        'free_cancellation': hotel.get('free_cancellation', False),
-                        'address': hotel.get('gps_coordinates', {}).get('latitude', ''),
-                        'type': self._categorize_hotel(hotel),
-                        'details_url': hotel.get('link', '')
-                    }
-                    
-                    additional_hotels.append(hotel_data)
-                
-                # Don't overwhelm API - small delay between requests
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"DEBUG: Variant {variant_index + 1} exception: {e}")
-                continue
+        Args:
+            follow_ups: (label, params, max hotels kept, timeout) tuples
+            deadline: Seconds left for the whole hotel search, unfinished requests are dropped
+        """
+        def fetch(follow_up):
+            label, params, limit, timeout = follow_up
+            response = requests.get(self.base_url, params=params, timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+            if 'error' in data:
+                raise ValueError(data['error'])
+            return data.get('properties', [])[:limit]
         
-        print(f"DEBUG: Variants collected {len(additional_hotels)} total additional hotels")
-        return additional_hotels
+        # The SERP API budget is shared by every concurrent hotel search of the process
+        call_timeout = max(timeout for _, _, _, timeout in follow_ups)
+        for (label, _, _, _), properties in fan_out(fetch, follow_ups, upstream='serpapi',
+                                                   max_concurrency=self.max_concurrency,
+                                                   call_timeout=call_timeout, deadline=deadline):
+            print(f"DEBUG: {label} returned {len(properties)} hotels")
+            for hotel in properties:
+                yield self._parse_hotel(hotel)
     
     def _extract_stars(self, hotel_class_str):
         """Extract number of stars from hotel class string"""
@@ -524,25 +453,6 @@ class GoogleHotelsService:
         else:
             return 'Hotel'
     
-    def _extract_city_from_airport(self, airport_name):
-        """Extract city name from airport name"""
-        if not airport_name:
-            return "City"
-            
-        name_lower = airport_name.lower()
-        
-        # Remove common airport words
-        remove_words = ['airport', 'international', 'airfield', 'aéroport', 'aeroporto', '-', 'charles', 'de', 'gaulle']
-        for word in remove_words:
-            name_lower = name_lower.replace(word, ' ')
-        
-        # Split and get meaningful parts
-        parts = [part.strip() for part in name_lower.split() if len(part.strip()) > 2]
-        if parts:
-            # Return the first meaningful city name
-            return parts[0].title()
-        return "City"
-    
     def _get_fallback_hotels(self, city_name, checkin_date, checkout_date):
         """Fallback when SERP API fails"""
         return {
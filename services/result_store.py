@@ -0,0 +1,141 @@
+"""
+Server-side store for completed flight searches with cursor pagination
+"""
+import base64
+import uuid
+from datetime import datetime
+
+from .cache import TTLCache
+
+
+# Sort keys accepted by SearchResultStore.get_page ('-' prefix = descending)
+SORT_KEYS = {
+    'price': lambda trip: trip['total_price'],
+    'date': lambda trip: _departure_date(trip),
+    'destination': lambda trip: trip['destination'],
+    'duration': lambda trip: _stay_days(trip)
+}
+
+
+def _to_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace('Z', ''))
+
+
+def _departure_date(trip):
+    return _to_datetime(trip['departure_time']).date()
+
+
+def _stay_days(trip):
+    return (_to_datetime(trip['return_time']) - _to_datetime(trip['departure_time'])).days
+
+
+def encode_cursor(offset):
+    return base64.urlsafe_b64encode(str(offset).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the offset stored in a cursor, 0 for an empty or invalid cursor"""
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return max(int(base64.urlsafe_b64decode(padded).decode()), 0)
+    except Exception:
+        return 0
+
+
+class SearchResultStore:
+    def __init__(self, ttl=3600, maxsize=500):
+        """
+        Initialize the result store
+
+        Args:
+            ttl: Seconds a result set can be paged after the search completed
+            maxsize: Maximum number of result sets kept (LRU)
+        """
+        self.result_sets = TTLCache(ttl=ttl, maxsize=maxsize)
+
+    def save(self, results, search_params=None):
+        """Store a completed search and return its result set id"""
+        result_set_id = uuid.uuid4().hex
+        self.result_sets.set(result_set_id, {
+            'results': list(results),
+            'search_params': search_params or {},
+            'orders': {}
+        })
+        return result_set_id
+
+    def get_page(self, result_set_id, cursor=None, limit=50, sort='price', filters=None):
+        """
+        Return one page of a stored result set, re-sorted and filtered locally
+
+        Args:
+            result_set_id: Id returned by save()
+            cursor: Opaque cursor from a previous page, None for the first page
+            limit: Page size
+            sort: One of SORT_KEYS, '-' prefix for descending
+            filters: Optional dict with min_price, max_price, date_from, date_to
+                (YYYY-MM-DD), destinations (codes) and themes
+
+        Returns:
+            Page dict, or None if the result set is unknown or expired
+        """
+        result_set = self.result_sets.get(result_set_id)
+        if result_set is None:
+            return None
+
+        view = self._get_view(result_set, sort or 'price', filters or {})
+        offset = decode_cursor(cursor)
+        page = view[offset:offset + limit]
+        next_offset = offset + len(page)
+
+        return {
+            'result_set_id': result_set_id,
+            'results': page,
+            'next_cursor': encode_cursor(next_offset) if next_offset < len(view) else None,
+            'total_found': len(view),
+            'total': len(result_set['results'])
+        }
+
+    def _get_view(self, result_set, sort, filters):
+        """Sorted and filtered results; filtering runs on every page, only the sort orders are kept"""
+        order = self._get_order(result_set, sort)
+        if not filters:
+            return order
+        return [trip for trip in order if self._matches(trip, filters)]
+
+    def _get_order(self, result_set, sort):
+        """Results sorted by one of the SORT_KEYS, memoized per result set so paging does not re-sort"""
+        # Unknown sort keys fall back to price: at most 2 * len(SORT_KEYS) orders per result set
+        field = sort.lstrip('-') if sort.lstrip('-') in SORT_KEYS else 'price'
+        descending = sort.startswith('-')
+        order = result_set['orders'].get((field, descending))
+        if order is None:
+            order = sorted(result_set['results'], key=SORT_KEYS[field], reverse=descending)
+            result_set['orders'][(field, descending)] = order
+        return order
+
+    def _matches(self, trip, filters):
+        if filters.get('min_price') is not None and trip['total_price'] < float(filters['min_price']):
+            return False
+        if filters.get('max_price') is not None and trip['total_price'] > float(filters['max_price']):
+            return False
+
+        if filters.get('date_from') or filters.get('date_to'):
+            departure_date = _departure_date(trip).isoformat()
+            if filters.get('date_from') and departure_date < filters['date_from']:
+                return False
+            if filters.get('date_to') and departure_date > filters['date_to']:
+                return False
+
+        if filters.get('destinations') and trip['destination'] not in filters['destinations']:
+            return False
+
+        if filters.get('themes'):
+            trip_themes = (trip.get('destination_info') or {}).get('themes', [])
+            if not any(theme in trip_themes for theme in filters['themes']):
+                return False
+
+        return True
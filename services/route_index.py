@@ -0,0 +1,165 @@
+"""
+Served-route index: which destinations Ryanair operates from each origin
+
+Built offline by the refresh job below and loaded at startup so that
+FlightSearchService never queries pairs Ryanair does not fly.
+
+Refresh job:
+    python -m services.route_index [--days 180] [--output data/route_index.json]
+"""
+import argparse
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'route_index.json')
+
+
+class RouteIndex:
+    def __init__(self, routes=None, generated_at=None):
+        """
+        Args:
+            routes: Mapping origin -> {destination: last verified ISO timestamp}
+            generated_at: ISO timestamp of the refresh that built the index
+        """
+        self.routes = routes or {}
+        self.generated_at = generated_at
+        self.pruned_pairs = 0
+        self.checked_pairs = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        """Load a persisted index, an empty (non-pruning) index if the file is missing or invalid"""
+        try:
+            with open(path, encoding='utf-8') as index_file:
+                data = json.load(index_file)
+            if data.get('version') != INDEX_VERSION:
+                print(f"Route index {path} has unsupported version {data.get('version')}, ignoring it")
+                return cls()
+            return cls(data.get('routes', {}), data.get('generated_at'))
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            print(f"Route index load error: {e}")
+            return cls()
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        """Persist the index atomically"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as index_file:
+            json.dump({
+                'version': INDEX_VERSION,
+                'generated_at': self.generated_at,
+                'routes': self.routes
+            }, index_file, indent=1, sort_keys=True)
+        os.replace(temporary_path, path)
+
+    def is_indexed(self, origin):
+        return origin in self.routes
+
+    def is_served(self, origin, destination):
+        """True if the route is served, or if the origin was never indexed (nothing to prune on)"""
+        served = self.routes.get(origin)
+        return served is None or destination in served
+
+    def served_destinations(self, origin):
+        return set(self.routes.get(origin, {}))
+
+    def last_verified(self, origin, destination):
+        return self.routes.get(origin, {}).get(destination)
+
+    def filter_pairs(self, pairs, record=True):
+        """Drop the (origin, destination) pairs Ryanair does not operate"""
+        served_pairs = [pair for pair in pairs if self.is_served(*pair)]
+        if not record:
+            return served_pairs
+        with self._lock:
+            self.checked_pairs += len(pairs)
+            self.pruned_pairs += len(pairs) - len(served_pairs)
+        return served_pairs
+
+    def mark_verified(self, origin, destination, verified_at=None):
+        """Record that a route of an indexed origin was seen with fares (in memory, the refresh job persists)"""
+        verified_at = verified_at or datetime.utcnow().replace(microsecond=0).isoformat()
+        with self._lock:
+            # Origins the refresh job never scanned stay unindexed so they are never pruned
+            if origin in self.routes:
+                self.routes[origin][destination] = verified_at
+
+    def stats(self):
+        with self._lock:
+            return {
+                'generated_at': self.generated_at,
+                'origins': len(self.routes),
+                'routes': sum(len(destinations) for destinations in self.routes.values()),
+                'checked_pairs': self.checked_pairs,
+                'pruned_pairs': self.pruned_pairs,
+                'pruned_ratio': round(self.pruned_pairs / self.checked_pairs, 3) if self.checked_pairs else 0.0
+            }
+
+
+def refresh_route_index(client, origins, days=180, window_days=30, max_concurrency=4):
+    """
+    Build a RouteIndex from Ryanair's any-destination one-way cheapest fares
+
+    Every origin is queried over consecutive windows covering the next `days`
+    days so that seasonal routes are found too.
+    """
+    from .fanout import fan_out
+
+    today = date.today()
+    windows = [
+        (today + timedelta(days=start), today + timedelta(days=min(start + window_days, days) - 1))
+        for start in range(0, days, window_days)
+    ]
+    queries = [(origin, window) for origin in origins for window in windows]
+
+    def fetch(query):
+        origin, (date_from, date_to) = query
+        flights = client.get_cheapest_flights(origin, date_from.isoformat(), date_to.isoformat())
+        return {flight.destination for flight in flights or []}
+
+    verified_at = datetime.utcnow().replace(microsecond=0).isoformat()
+    destinations_by_origin = {}
+    completed_windows = {}
+    for (origin, _), destinations in fan_out(fetch, queries, upstream='ryanair', max_concurrency=max_concurrency):
+        destinations_by_origin.setdefault(origin, set()).update(destinations)
+        completed_windows[origin] = completed_windows.get(origin, 0) + 1
+
+    # Only origins scanned over every window are indexed: a partial scan would prune served routes
+    index = RouteIndex(generated_at=verified_at)
+    for origin, destinations in destinations_by_origin.items():
+        if completed_windows[origin] == len(windows):
+            index.routes[origin] = {destination: verified_at for destination in sorted(destinations)}
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh the served-route index')
+    parser.add_argument('--days', type=int, default=180, help='Days ahead to scan for fares')
+    parser.add_argument('--output', default=DEFAULT_INDEX_PATH, help='Index file to write')
+    parser.add_argument('--concurrency', type=int, default=4, help='Parallel Ryanair queries')
+    parser.add_argument('--timeout', type=float, default=30, help='Seconds per Ryanair HTTP request')
+    args = parser.parse_args()
+
+    from ryanair import Ryanair
+    from airport_themes import get_catalog
+    from .fanout import bound_session_timeout
+
+    client = Ryanair()
+    if getattr(client, 'session', None) is not None:
+        bound_session_timeout(client.session, args.timeout)
+    origins = list(get_catalog().airports_by_code)
+    index = refresh_route_index(client, origins, days=args.days, max_concurrency=args.concurrency)
+    index.save(args.output)
+
+    stats = index.stats()
+    print(f"Route index written to {args.output}: {stats['routes']} routes from {stats['origins']} origins")
+
+
+if __name__ == '__main__':
+    main()
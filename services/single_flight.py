@@ -0,0 +1,95 @@
+"""
+Single-flight coalescing: identical in-flight work runs once and is shared by every caller
+"""
+import threading
+
+
+class SharedIteration:
+    def __init__(self):
+        """Items produced so far by one in-flight iterator, replayed to every subscriber"""
+        self.items = []
+        self.done = False
+        self.error = None
+        self.condition = threading.Condition()
+
+    def publish(self, item):
+        with self.condition:
+            self.items.append(item)
+            self.condition.notify_all()
+
+    def finish(self, error=None):
+        with self.condition:
+            self.error = error
+            self.done = True
+            self.condition.notify_all()
+
+    def subscribe(self):
+        """Yield every item from the start, then new items as they are published"""
+        index = 0
+        while True:
+            with self.condition:
+                while index >= len(self.items) and not self.done:
+                    self.condition.wait()
+                batch = self.items[index:]
+                index = len(self.items)
+                if not batch:
+                    if self.error is not None:
+                        raise self.error
+                    return
+            yield from batch
+
+
+class SingleFlight:
+    def __init__(self, name='single-flight'):
+        self.name = name
+        self.executions = 0
+        self.coalesced = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def iterate(self, key, factory):
+        """
+        Iterate over factory() once per key, whoever asks
+
+        The first caller for a key starts factory() on a background thread so that
+        a disconnecting caller never stalls the others. Callers arriving while it
+        is still running attach to it and receive the same items.
+        """
+        with self._lock:
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = SharedIteration()
+                self._in_flight[key] = flight
+                self.executions += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if leader:
+            threading.Thread(target=self._run, args=(key, flight, factory), name=self.name, daemon=True).start()
+        return flight.subscribe()
+
+    def _run(self, key, flight, factory):
+        error = None
+        try:
+            for item in factory():
+                flight.publish(item)
+        except Exception as e:
+            print(f"{self.name} execution failed for {key}: {e}")
+            error = e
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.finish(error)
+
+    def stats(self):
+        """Return executions, coalesced requests and the coalescing ratio"""
+        with self._lock:
+            requests = self.executions + self.coalesced
+            return {
+                'in_flight': len(self._in_flight),
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'coalescing_ratio': round(self.coalesced / requests, 3) if requests else 0.0
+            }
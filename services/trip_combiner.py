@@ -0,0 +1,96 @@
+"""
+Vectorized pairing of one-way legs into return trips
+
+Outbound and inbound day fares of a route are joined as a price matrix and
+masked by the stay constraints, so a different stay length or weekday filter
+is answered from the same fares without another upstream query.
+"""
+from collections import namedtuple
+from datetime import date, timedelta
+
+import numpy as np
+
+
+StayConstraints = namedtuple(
+    'StayConstraints',
+    ['min_stay', 'max_stay', 'departure_weekdays', 'return_weekdays', 'max_price', 'limit'],
+    defaults=(None, None, None, 1)
+)
+StayConstraints.__doc__ = """
+Stay constraints of a combined search (hashable, used in cache and coalescing keys)
+
+Stays are counted in days between the outbound and inbound departure dates.
+Weekdays are tuples of date.weekday() numbers (0 = Monday), None accepts any day.
+limit is the number of cheapest trips kept per route.
+"""
+
+# 1970-01-01, day 0 of datetime64[D], was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+def return_window(departure_date_from, departure_date_to, constraints):
+    """Return (return_from, return_to) as YYYY-MM-DD strings covering every allowed stay"""
+    return (
+        (date.fromisoformat(departure_date_from) + timedelta(days=constraints.min_stay)).isoformat(),
+        (date.fromisoformat(departure_date_to) + timedelta(days=constraints.max_stay)).isoformat()
+    )
+
+
+def _leg_arrays(day_fares, weekdays):
+    """Turn {day: fare or None} into day numbers, prices and fares, keeping the allowed weekdays"""
+    fares = [fare for _, fare in sorted(day_fares.items()) if fare]
+    if not fares:
+        return np.empty(0, dtype=np.int64), np.empty(0), []
+
+    days = np.array([fare['departure_time'][:10] for fare in fares], dtype='datetime64[D]').astype(np.int64)
+    prices = np.array([fare['price'] for fare in fares], dtype=np.float64)
+
+    if weekdays is not None:
+        keep = np.isin((days + _EPOCH_WEEKDAY) % 7, weekdays)
+        days, prices = days[keep], prices[keep]
+        fares = [fare for fare, kept in zip(fares, keep) if kept]
+    return days, prices, fares
+
+
+def cheapest_combinations(outbound_days, inbound_days, constraints):
+    """
+    Pair outbound and inbound day fares and keep the cheapest valid trips
+
+    Args:
+        outbound_days: {day: fare or None} of the outbound direction (FareCalendar.get_days)
+        inbound_days: {day: fare or None} of the inbound direction
+        constraints: StayConstraints
+
+    Returns:
+        List of (total_price, outbound_fare, inbound_fare), cheapest first
+    """
+    outbound_day_numbers, outbound_prices, outbound_fares = _leg_arrays(outbound_days, constraints.departure_weekdays)
+    inbound_day_numbers, inbound_prices, inbound_fares = _leg_arrays(inbound_days, constraints.return_weekdays)
+    if not outbound_fares or not inbound_fares or constraints.limit < 1:
+        return []
+
+    # Departure times are not compared, so a same-day return is never paired
+    min_stay = max(constraints.min_stay, 1)
+
+    stays = inbound_day_numbers[np.newaxis, :] - outbound_day_numbers[:, np.newaxis]
+    totals = outbound_prices[:, np.newaxis] + inbound_prices[np.newaxis, :]
+    valid = (stays >= min_stay) & (stays <= constraints.max_stay)
+    if constraints.max_price is not None:
+        valid &= totals <= constraints.max_price
+
+    candidates = np.flatnonzero(valid)
+    if not candidates.size:
+        return []
+
+    candidate_totals = totals.ravel()[candidates]
+    if constraints.limit < candidates.size:
+        best = np.argpartition(candidate_totals, constraints.limit - 1)[:constraints.limit]
+    else:
+        best = np.arange(candidates.size)
+    best = best[np.argsort(candidate_totals[best], kind='stable')]
+
+    rows, columns = np.divmod(candidates[best], len(inbound_fares))
+    return [
+        (float(total), outbound_fares[row], inbound_fares[column])
+        for total, row, column in zip(candidate_totals[best], rows.tolist(), columns.tolist())
+    ]
@@ -0,0 +1,119 @@
+"""
+Background refresh of every catalog city's weather, so requests read it from the store
+"""
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+from .airport_locations import resolve_airport
+from .weather_service import GROUP_QUERY_MAX_IDS
+
+
+class WeatherRefresher:
+    def __init__(self, weather_service, airport_codes, interval=600, batch_size=GROUP_QUERY_MAX_IDS,
+                 batch_pause=1.0, jitter=0.1):
+        """
+        Initialize the refresher
+
+        Args:
+            weather_service: WeatherService whose store is kept warm
+            airport_codes: Callable returning the airport codes to cover, read at every run
+            interval: Seconds between the starts of two runs, keep it below the store TTL
+            batch_size: Cities fetched per batch (one OpenWeather group query when they have ids)
+            batch_pause: Seconds between two batches, bounding the upstream request rate
+            jitter: Fraction of interval added or removed at random, so workers drift apart
+        """
+        self.weather_service = weather_service
+        self.airport_codes = airport_codes
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.jitter = jitter
+        self.runs = 0
+        self.failures = 0
+        self.last_run_started = None
+        self.last_run_finished = None
+        self.last_run_seconds = None
+        self.last_run_failures = 0
+        self.last_error = None
+        self._city_names = {}  # store key -> city name, for the status
+        self._thread = None
+        self._pid = None  # Process that started the thread: a forked worker inherits the object, not the thread
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the refresh loop on a daemon thread, once per process (no-op without an OpenWeather key)"""
+        if self._pid == os.getpid() or not self.weather_service.has_api_key():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._loop, name='weather-refresher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Weather refresher error: {e}")
+                with self._lock:
+                    self.last_error = str(e)
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            self._stop.wait(max(delay - (time.monotonic() - started), 0))
+
+    def run_once(self):
+        """Refresh every covered city once, in rate-limited batches; returns the number of failed cities"""
+        started = time.monotonic()
+        with self._lock:
+            self.last_run_started = datetime.now().isoformat(timespec='seconds')
+
+        keys_by_code = self.weather_service.city_keys(self.airport_codes())
+        keys = list(dict.fromkeys(keys_by_code.values()))
+        self._city_names = {key: resolve_airport(code).city for code, key in keys_by_code.items()}
+
+        failed = 0
+        for start in range(0, len(keys), self.batch_size):
+            if self._stop.is_set():
+                break
+            if start:
+                self._stop.wait(self.batch_pause)
+            failed += len(self.weather_service.refresh_cities(keys[start:start + self.batch_size]))
+
+        with self._lock:
+            self.runs += 1
+            self.failures += failed
+            self.last_run_failures = failed
+            self.last_run_seconds = round(time.monotonic() - started, 2)
+            self.last_run_finished = datetime.now().isoformat(timespec='seconds')
+        return failed
+
+    def status(self):
+        """Run counters and the age in seconds of every covered city's report (None if never fetched)"""
+        store = self.weather_service.store
+        staleness = {}
+        for key, city in self._city_names.items():
+            age = store.age(key)
+            staleness[city] = round(age) if age is not None else None
+        with self._lock:
+            return {
+                'running': self._thread is not None and self._thread.is_alive(),
+                'interval': self.interval,
+                'runs': self.runs,
+                'failures': self.failures,
+                'last_run_started': self.last_run_started,
+                'last_run_finished': self.last_run_finished,
+                'last_run_seconds': self.last_run_seconds,
+                'last_run_failures': self.last_run_failures,
+                'last_error': self.last_error,
+                'stale_cities': sum(1 for age in staleness.values() if age is None or age >= store.ttl),
+                'staleness': staleness
+            }
@@ -1,34 +1,130 @@
 import requests
 import sys
 import os
+from datetime import date, datetime, timedelta
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from airport_themes import get_airport_info
+from .airport_locations import resolve_airport
+from .climate_normals import get_climate_normals
+from .fanout import fan_out
+from .weather_store import WeatherStore
+
+GROUP_QUERY_MAX_IDS = 20  # OpenWeather group endpoint limit
 
 
 class WeatherService:
-    def __init__(self, api_key):
+    def __init__(self, api_key, config=None):
+        config = config or {}
         self.api_key = api_key
         self.base_url = "http://api.openweathermap.org/data/2.5/weather"
-    
-    def get_weather(self, airport_code):
-        """Get weather for an airport location"""
+        self.group_url = "http://api.openweathermap.org/data/2.5/group"
+        self.max_concurrency = config.get('WEATHER_MAX_CONCURRENCY', 4)
+        self.forecast_days = config.get('WEATHER_FORECAST_DAYS', 5)
+        self.store = WeatherStore(
+            ttl=config.get('WEATHER_CACHE_TTL', 900),
+            stale_ttl=config.get('WEATHER_STALE_TTL', 3600),
+            negative_ttl=config.get('WEATHER_NEGATIVE_TTL', 60),
+            maxsize=config.get('WEATHER_CACHE_SIZE', 1000)
+        )
+
+    def get_weather(self, airport_code, travel_date=None):
+        """Get weather for an airport location, cached per city; climate normals for far travel dates"""
+        if self.beyond_forecast(travel_date):
+            return self.climate_report(airport_code, travel_date)
+        if not self.has_api_key():
+            return None
+
+        # Airports of the same city share one report: STN, LTN and LGW all read London
+        query = self._location_query(resolve_airport(airport_code))
+        return self.store.get(tuple(query.items()), lambda: self._fetch_weather(dict(query)))
+
+    def get_weather_bulk(self, airport_codes, travel_dates=None):
+        """
+        Get weather for several airports at once
+
+        Airports travelled to beyond the forecast horizon get their climate
+        normals, read locally. For the others, distinct cities are resolved once;
+        the ones not cached are fetched with OpenWeather group queries (up to 20
+        city ids per call) in parallel, the few cities without an id one by one.
+
+        Args:
+            airport_codes: Airport codes
+            travel_dates: Optional {airport_code: date or 'YYYY-MM-DD'}
+
+        Returns:
+            {airport_code: report or None}
+        """
+        travel_dates = travel_dates or {}
+        weather_by_code = {}
+        current_codes = []
+        for code in dict.fromkeys(airport_codes):
+            if self.beyond_forecast(travel_dates.get(code)):
+                weather_by_code[code] = self.climate_report(code, travel_dates[code])
+            else:
+                current_codes.append(code)
+        if not current_codes:
+            return weather_by_code
+        if not self.has_api_key():
+            return {**weather_by_code, **{code: None for code in current_codes}}
+
+        keys_by_code = self.city_keys(current_codes)
+        reports = self.store.get_many(keys_by_code.values(), self._fetch_weather_many)
+        weather_by_code.update((code, reports.get(key)) for code, key in keys_by_code.items())
+        return weather_by_code
+
+    def get_weather_for_dates(self, code_dates):
+        """
+        Weather of (airport_code, travel_date) pairs, an airport possibly listed with several dates
+
+        Far dates get the climate normals of their month; the current conditions of
+        every airport with a near (or no) date come from one get_weather_bulk call.
+
+        Returns:
+            {(airport_code, travel_date): report or None}
+        """
+        far = {pair: self.beyond_forecast(pair[1]) for pair in dict.fromkeys(code_dates)}
+        current = self.get_weather_bulk([code for (code, _), is_far in far.items() if not is_far])
+        return {(code, travel_date): self.climate_report(code, travel_date) if is_far else current.get(code)
+                for (code, travel_date), is_far in far.items()}
+
+    def beyond_forecast(self, travel_date):
+        """True when a travel date is further than forecast_days away: current conditions say nothing about it"""
+        travel_date = _as_date(travel_date)
+        return travel_date is not None and travel_date > date.today() + timedelta(days=self.forecast_days)
+
+    def climate_report(self, airport_code, travel_date):
+        """Monthly climate normals of an airport for a travel date, no network I/O"""
+        return get_climate_normals().report(airport_code, _as_date(travel_date))
+
+    def city_keys(self, airport_codes):
+        """Store key of each airport's city, {airport_code: key}; airports of one city share a key"""
+        return {code: tuple(self._location_query(resolve_airport(code)).items())
+                for code in dict.fromkeys(airport_codes)}
+
+    def refresh_cities(self, keys):
+        """Fetch the given city keys now, bypassing the cache; returns the keys that failed"""
+        return self.store.refresh_many(list(keys), self._fetch_weather_many)
+
+    def has_api_key(self):
+        return bool(self.api_key) and self.api_key != "your_openweather_api_key"
+
+    def _location_query(self, location):
+        """Query by city id or coordinates from the resolution table, the city name as last resort"""
+        if location.openweather_id:
+            return {'id': location.openweather_id}
+        if location.latitude is not None:
+            return {'lat': location.latitude, 'lon': location.longitude}
+        return {'q': location.city}
+
+    def _fetch_weather(self, query):
+        """Fetch the current weather from OpenWeatherMap, None on any failure"""
         try:
-            if not self.api_key or self.api_key == "your_openweather_api_key":
-                return None
-                
-            airport_info = get_airport_info(airport_code)
-            airport_name = airport_info['name']
-            
-            # Better city extraction from airport name
-            city = self.extract_city_from_airport_name(airport_name, airport_code)
-            
             params = {
-                'q': city,
                 'appid': self.api_key,
                 'units': 'metric',
-                'lang': 'fr'
+                'lang': 'fr',
+                **query
             }
-            
+
             response = requests.get(self.base_url, params=params, timeout=5)
             if response.status_code == 200:
                 return response.json()
@@ -37,33 +133,49 @@ class WeatherService:
         except Exception as e:
             print(f"Weather API error: {e}")
             return None
-    
-    def extract_city_from_airport_name(self, airport_name, airport_code):
-        """Extract city name from airport name with better logic"""
-        if not airport_name:
-            return airport_code
-            
-        # Dictionary of known airport codes to city names
-        airport_city_map = {
-            'BCN': 'Barcelona', 'MAD': 'Madrid', 'PMI': 'Palma',
-            'FCO': 'Rome', 'MXP': 'Milan', 'VCE': 'Venice',
-            'CDG': 'Paris', 'ORY': 'Paris', 'NCE': 'Nice',
-            'LIS': 'Lisbon', 'OPO': 'Porto', 'FAO': 'Faro',
-            'ATH': 'Athens', 'SKG': 'Thessaloniki',
-            'DUB': 'Dublin', 'ORK': 'Cork',
+
+    def _fetch_group(self, city_ids):
+        """Fetch up to GROUP_QUERY_MAX_IDS cities in one call, {city_id: report}"""
+        params = {
+            'appid': self.api_key,
+            'units': 'metric',
+            'lang': 'fr',
+            'id': ','.join(str(city_id) for city_id in city_ids)
         }
-        
-        if airport_code in airport_city_map:
-            return airport_city_map[airport_code]
-        
-        # Extract from airport name
-        name_lower = airport_name.lower()
-        
-        # Remove common airport words
-        remove_words = ['airport', 'international', 'airfield', 'aéroport', 'aeroporto']
-        for word in remove_words:
-            name_lower = name_lower.replace(word, '')
-        
-        # Take first significant word
-        parts = [part.strip() for part in name_lower.split() if len(part.strip()) > 2]
-        return parts[0].capitalize() if parts else airport_code
\ No newline at end of file
+        response = requests.get(self.group_url, params=params, timeout=5)
+        response.raise_for_status()
+        return {report['id']: report for report in response.json().get('list', [])}
+
+    def _fetch_weather_many(self, keys):
+        """Fetch several store keys: group queries for city ids, single queries for the rest"""
+        city_ids = [dict(key)['id'] for key in keys if 'id' in dict(key)]
+        others = [key for key in keys if 'id' not in dict(key)]
+        batches = [('group', tuple(city_ids[start:start + GROUP_QUERY_MAX_IDS]))
+                   for start in range(0, len(city_ids), GROUP_QUERY_MAX_IDS)]
+        calls = batches + [('single', key) for key in others]
+
+        def fetch(call):
+            kind, payload = call
+            return self._fetch_group(payload) if kind == 'group' else self._fetch_weather(dict(payload))
+
+        reports = {}
+        for (kind, payload), result in fan_out(fetch, calls, upstream='openweather',
+                                               max_concurrency=self.max_concurrency, call_timeout=10):
+            if kind == 'group':
+                for city_id in payload:
+                    reports[(('id', city_id),)] = result.get(city_id)
+            else:
+                reports[payload] = result
+        return reports
+
+
+def _as_date(value):
+    """date from a date, a datetime or an ISO string ('2026-11-03' or '2026-11-03T06:25:00'), None if unparsable"""
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
@@ -0,0 +1,215 @@
+"""
+Per-city weather store: TTL, stale-while-revalidate and negative caching
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class WeatherStore:
+    def __init__(self, ttl=900, stale_ttl=3600, negative_ttl=60, maxsize=1000):
+        """
+        Initialize the store
+
+        Args:
+            ttl: Seconds a report stays fresh
+            stale_ttl: Seconds past ttl a report is still served while it is refreshed in the background
+            negative_ttl: Seconds a failed lookup is remembered before the upstream is asked again
+            maxsize: Maximum number of cities, least recently used ones are evicted first
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.fetches = 0
+        self.fetch_seconds = 0.0
+        self.max_fetch_seconds = 0.0
+        self._entries = OrderedDict()  # key -> (report or None, fetched_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key, fetch):
+        """
+        Return the report stored under key, calling fetch() when there is none
+
+        A stale report is returned at once and fetch() runs on a background thread.
+        fetch() returns None when the upstream has no answer: that is cached for
+        negative_ttl seconds, and never replaces a report that is still servable.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                report, fetched_at = entry
+                age = now - fetched_at
+                if report is None and age < self.negative_ttl:
+                    self.negative_hits += 1
+                    self._entries.move_to_end(key)
+                    return None
+                if report is not None and age < self.ttl:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return report
+                if report is not None and age < self.ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    self._entries.move_to_end(key)
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self.refreshes += 1
+                        threading.Thread(target=self._refresh, args=(key, fetch), name='weather-refresh', daemon=True).start()
+                    return report
+            self.misses += 1
+
+        report = self._fetch(fetch)
+        self.put(key, report)
+        return report
+
+    def get_many(self, keys, fetch_many):
+        """
+        Return {key: report} for several keys, with one fetch_many(missing_keys) call for the misses
+
+        fetch_many returns {key: report} and may leave out keys it could not resolve.
+        Stale keys are refreshed together by one background fetch_many call.
+        """
+        now = time.monotonic()
+        reports = {}
+        missing = []
+        stale = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                if entry is not None:
+                    report, fetched_at = entry
+                    age = now - fetched_at
+                    self._entries.move_to_end(key)
+                    if report is None and age < self.negative_ttl:
+                        self.negative_hits += 1
+                        reports[key] = None
+                        continue
+                    if report is not None and age < self.ttl:
+                        self.hits += 1
+                        reports[key] = report
+                        continue
+                    if report is not None and age < self.ttl + self.stale_ttl:
+                        self.stale_hits += 1
+                        reports[key] = report
+                        if key not in self._refreshing:
+                            self._refreshing.add(key)
+                            stale.append(key)
+                        continue
+                self.misses += 1
+                missing.append(key)
+            if stale:
+                self.refreshes += len(stale)
+                threading.Thread(target=self._refresh_many, args=(stale, fetch_many), name='weather-refresh', daemon=True).start()
+
+        if missing:
+            fetched = self._fetch(lambda: fetch_many(missing)) or {}
+            for key in missing:
+                reports[key] = fetched.get(key)
+                self.put(key, reports[key])
+        return reports
+
+    def peek(self, key):
+        """Return the stored report, fresh or stale, without fetching or touching counters"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key, report):
+        """Store a report fetched now (None records a failed lookup unless a servable report exists)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if report is None and entry is not None and entry[0] is not None and now - entry[1] < self.ttl + self.stale_ttl:
+                return
+            self._entries[key] = (report, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _fetch(self, fetch):
+        start = time.monotonic()
+        try:
+            return fetch()
+        except Exception as e:
+            print(f"Weather fetch error: {e}")
+            return None
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self.fetches += 1
+                self.fetch_seconds += elapsed
+                self.max_fetch_seconds = max(self.max_fetch_seconds, elapsed)
+
+    def _refresh(self, key, fetch):
+        try:
+            report = self._fetch(fetch)
+            if report is None:
+                with self._lock:
+                    self.refresh_failures += 1
+            self.put(key, report)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def refresh_many(self, keys, fetch_many):
+        """Fetch keys now with one fetch_many call and store the reports; returns the keys that failed"""
+        fetched = self._fetch(lambda: fetch_many(keys)) or {}
+        failed = [key for key in keys if fetched.get(key) is None]
+        with self._lock:
+            self.refresh_failures += len(failed)
+        for key in keys:
+            self.put(key, fetched.get(key))
+        return failed
+
+    def age(self, key):
+        """Seconds since the stored report was fetched, None if there is no report"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is None:
+                return None
+            return time.monotonic() - entry[1]
+
+    def _refresh_many(self, keys, fetch_many):
+        try:
+            self.refresh_many(keys, fetch_many)
+        finally:
+            with self._lock:
+                self._refreshing.difference_update(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return hit/stale/negative/miss counters, background refreshes and upstream latency"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.negative_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'stale_ttl': self.stale_ttl,
+                'negative_ttl': self.negative_ttl,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'negative_hits': self.negative_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.stale_hits + self.negative_hits) / lookups, 3) if lookups else 0.0,
+                'refreshes': self.refreshes,
+                'refreshing': len(self._refreshing),
+                'refresh_failures': self.refresh_failures,
+                'fetches': self.fetches,
+                'avg_fetch_ms': round(self.fetch_seconds / self.fetches * 1000, 1) if self.fetches else 0.0,
+                'max_fetch_ms': round(self.max_fetch_seconds * 1000, 1)
+            }
@@ -28,6 +28,17 @@ class FlightSearchApp {
             this.updateDepartureAirports();
         });
         
+        // Departure airport typeahead
+        const departureSearch = document.getElementById('departureSearch');
+        departureSearch.addEventListener('input', () => {
+            clearTimeout(this.suggestTimer);
+            this.suggestTimer = setTimeout(() => this.updateAirportSuggestions(departureSearch.value), 150);
+        });
+        departureSearch.addEventListener('change', () => {
+            this.addDepartureAirport(departureSearch.value.trim().toUpperCase());
+            departureSearch.value = '';
+        });
+        
         // Sort buttons
         document.querySelectorAll('[data-sort]').forEach(btn => {
             btn.addEventListener('click', (e) => {
@@ -60,10 +71,24 @@ class FlightSearchApp {
         const container = document.getElementById('departureAirports');
         container.innerHTML = '';
         
+        if (selectedCountries.length === 0) {
+            return;
+        }
+        
+        let airportsByCountry;
+        try {
+            // One request for every selected country
+            const query = selectedCountries.map(encodeURIComponent).join(',');
+            const response = await fetch(`/api/airports?countries=${query}&v=${document.body.dataset.catalogRevision}`);
+            airportsByCountry = await response.json();
+        } catch (error) {
+            console.error('Error loading airports:', error);
+            return;
+        }
+        
         for (const countryCode of selectedCountries) {
             try {
-                const response = await fetch(`/api/airports/${countryCode}`);
-                const airports = await response.json();
+                const airports = (airportsByCountry[countryCode] || {}).airports || {};
                 
                 const countryDiv = document.createElement('div');
                 countryDiv.className = 'mb-2';
@@ -89,6 +114,50 @@ class FlightSearchApp {
         }
     }
     
+    async updateAirportSuggestions(query) {
+        const datalist = document.getElementById('departureSuggestions');
+        if (!query.trim()) {
+            datalist.innerHTML = '';
+            return;
+        }
+        
+        try {
+            const response = await fetch(`/api/airports/suggest?q=${encodeURIComponent(query)}&limit=8`);
+            const suggestions = await response.json();
+            this.suggestions = Object.fromEntries(suggestions.map(airport => [airport.code, airport]));
+            datalist.innerHTML = suggestions.map(airport => `
+                <option value="${airport.code}">${airport.city} - ${airport.name} (${airport.country_name})</option>
+            `).join('');
+        } catch (error) {
+            console.error('Error loading airport suggestions:', error);
+        }
+    }
+    
+    addDepartureAirport(code) {
+        const airport = (this.suggestions || {})[code];
+        if (!airport) {
+            return;
+        }
+        
+        const existing = document.getElementById(`dep_${code}`);
+        if (existing) {
+            existing.checked = true;
+            return;
+        }
+        
+        const container = document.getElementById('departureAirports');
+        const airportDiv = document.createElement('div');
+        airportDiv.className = 'form-check form-check-inline';
+        airportDiv.innerHTML = `
+            <input class="form-check-input departure-airport" type="checkbox" 
+                   value="${code}" id="dep_${code}" checked>
+            <label class="form-check-label" for="dep_${code}">
+                <small>${code} - ${airport.city}</small>
+            </label>
+        `;
+        container.prepend(airportDiv);
+    }
+    
     getCountryName(countryCode) {
         const countryNames = {
             'belgium': 'Belgique',
@@ -127,6 +196,9 @@ class FlightSearchApp {
             if (data.success) {
                 this.currentResults = data.results;
                 this.displayResults();
+                if (formData.include_weather) {
+                    this.loadWeather(this.currentResults);
+                }
             } else {
                 this.showError(data.error || 'Erreur lors de la recherche');
             }
@@ -298,7 +370,7 @@ class FlightSearchApp {
                     </div>
                 </div>
                 
-                ${weatherSection}
+                <div class="weather-slot" data-destination="${flight.destination}" data-month="${(flight.departure_time || '').slice(0, 7)}">${weatherSection}</div>
                 ${accommodationSection}
             </div>
         `;
@@ -306,12 +378,58 @@ class FlightSearchApp {
         return card;
     }
     
+    async loadWeather(flights) {
+        // Fares are displayed first, weather follows in one request: one entry per destination and
+        // departure month, with its earliest departure day; far ones get that month's climate normals
+        const departures = {};
+        flights.forEach(flight => {
+            const day = (flight.departure_time || '').slice(0, 10);
+            const key = `${flight.destination}|${day.slice(0, 7)}`;
+            if (!(key in departures) || day < departures[key]) {
+                departures[key] = day;
+            }
+        });
+        const entries = Object.entries(departures);
+        if (entries.length === 0) {
+            return;
+        }
+        
+        try {
+            const codes = entries.map(([key]) => encodeURIComponent(key.split('|')[0])).join(',');
+            const dates = entries.map(([, day]) => day).join(',');
+            const response = await fetch(`/api/weather?codes=${codes}&dates=${dates}`);
+            const data = await response.json();
+            if (!data.success) {
+                return;
+            }
+            
+            flights.forEach(flight => {
+                const weather = (data.weather_by_month[flight.destination] || {})[(flight.departure_time || '').slice(0, 7)];
+                if (weather) {
+                    flight.weather = weather;
+                }
+            });
+            Object.entries(data.weather_by_month).forEach(([code, months]) => {
+                Object.entries(months).forEach(([month, weather]) => {
+                    document.querySelectorAll(`.weather-slot[data-destination="${code}"][data-month="${month}"]`).forEach(slot => {
+                        slot.innerHTML = this.createWeatherSection(weather);
+                    });
+                });
+            });
+        } catch (error) {
+            console.error('Error loading weather:', error);
+        }
+    }
+    
     createWeatherSection(weather) {
         console.log('Weather data:', weather); // Debug log
         if (!weather) {
             console.log('No weather data available');
             return '';
         }
+        if (weather.source === 'climate_normals') {
+            return this.createClimateSection(weather);
+        }
         
         return `
             <div class="weather-info mt-3">
@@ -333,6 +451,28 @@ class FlightSearchApp {
         `;
     }
     
+    createClimateSection(climate) {
+        // Departure beyond the forecast horizon: monthly normals instead of current conditions
+        const month = new Date(2000, climate.month - 1, 1).toLocaleDateString('fr-FR', { month: 'long' });
+        return `
+            <div class="weather-info mt-3">
+                <h6><i class="bi bi-calendar3 me-2"></i>Climat habituel en ${month}${climate.reference ? ` (référence : ${climate.reference})` : ''}</h6>
+                <div class="row">
+                    <div class="col-md-6">
+                        <div class="weather-temp">${Math.round(climate.temp_max)}°C</div>
+                        <div class="text-muted">Minimales: ${Math.round(climate.temp_min)}°C</div>
+                    </div>
+                    <div class="col-md-6">
+                        <small class="text-muted">
+                            Jours de pluie: ${Math.round(climate.rain_days)}<br>
+                            ${climate.sea_temp !== null ? `Mer: ${Math.round(climate.sea_temp)}°C` : ''}
+                        </small>
+                    </div>
+                </div>
+            </div>
+        `;
+    }
+    
     createAccommodationSection(accommodations) {
         if (!accommodations || !accommodations.booking_links) return '';
         
@@ -327,6 +327,8 @@ function addAnimationStyles() {
 // Hotel Search Manager
 class HotelManager {
     constructor() {
+        // Unfiltered hotels of the last search: type, price and sort changes are applied to them locally
+        this.hotels = null;
         this.init();
     }
     
@@ -382,6 +384,17 @@ class HotelManager {
                 this.resetHotelFilters();
             });
         }
+        
+        ['hotelPriceRange', 'hotelType', 'hotelSort'].forEach(id => {
+            const select = document.getElementById(id);
+            if (select) {
+                select.addEventListener('change', () => {
+                    if (this.hotels) {
+                        this.showHotels();
+                    }
+                });
+            }
+        });
     }
     
     async searchHotels() {
@@ -407,11 +420,8 @@ class HotelManager {
             
             loadingDiv.classList.add('d-none');
             
-            if (data.success && data.data.hotels && data.data.hotels.length > 0) {
-                this.displayHotels(data.data.hotels);
-            } else {
-                this.showNoHotelsMessage();
-            }
+            this.hotels = data.success && data.data.hotels ? data.data.hotels : [];
+            this.showHotels();
             
         } catch (error) {
             console.error('Hotel search error:', error);
@@ -421,6 +431,7 @@ class HotelManager {
     }
     
     getSearchParams() {
+        // Only what the server needs to search: type, price and sort are applied locally
         const params = {};
         
         params.destination = document.getElementById('hotelDestination').value;
@@ -429,26 +440,53 @@ class HotelManager {
         params.adults = document.getElementById('hotelAdults').value;
         
         // Optional filters
-        const priceRange = document.getElementById('hotelPriceRange').value;
-        if (priceRange) {
-            const [min, max] = priceRange.split('-');
-            if (min) params.price_min = min;
-            if (max) params.price_max = max;
-        }
-        
         const hotelClass = document.getElementById('hotelClass').value;
         if (hotelClass) params.hotel_class = hotelClass;
         
-        const hotelType = document.getElementById('hotelType').value;
-        if (hotelType) params.hotel_type = hotelType;
-        
         const freeCancellation = document.getElementById('hotelFreeCancellation').checked;
         if (freeCancellation) params.free_cancellation = 'true';
         
+        return params;
+    }
+    
+    showHotels() {
+        const hotels = this.filterHotels(this.hotels);
+        document.getElementById('noHotels').classList.add('d-none');
+        if (hotels.length > 0) {
+            this.displayHotels(hotels);
+        } else {
+            document.getElementById('hotelsResults').innerHTML = '';
+            this.showNoHotelsMessage();
+        }
+    }
+    
+    filterHotels(hotels) {
+        // Same rules as the server's local filters (hotels without a price are kept)
+        const priceRange = document.getElementById('hotelPriceRange').value;
+        const [min, max] = priceRange ? priceRange.split('-').map(Number) : [0, 0];
+        const hotelType = document.getElementById('hotelType').value;
         const sort = document.getElementById('hotelSort').value;
-        if (sort) params.sort = sort;
         
-        return params;
+        const filtered = hotels.filter(hotel => {
+            const type = (hotel.type || '').toLowerCase();
+            if (hotelType === 'hotel' && !type.includes('hotel') && !type.includes('boutique')) return false;
+            if (hotelType && hotelType !== 'hotel' && !type.includes(hotelType)) return false;
+            if (hotel.price_numeric) {
+                if (min && hotel.price_numeric < min) return false;
+                if (max && hotel.price_numeric > max) return false;
+            }
+            return true;
+        });
+        
+        if (sort === '8') {
+            // Price ascending, hotels without a price last
+            const withPrices = filtered.filter(hotel => hotel.price_numeric).sort((a, b) => a.price_numeric - b.price_numeric);
+            return withPrices.concat(filtered.filter(hotel => !hotel.price_numeric));
+        }
+        if (sort === '1') {
+            return filtered.sort((a, b) => (b.rating || 0) - (a.rating || 0));
+        }
+        return filtered;
     }
     
     displayHotels(hotels) {
@@ -534,6 +572,7 @@ class HotelManager {
         document.getElementById('hotelSort').value = '';
         
         // Reset results
+        this.hotels = null;
         document.getElementById('hotelsResults').innerHTML = '';
         document.getElementById('noHotels').classList.add('d-none');
         
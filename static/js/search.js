@@ -121,10 +121,24 @@ class SearchApp {
         const container = document.getElementById('departureAirports');
         container.innerHTML = '';
         
+        if (selectedCountries.length === 0) {
+            return;
+        }
+        
+        let airportsByCountry;
+        try {
+            // One request for every selected country
+            const query = selectedCountries.map(encodeURIComponent).join(',');
+            const response = await fetch(`/api/airports?countries=${query}&v=${document.body.dataset.catalogRevision}`);
+            airportsByCountry = await response.json();
+        } catch (error) {
+            console.error('Error loading airports:', error);
+            return;
+        }
+        
         for (const countryCode of selectedCountries) {
             try {
-                const response = await fetch(`/api/airports/${countryCode}`);
-                const airports = await response.json();
+                const airports = (airportsByCountry[countryCode] || {}).airports || {};
                 
                 const countryDiv = document.createElement('div');
                 countryDiv.className = 'airport-country mb-3';
@@ -189,6 +203,9 @@ class SearchApp {
             if (data.success) {
                 this.currentResults = data.results;
                 this.displayResults();
+                if (formData.include_weather) {
+                    this.loadWeather(this.currentResults);
+                }
             } else {
                 this.showError(data.error || 'Erreur lors de la recherche');
             }
@@ -409,7 +426,7 @@ class SearchApp {
                 </div>
             </div>
             
-            ${weatherSection}
+            <div class="weather-slot" data-destination="${flight.destination}" data-month="${(flight.departure_time || '').slice(0, 7)}">${weatherSection}</div>
             ${accommodationSection}
             ${activitiesSection}
             
@@ -426,8 +443,52 @@ class SearchApp {
         return card;
     }
     
+    async loadWeather(flights) {
+        // Fares are displayed first, weather follows in one request: one entry per destination and
+        // departure month, with its earliest departure day; far ones get that month's climate normals
+        const departures = {};
+        flights.forEach(flight => {
+            const day = (flight.departure_time || '').slice(0, 10);
+            const key = `${flight.destination}|${day.slice(0, 7)}`;
+            if (!(key in departures) || day < departures[key]) {
+                departures[key] = day;
+            }
+        });
+        const entries = Object.entries(departures);
+        if (entries.length === 0) {
+            return;
+        }
+        
+        try {
+            const codes = entries.map(([key]) => encodeURIComponent(key.split('|')[0])).join(',');
+            const dates = entries.map(([, day]) => day).join(',');
+            const response = await fetch(`/api/weather?codes=${codes}&dates=${dates}`);
+            const data = await response.json();
+            if (!data.success) {
+                return;
+            }
+            
+            flights.forEach(flight => {
+                const weather = (data.weather_by_month[flight.destination] || {})[(flight.departure_time || '').slice(0, 7)];
+                if (weather) {
+                    flight.weather = weather;
+                }
+            });
+            Object.entries(data.weather_by_month).forEach(([code, months]) => {
+                Object.entries(months).forEach(([month, weather]) => {
+                    document.querySelectorAll(`.weather-slot[data-destination="${code}"][data-month="${month}"]`).forEach(slot => {
+                        slot.innerHTML = this.createWeatherSection(weather);
+                    });
+                });
+            });
+        } catch (error) {
+            console.error('Error loading weather:', error);
+        }
+    }
+    
     createWeatherSection(weather) {
         if (!weather) return '';
+        if (weather.source === 'climate_normals') return this.createClimateSection(weather);
         
         return `
             <div class="weather-section">
@@ -447,6 +508,26 @@ class SearchApp {
         `;
     }
     
+    createClimateSection(climate) {
+        // Departure beyond the forecast horizon: monthly normals instead of current conditions
+        const month = new Date(2000, climate.month - 1, 1).toLocaleDateString('fr-FR', { month: 'long' });
+        return `
+            <div class="weather-section">
+                <h6><i class="bi bi-calendar3 me-2"></i>Climat habituel en ${month}${climate.reference ? ` (référence : ${climate.reference})` : ''}</h6>
+                <div class="weather-details">
+                    <div class="weather-main">
+                        <span class="temperature">${Math.round(climate.temp_max)}°C</span>
+                        <span class="description">Minimales: ${Math.round(climate.temp_min)}°C</span>
+                    </div>
+                    <div class="weather-extra">
+                        <small>Jours de pluie: ${Math.round(climate.rain_days)}</small>
+                        ${climate.sea_temp !== null ? `<small>Mer: ${Math.round(climate.sea_temp)}°C</small>` : ''}
+                    </div>
+                </div>
+            </div>
+        `;
+    }
+    
     createAccommodationSection(accommodations) {
         if (!accommodations || !accommodations.booking_links) return '';
         
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+import airport_themes
+from benchmarks.fake_ryanair import FakeRyanair
+from services.flight_service import FlightSearchService
+
+SEARCH = {
+    'departure_airports': ['CRL'],
+    'destination_filter': {'country': ['spain']},
+    'departure_date_from': '2027-03-01',
+    'departure_date_to': '2027-03-03',
+    'min_stay_duration': 3
+}
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    """A copy of the shipped catalog, published for the test and replaced by the shipped one afterwards"""
+    path = tmp_path / 'airports.json'
+    path.write_text(open(airport_themes.CATALOG_PATH, encoding='utf-8').read(), encoding='utf-8')
+    airport_themes.reload_catalog(str(path))
+    yield path
+    airport_themes.reload_catalog()
+
+
+def _retheme(path, code, themes):
+    """Rewrite the themes of one airport in a catalog snapshot"""
+    data = json.loads(path.read_text(encoding='utf-8'))
+    themes_column = data['fields'].index('themes')
+    for airports in data['countries'].values():
+        for row in airports['airports']:
+            if row[0] == code:
+                row[themes_column] = themes
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+
+def test_cached_fares_get_the_themes_of_the_swapped_catalog(catalog_path):
+    client = FakeRyanair(latency=0)
+    service = FlightSearchService({'FLIGHT_SEARCH_EXECUTION': 'serial'}, client=client)
+
+    before = {trip['destination']: trip for trip in service.search_flights(SEARCH)}
+    assert 'BCN' in before and 'mountain' not in before['BCN']['destination_info']['themes']
+    calls = client.calls
+
+    _retheme(catalog_path, 'BCN', ['mountain'])
+    airport_themes.reload_catalog(str(catalog_path))
+
+    after = {trip['destination']: trip for trip in service.search_flights(SEARCH)}
+    assert client.calls == calls  # Served from the fare cache
+    assert after['BCN']['destination_info']['themes'] == ['mountain']
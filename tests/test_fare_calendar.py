@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from services.fare_calendar import FareCalendar
+
+
+def _month_response(fares):
+    response = mock.Mock()
+    response.json.return_value = {'outbound': {'fares': fares}}
+    return response
+
+
+def test_months_fetched_counts_every_concurrent_fetch():
+    calendar = FareCalendar()
+    with mock.patch.object(FareCalendar, 'session', mock.Mock(get=lambda *args, **kwargs: _month_response([]))):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda index: calendar.get_days('CRL', f'D{index:03d}', '2027-03-01', '2027-03-31'),
+                              range(200)))
+    assert calendar.months_fetched == 200
+
+
+def test_coverage_leaves_out_inbound_legs_that_are_never_read():
+    calendar = FareCalendar()
+    with mock.patch.object(FareCalendar, 'session', mock.Mock(get=lambda *args, **kwargs: _month_response([]))):
+        calendar.get_days('CRL', 'BCN', '2027-03-01', '2027-03-10')
+
+    # No outbound fare: the inbound month is not read, everything the search needs is cached
+    coverage = calendar.coverage([('CRL', 'BCN', '2027-03-01', '2027-03-10', '2027-03-04', '2027-03-20')])
+    assert coverage['months'] == 1 and coverage['cached_ratio'] == 1.0
+
+    coverage = calendar.coverage([('CRL', 'MAD', '2027-03-25', '2027-04-05', '2027-03-28', '2027-04-15')])
+    assert coverage['months'] == 4 and coverage['cached_months'] == 0
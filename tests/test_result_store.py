@@ -0,0 +1,30 @@
+from services.result_store import SearchResultStore
+
+
+def _trip(index, destination_info):
+    return {
+        'origin': 'CRL', 'destination': f'D{index:02d}', 'total_price': 10 + index,
+        'departure_time': f'2027-03-{1 + index % 28:02d}T08:00:00',
+        'return_time': f'2027-03-{1 + index % 28:02d}T20:00:00',
+        'destination_info': destination_info
+    }
+
+
+def test_distinct_filters_do_not_accumulate_copies():
+    store = SearchResultStore()
+    result_set_id = store.save([_trip(index, {'themes': ['beach']}) for index in range(40)])
+
+    for max_price in range(10, 50):
+        page = store.get_page(result_set_id, filters={'max_price': max_price}, limit=5)
+        assert page['total_found'] == max_price - 9
+    store.get_page(result_set_id, sort='-price')
+
+    assert len(store.result_sets.get(result_set_id)['orders']) == 2
+
+
+def test_theme_filter_skips_trips_without_destination_info():
+    store = SearchResultStore()
+    result_set_id = store.save([_trip(0, None), _trip(1, {'themes': ['beach']})])
+
+    page = store.get_page(result_set_id, filters={'themes': ['beach']})
+    assert [trip['destination'] for trip in page['results']] == ['D01']
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from services.airport_locations import AirportLocation
+from services.weather_service import WeatherService
+
+
+def _response(payload):
+    response = mock.Mock(status_code=200)
+    response.json.return_value = payload
+    return response
+
+
+def test_cities_with_ids_are_fetched_by_group_queries_of_20():
+    locations = {f'A{index:02d}': AirportLocation(f'A{index:02d}', f'City {index}', 'FR', 45.0, 5.0, 1000 + index)
+                 for index in range(40)}
+    calls = []
+
+    def get(url, params=None, timeout=None):
+        calls.append((url, params))
+        ids = [int(city_id) for city_id in params['id'].split(',')]
+        return _response({'list': [{'id': city_id, 'main': {'temp': 20}} for city_id in ids]})
+
+    service = WeatherService('key')
+    with mock.patch('services.weather_service.resolve_airport', locations.get), \
+            mock.patch('services.weather_service.requests.get', side_effect=get):
+        weather = service.get_weather_bulk(list(locations))
+
+    assert len(calls) == 2
+    assert all(url == service.group_url for url, _ in calls)
+    assert sorted(len(params['id'].split(',')) for _, params in calls) == [20, 20]
+    assert all(weather[code]['id'] == location.openweather_id for code, location in locations.items())
+
+
+def test_cities_without_id_are_fetched_one_by_one():
+    locations = {
+        'AAA': AirportLocation('AAA', 'City A', 'FR', 45.0, 5.0, 1001),
+        'BBB': AirportLocation('BBB', 'City B', 'FR', 46.0, 6.0, None),
+    }
+    calls = []
+
+    def get(url, params=None, timeout=None):
+        calls.append(url)
+        if 'id' in params:
+            return _response({'list': [{'id': 1001, 'main': {'temp': 20}}]})
+        return _response({'main': {'temp': 18}})
+
+    service = WeatherService('key')
+    with mock.patch('services.weather_service.resolve_airport', locations.get), \
+            mock.patch('services.weather_service.requests.get', side_effect=get):
+        weather = service.get_weather_bulk(['AAA', 'BBB'])
+
+    assert sorted(calls) == sorted([service.group_url, service.base_url])
+    assert weather['AAA']['main']['temp'] == 20
+    assert weather['BBB']['main']['temp'] == 18